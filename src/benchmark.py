@@ -0,0 +1,398 @@
+# benchmark.py
+#
+# Throughput benchmark on synthetic schemas:
+#
+#     python benchmark.py --output bench.json
+#     python benchmark.py --config bench_job.yaml --output bench.json --compare old.json
+#
+# Without --config both ends are temporary SQLite files. With it, the job
+# file's source and target (see job.load_job) are used; every table named
+# bench_* in them is dropped and recreated, so point them at scratch
+# databases. Each workload is generated in the source, then measured in a
+# fresh child process: metadata loading (database.fetch_schema, and the
+# same schema read back from a MetadataCache) and a full create-mode
+# transfer. Results are written as JSON; --compare prints the change
+# against an earlier result file and fails on a regression.
+
+import argparse
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bulk_load import open_writer
+from checkpoint import endpoint_key
+from connection_pool import ConnectionPool
+from database import fetch_schema, probe_connection
+from drivers import DB_MYSQL, DB_POSTGRESQL, DB_SQLITE
+from job import JobError, load_job
+from metadata_cache import MetadataCache, metadata_key
+from metrics import TransferMetrics
+from task_context import TaskContext
+from transfer_engine import TransferEngine, MODE_CREATE
+from transfer_scheduler import TransferScheduler, DEFAULT_CONCURRENCY
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_CONFIG = 2
+
+TABLE_PREFIX = "bench_"
+
+# name -> shape. rows is per table and multiplied by --scale; columns
+# excludes the id key; blob is the size in bytes of one BLOB column (0 = none).
+WORKLOADS = {
+    "many_small": {"tables": 200, "rows": 200, "columns": 6, "blob": 0},
+    "huge": {"tables": 2, "rows": 250000, "columns": 6, "blob": 0},
+    "wide": {"tables": 1, "rows": 20000, "columns": 90, "blob": 0},
+    "blob": {"tables": 1, "rows": 2000, "columns": 2, "blob": 64 * 1024},
+}
+
+# Column type of each role per driver.
+_TYPES = {
+    DB_MYSQL: {"int": "BIGINT", "text": "VARCHAR(64)", "float": "DOUBLE", "blob": "LONGBLOB"},
+    DB_POSTGRESQL: {"int": "BIGINT", "text": "VARCHAR(64)", "float": "DOUBLE PRECISION", "blob": "BYTEA"},
+    DB_SQLITE: {"int": "INTEGER", "text": "TEXT", "float": "REAL", "blob": "BLOB"},
+}
+_ROLES = ("int", "text", "float")
+
+# Rows or bytes per insert batch while generating data.
+GENERATE_BATCH_ROWS = 2000
+GENERATE_BATCH_BYTES = 8 * 1024 * 1024
+
+# A result is a regression when it is this much worse than the baseline.
+DEFAULT_THRESHOLD = 0.10
+
+DEFAULT_REPEAT = 5
+
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", flush=True)
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """Nearest-rank percentiles of samples, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        rank = max(math.ceil(point / 100 * len(ordered)), 1)
+        result[f"p{point}"] = round(ordered[rank - 1] * 1000, 3)
+    result["max"] = round(ordered[-1] * 1000, 3)
+    return result
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _SampledMetrics(TransferMetrics):
+    """TransferMetrics that also keeps every batch's write + commit time."""
+
+    def __init__(self):
+        super().__init__()
+        self.latencies = []
+
+    def record_batch(self, table, rows, size, timings: dict):
+        super().record_batch(table, rows, size, timings)
+        with self._lock:
+            self.latencies.append(timings.get("write", 0.0) + timings.get("commit", 0.0))
+
+
+def _column_roles(spec) -> list:
+    roles = [_ROLES[i % len(_ROLES)] for i in range(spec["columns"])]
+    if spec["blob"]:
+        roles.append("blob")
+    return roles
+
+
+def _table_names(workload, spec) -> list:
+    return [f"{TABLE_PREFIX}{workload}_{i:03d}" for i in range(spec["tables"])]
+
+
+def _create_sql(driver, table, roles) -> str:
+    types = _TYPES[driver.name]
+    columns = [f"{driver.quote('id')} {types['int']} NOT NULL PRIMARY KEY"]
+    columns += [f"{driver.quote(f'c{i}')} {types[role]}" for i, role in enumerate(roles)]
+    return f"CREATE TABLE {driver.quote(table)} ({', '.join(columns)})"
+
+
+def _rows(rnd, roles, spec, start, count):
+    for row_id in range(start, start + count):
+        row = [row_id]
+        for role in roles:
+            if role == "int":
+                row.append(rnd.randrange(1 << 40))
+            elif role == "text":
+                row.append(f"value-{row_id}-{rnd.randrange(1 << 30):x}")
+            elif role == "float":
+                row.append(rnd.random() * 1e6)
+            else:
+                row.append(rnd.randbytes(spec["blob"]))
+        yield tuple(row)
+
+
+def drop_tables(pool, tables):
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {pool.driver.quote(table)}")
+        conn.commit()
+
+
+def generate(pool, workload, spec, scale) -> dict:
+    """Creates and fills the workload's tables in the source; returns its size."""
+    driver = pool.driver
+    roles = _column_roles(spec)
+    rows_per_table = max(int(spec["rows"] * scale), 1)
+    batch_rows = GENERATE_BATCH_ROWS
+    if spec["blob"]:
+        batch_rows = max(min(batch_rows, GENERATE_BATCH_BYTES // spec["blob"]), 1)
+    rnd = random.Random(workload)
+    tables = _table_names(workload, spec)
+    drop_tables(pool, tables)
+    with pool.connection() as conn:
+        for table in tables:
+            with conn.cursor() as cursor:
+                cursor.execute(_create_sql(driver, table, roles))
+            writer = open_writer(driver, conn, table, ["id"] + [f"c{i}" for i in range(len(roles))])
+            for start in range(1, rows_per_table + 1, batch_rows):
+                count = min(batch_rows, rows_per_table + 1 - start)
+                writer.write(list(_rows(rnd, roles, spec, start, count)))
+                conn.commit()
+            writer.close()
+            conn.commit()
+    return {"tables": len(tables), "rows": rows_per_table * len(tables), "columns": len(roles) + 1}
+
+
+def measure(source_info, target_info, workload, spec, repeat, concurrency, cache_dir) -> dict:
+    """Runs in a child process so peak RSS belongs to this workload alone."""
+    result = {"start_rss": peak_rss()}
+    tables = _table_names(workload, spec)
+    source_pool = ConnectionPool(source_info)
+    target_pool = ConnectionPool(target_info)
+    try:
+        probe_connection(source_pool)
+        probe_connection(target_pool)
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            schema = fetch_schema(source_pool)
+            timings.append(time.perf_counter() - started)
+        result["metadata"] = dict(percentiles(timings), runs=repeat)
+
+        cache = MetadataCache(os.path.join(cache_dir, f"{workload}.sqlite3"))
+        cache.put(metadata_key(source_info), schema)
+        cache.close()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            cache = MetadataCache(os.path.join(cache_dir, f"{workload}.sqlite3"))
+            cache.get(metadata_key(source_info))
+            cache.close()
+            timings.append(time.perf_counter() - started)
+        result["metadata_cached"] = dict(percentiles(timings), runs=repeat)
+
+        estimates = {table["name"]: table["rows"] for table in schema["tables"] if table["name"] in tables}
+        drop_tables(target_pool, tables)
+        engine = TransferEngine(source_pool, target_pool, mode=MODE_CREATE)
+        engine.metrics = _SampledMetrics()
+        scheduler = TransferScheduler(engine, concurrency=concurrency)
+        started = time.perf_counter()
+        copied = scheduler.run(estimates, TaskContext())
+        seconds = time.perf_counter() - started
+        totals = engine.metrics.report()["totals"]
+        result["transfer"] = {
+            "seconds": round(seconds, 3),
+            "rows": sum(copied.values()),
+            "bytes": totals["bytes"],
+            "batches": totals["batches"],
+            "rows_per_sec": round(sum(copied.values()) / seconds, 1) if seconds else 0.0,
+            "bytes_per_sec": round(totals["bytes"] / seconds, 1) if seconds else 0.0,
+            "batch_latency": percentiles(engine.metrics.latencies),
+        }
+        drop_tables(target_pool, tables)
+    finally:
+        source_pool.close()
+        target_pool.close()
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(source_info, target_info, workloads, scale, repeat, concurrency, endpoints=None) -> dict:
+    """endpoints are the (source, target) labels to record; by default their endpoint keys."""
+    source_label, target_label = endpoints or (endpoint_key(source_info), endpoint_key(target_info))
+    report = {
+        "started_at": time.time(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": source_label,
+        "target": target_label,
+        "scale": scale,
+        "concurrency": concurrency,
+        "workloads": {},
+    }
+    cache_dir = tempfile.mkdtemp(prefix="dbtransfer-bench-cache-")
+    source_pool = ConnectionPool(source_info)
+    try:
+        probe_connection(source_pool)
+        for workload in workloads:
+            spec = WORKLOADS[workload]
+            log(f"[정보] {workload}: 데이터 생성 중...")
+            entry = dict(generate(source_pool, workload, spec, scale))
+            log(f"[정보] {workload}: 테이블 {entry['tables']}개, {entry['rows']:,}행 측정 중...")
+            # spawn: the child starts without the parent's generated data in memory.
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                entry.update(executor.submit(
+                    measure, source_info, target_info, workload, spec, repeat, concurrency, cache_dir
+                ).result())
+            drop_tables(source_pool, _table_names(workload, spec))
+            report["workloads"][workload] = entry
+            transfer = entry["transfer"]
+            log(f"[완료] {workload}: {transfer['rows_per_sec']:,.0f}행/초, "
+                f"메타데이터 p50 {entry['metadata']['p50']}ms, "
+                f"최대 메모리 {_format_rss(entry['peak_rss'])}")
+    finally:
+        source_pool.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    report["finished_at"] = time.time()
+    return report
+
+
+def _format_rss(value) -> str:
+    return f"{value / (1024 * 1024):.0f}MB" if value else "-"
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD) -> list:
+    """
+    Lines describing each workload's change against baseline; a line
+    starting with "[회귀]" marks a regression beyond threshold.
+    """
+    lines = []
+    for key in ("source", "target", "scale", "concurrency"):
+        if baseline.get(key) != report.get(key):
+            lines.append(f"[경고] 비교 결과와 {key}이(가) 다릅니다: {baseline.get(key)} → {report.get(key)}")
+    for workload, entry in report["workloads"].items():
+        old = baseline.get("workloads", {}).get(workload)
+        if not old:
+            continue
+        checks = [
+            ("전송 행/초", entry["transfer"]["rows_per_sec"], old["transfer"]["rows_per_sec"], True),
+            ("메타데이터 p50", entry["metadata"].get("p50"), old["metadata"].get("p50"), False),
+            ("최대 메모리", entry.get("peak_rss"), old.get("peak_rss"), False),
+        ]
+        for label, new_value, old_value, higher_is_better in checks:
+            if not new_value or not old_value:
+                continue
+            change = new_value / old_value - 1
+            worse = -change if higher_is_better else change
+            tag = "[회귀]" if worse > threshold else "[정보]"
+            lines.append(f"{tag} {workload} {label}: {old_value:,} → {new_value:,} ({change:+.1%})")
+    return lines
+
+
+# Recorded for the default run, whose files are in a new temp directory
+# every time, so that compare() does not see a different environment.
+SCRATCH_ENDPOINT = "sqlite:temp"
+
+
+def _sqlite_endpoints(directory):
+    def endpoint(name):
+        return {"db_type": DB_SQLITE, "host": "", "port": 0, "user": "",
+                "password": "", "database": os.path.join(directory, name)}
+    return endpoint("source.sqlite3"), endpoint("target.sqlite3")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="전송 성능 벤치마크")
+    parser.add_argument("--config", "-c", help="source/target을 지정한 작업 파일 (없으면 임시 SQLite)")
+    parser.add_argument("--output", "-o", required=True, help="결과 JSON 경로")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS),
+                        help=f"쉼표로 구분한 작업 부하 (기본: {','.join(WORKLOADS)})")
+    parser.add_argument("--scale", type=float, default=1.0, help="행 수 배율 (기본 1.0)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="메타데이터 측정 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 전송 수")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="회귀로 볼 악화 비율 (기본 0.10)")
+    args = parser.parse_args(argv)
+
+    workloads = [name.strip() for name in args.workloads.split(",") if name.strip()]
+    unknown = [name for name in workloads if name not in WORKLOADS]
+    if unknown:
+        log(f"[오류] 알 수 없는 작업 부하: {', '.join(unknown)}")
+        return EXIT_CONFIG
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            log(f"[오류] 비교 파일을 읽을 수 없습니다: {e}")
+            return EXIT_CONFIG
+
+    scratch = endpoints = None
+    if args.config:
+        try:
+            job = load_job(args.config)
+        except JobError as e:
+            log(f"[오류] {e}")
+            return EXIT_CONFIG
+        source_info, target_info = job["source"], job["target"]
+    else:
+        scratch = tempfile.mkdtemp(prefix="dbtransfer-bench-")
+        source_info, target_info = _sqlite_endpoints(scratch)
+        endpoints = (SCRATCH_ENDPOINT, SCRATCH_ENDPOINT)
+    try:
+        report = run(source_info, target_info, workloads, args.scale, max(args.repeat, 1),
+                     max(args.concurrency, 1), endpoints)
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    log(f"[정보] 결과 저장: {args.output}")
+
+    if baseline is None:
+        return EXIT_OK
+    lines = compare(report, baseline, args.threshold)
+    for line in lines:
+        log(line)
+    return EXIT_REGRESSION if any(line.startswith("[회귀]") for line in lines) else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# bulk_load.py
+
+import datetime
+import os
+import re
+import tempfile
+
+from database import quote_identifier
+from drivers import DRIVERS, DB_MYSQL, DB_POSTGRESQL, format_timedelta, mysql_value
+
+NULL = b"\\N"
+
+# Order matters: the escape character itself must be escaped first.
+_ESCAPES = [
+    (b"\\", b"\\\\"),
+    (b"\t", b"\\t"),
+    (b"\n", b"\\n"),
+    (b"\r", b"\\r"),
+    (b"\x00", b"\\0"),
+]
+
+_UNESCAPES = {
+    b"\\": b"\\",
+    b"t": b"\t",
+    b"n": b"\n",
+    b"r": b"\r",
+    b"0": b"\x00",
+}
+_ESCAPE_SEQUENCE = re.compile(rb"\\(.)", re.DOTALL)
+
+
+def encode_field(value) -> bytes:
+    """
+    Encodes one value in LOAD DATA's default tab-separated text format,
+    after the same conversions as MySQLDriver.adapt_row: bools as 1/0,
+    json values and arrays as JSON text.
+    """
+    if value is None:
+        return NULL
+    value = mysql_value(value)
+    if isinstance(value, bytes):
+        data = value
+    elif isinstance(value, datetime.timedelta):
+        data = format_timedelta(value).encode()
+    else:
+        data = str(value).encode("utf-8")
+    for raw, escaped in _ESCAPES:
+        if raw in data:
+            data = data.replace(raw, escaped)
+    return data
+
+
+def encode_rows(rows) -> bytes:
+    return b"".join(b"\t".join(encode_field(v) for v in row) + b"\n" for row in rows)
+
+
+# Rows encoded by estimate_size per batch.
+SIZE_SAMPLE_ROWS = 16
+
+
+def estimate_size(rows) -> int:
+    """
+    Approximate len(encode_rows(rows)), from an evenly spaced sample of the
+    rows; for writers that take the rows themselves.
+    """
+    if not rows:
+        return 0
+    sample = rows[::max(len(rows) // SIZE_SAMPLE_ROWS, 1)]
+    return len(encode_rows(sample)) * len(rows) // len(sample)
+
+
+def decode_field(data: bytes):
+    """Inverse of encode_field: returns the raw bytes, or None for NULL."""
+    if data == NULL:
+        return None
+    if b"\\" in data:
+        data = _ESCAPE_SEQUENCE.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(1)), data)
+    return data
+
+
+def decode_rows(lines, converters) -> list:
+    """
+    Splits encode_rows output (one bytes line per row) back into tuples,
+    passing every non-NULL field through its column's converter.
+    """
+    rows = []
+    for line in lines:
+        fields = line.rstrip(b"\n").split(b"\t")
+        rows.append(tuple(
+            None if value is None else convert(value)
+            for convert, value in zip(converters, map(decode_field, fields))
+        ))
+    return rows
+
+
+class InsertWriter:
+    """
+    Writes batches with multi-row executemany INSERTs. With upsert=True rows
+    whose key already exists are updated: INSERT ... ON DUPLICATE KEY UPDATE
+    on MySQL, ON CONFLICT (key) DO UPDATE elsewhere, which needs the
+    primary key column as key. driver gives the SQL dialect (MySQL by
+    default).
+
+    On MySQL, executemany packs the rows into multi-row statements of up to
+    max_statement bytes; keep it below the server's max_allowed_packet.
+    """
+
+    # Whether write() uses the encode_rows text of the batch.
+    uses_encoded = False
+
+    def __init__(self, conn, table, columns, upsert=False, driver=None, key=None,
+                 max_statement=None):
+        self.conn = conn
+        self.max_statement = max_statement
+        self.driver = driver or DRIVERS[DB_MYSQL]
+        quote = self.driver.quote
+        quoted = [quote(name) for name in columns]
+        placeholders = ", ".join([self.driver.placeholder] * len(columns))
+        self.sql = (
+            f"INSERT INTO {quote(table)} ({', '.join(quoted)}) "
+            f"VALUES ({placeholders})"
+        )
+        if upsert and self.driver.name == DB_MYSQL:
+            updates = ", ".join(f"{name} = VALUES({name})" for name in quoted)
+            self.sql += f" ON DUPLICATE KEY UPDATE {updates}"
+        elif upsert:
+            if key is None:
+                raise ValueError(f"{table}: 기본 키가 없는 테이블은 갱신 모드로 쓸 수 없습니다.")
+            updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in quoted if name != quote(key))
+            action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+            self.sql += f" ON CONFLICT ({quote(key)}) {action}"
+
+    def write(self, rows, encoded=None):
+        if self.driver.adapts_rows:
+            rows = [self.driver.adapt_row(row) for row in rows]
+        with self.conn.cursor() as cursor:
+            if self.max_statement:
+                cursor.max_stmt_length = self.max_statement
+            cursor.executemany(self.sql, rows)
+
+    def close(self):
+        pass
+
+
+class PgCopyWriter:
+    """
+    Writes batches to PostgreSQL with COPY ... FROM STDIN, streaming the
+    rows through psycopg's copy protocol instead of binding parameters.
+    """
+
+    uses_encoded = False
+
+    def __init__(self, conn, table, columns, driver):
+        self.conn = conn
+        self.driver = driver
+        quoted = [driver.quote(name) for name in columns]
+        self.sql = f"COPY {driver.quote(table)} ({', '.join(quoted)}) FROM STDIN"
+
+    def write(self, rows, encoded=None):
+        adapt = self.driver.adapt_row
+        with self.conn.cursor() as cursor:
+            with cursor.copy(self.sql) as copy:
+                for row in rows:
+                    copy.write_row(adapt(row))
+
+    def close(self):
+        pass
+
+
+def open_writer(driver, conn, table, columns, upsert=False, key=None, max_statement=None):
+    """
+    The fastest parameter-based writer for the target driver: COPY for
+    PostgreSQL (plain inserts only), executemany INSERTs otherwise.
+    LoadDataWriter is chosen separately since it needs a local_infile
+    connection.
+    """
+    if driver.name == DB_POSTGRESQL and not upsert:
+        return PgCopyWriter(conn, table, columns, driver)
+    return InsertWriter(conn, table, columns, upsert=upsert, driver=driver, key=key,
+                        max_statement=max_statement)
+
+
+class LoadDataWriter:
+    """
+    Writes batches by spooling them to a local TSV file and running
+    LOAD DATA LOCAL INFILE on it. The connection must have been opened with
+    local_infile=True. One temp file is reused for every batch.
+
+    There is no upsert variant: LOAD DATA ... REPLACE deletes the old row
+    and inserts a new one, which fires ON DELETE CASCADE foreign keys and
+    DELETE triggers and resets columns that are not loaded. Upserts go
+    through InsertWriter instead.
+    """
+
+    uses_encoded = True
+
+    def __init__(self, conn, table, columns):
+        self.conn = conn
+        fd, self.path = tempfile.mkstemp(prefix="dbtransfer-", suffix=".tsv")
+        os.close(fd)
+        quoted = [quote_identifier(name) for name in columns]
+        # The path is quoted as a string literal; backslashes in Windows
+        # temp paths must be doubled.
+        path_literal = self.path.replace("\\", "\\\\").replace("'", "\\'")
+        self.sql = (
+            f"LOAD DATA LOCAL INFILE '{path_literal}' "
+            f"INTO TABLE {quote_identifier(table)} CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            "LINES TERMINATED BY '\\n' "
+            f"({', '.join(quoted)})"
+        )
+
+    def write(self, rows, encoded=None):
+        """encoded may carry encode_rows(rows) if the caller already has it."""
+        with open(self.path, "wb") as f:
+            f.write(encoded if encoded is not None else encode_rows(rows))
+        with self.conn.cursor() as cursor:
+            cursor.execute(self.sql)
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
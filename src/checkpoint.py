@@ -0,0 +1,261 @@
+# checkpoint.py
+
+import base64
+import datetime
+import decimal
+import json
+import os
+import uuid
+import sqlite3
+import threading
+import time
+
+from chunking import Chunk, STATUS_DONE, STATUS_PENDING
+from drivers import DB_MYSQL, DB_SQLITE
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".dbtransfer", "checkpoints.sqlite3")
+
+RUN_RUNNING = "running"
+RUN_DONE = "done"
+RUN_FAILED = "failed"
+RUN_CANCELLED = "cancelled"
+RUN_ABANDONED = "abandoned"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    options TEXT NOT NULL,
+    tables TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_tables (
+    run_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (run_id, table_name)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    run_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    pk TEXT,
+    lo TEXT,
+    hi TEXT,
+    last_pk TEXT,
+    rows INTEGER NOT NULL,
+    checksum INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    condition TEXT,
+    compare INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, table_name, chunk_index)
+);
+"""
+
+# Columns added to existing journals after their first release.
+_CHUNK_COLUMNS_ADDED = {
+    "condition": "TEXT",
+    "compare": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def endpoint_key(conn_info: dict) -> str:
+    """Identifies a database endpoint without its password."""
+    db_type = conn_info.get("db_type") or DB_MYSQL
+    if db_type == DB_SQLITE:
+        return f"sqlite:{os.path.abspath(conn_info['database'])}"
+    key = f"{conn_info['user']}@{conn_info['host']}:{conn_info['port']}/{conn_info.get('database', '')}"
+    # MySQL keys keep their original form so journals from earlier
+    # versions still match.
+    return key if db_type == DB_MYSQL else f"{db_type}:{key}"
+
+
+# Key values that JSON has no type for are stored as {tag: text}, so a
+# resumed run compares against the same value, not its str().
+_DECODERS = {
+    "$bytes": base64.b64decode,
+    "$datetime": datetime.datetime.fromisoformat,
+    "$date": datetime.date.fromisoformat,
+    "$time": datetime.time.fromisoformat,
+    "$timedelta": lambda parts: datetime.timedelta(*parts),
+    "$decimal": decimal.Decimal,
+    "$uuid": uuid.UUID,
+}
+
+
+def _encode(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"$timedelta": [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, decimal.Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+    raise TypeError(f"체크포인트에 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+def _decode(obj):
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+        if tag in _DECODERS:
+            return _DECODERS[tag](value)
+    return obj
+
+
+def _dump(value):
+    return json.dumps(value, default=_encode)
+
+
+def _load(text):
+    return json.loads(text, object_hook=_decode) if text is not None else None
+
+
+class CheckpointJournal:
+    """
+    On-disk journal of transfer runs, kept in a local SQLite file.
+
+    For every chunk it records the last committed primary key, the rows
+    written and a running CRC32 of the written data, so an interrupted run
+    can continue from the last commit instead of starting over.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(chunks)")}
+        for column, definition in _CHUNK_COLUMNS_ADDED.items():
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE chunks ADD COLUMN {column} {definition}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def start_run(self, source_key, target_key, tables: dict, options: dict) -> "RunCheckpoint":
+        """Records a new run over {table: estimated_rows}."""
+        now = time.time()
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (source, target, options, tables, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_key, target_key, _dump(options), _dump(tables), RUN_RUNNING, now, now)
+            )
+            run_id = cursor.lastrowid
+        return RunCheckpoint(self, run_id, source_key, target_key, tables, options)
+
+    def find_unfinished(self, source_key=None, target_key=None):
+        """Returns the latest run that neither finished nor was abandoned."""
+        sql = "SELECT id, source, target, tables, options FROM runs WHERE status NOT IN (?, ?)"
+        params = [RUN_DONE, RUN_ABANDONED]
+        if source_key is not None:
+            sql += " AND source = ? AND target = ?"
+            params += [source_key, target_key]
+        with self._lock:
+            row = self._db.execute(sql + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        run_id, source, target, tables, options = row
+        return RunCheckpoint(self, run_id, source, target, _load(tables), _load(options))
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+
+class RunCheckpoint:
+    """Journal entries of one run; safe to call from several worker threads."""
+
+    def __init__(self, journal, run_id, source_key, target_key, tables, options):
+        self.journal = journal
+        self.run_id = run_id
+        self.source_key = source_key
+        self.target_key = target_key
+        self.tables = tables
+        self.options = options
+
+    def rows_done(self) -> int:
+        rows = self.journal._execute("SELECT COALESCE(SUM(rows), 0) FROM chunks WHERE run_id = ?", (self.run_id,))
+        return rows[0][0]
+
+    def save_chunks(self, table, chunks):
+        """Records the chunk plan of a freshly prepared table."""
+        self.journal._execute(
+            "INSERT OR REPLACE INTO run_tables (run_id, table_name, status) VALUES (?, ?, ?)",
+            (self.run_id, table, STATUS_PENDING)
+        )
+        for chunk in chunks:
+            self.save_chunk(chunk)
+
+    def load_chunks(self, table):
+        """Returns the saved chunks of the table, or None if it was never planned."""
+        rows = self.journal._execute(
+            "SELECT chunk_index, pk, lo, hi, last_pk, rows, checksum, status, condition, compare "
+            "FROM chunks "
+            "WHERE run_id = ? AND table_name = ? ORDER BY chunk_index",
+            (self.run_id, table)
+        )
+        if not rows:
+            return None
+        chunks = []
+        for index, pk, lo, hi, last_pk, row_count, checksum, status, condition, compare in rows:
+            chunk = Chunk(table, index, pk, _load(lo), _load(hi))
+            chunk.last_pk = _load(last_pk)
+            chunk.rows = row_count
+            chunk.checksum = checksum
+            chunk.status = status
+            chunk.condition = _load(condition)
+            chunk.compare = bool(compare)
+            chunks.append(chunk)
+        return chunks
+
+    def save_chunk(self, chunk):
+        """Records the chunk's status and the position of its last commit."""
+        self.journal._execute(
+            "INSERT OR REPLACE INTO chunks (run_id, table_name, chunk_index, pk, lo, hi, "
+            "last_pk, rows, checksum, status, condition, compare) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, chunk.table, chunk.index, chunk.pk, _dump(chunk.lo), _dump(chunk.hi),
+             _dump(chunk.last_pk), chunk.rows, chunk.checksum, chunk.status,
+             _dump(chunk.condition), int(chunk.compare))
+        )
+
+    def is_table_done(self, table) -> bool:
+        rows = self.journal._execute(
+            "SELECT status FROM run_tables WHERE run_id = ? AND table_name = ?",
+            (self.run_id, table)
+        )
+        return bool(rows) and rows[0][0] == STATUS_DONE
+
+    def table_done(self, table):
+        self.journal._execute(
+            "UPDATE run_tables SET status = ? WHERE run_id = ? AND table_name = ?",
+            (STATUS_DONE, self.run_id, table)
+        )
+
+    def table_rows(self, table) -> int:
+        rows = self.journal._execute(
+            "SELECT COALESCE(SUM(rows), 0) FROM chunks WHERE run_id = ? AND table_name = ?",
+            (self.run_id, table)
+        )
+        return rows[0][0]
+
+    def finish(self, status):
+        self.journal._execute(
+            "UPDATE runs SET status = ?, updated_at = ? WHERE id = ?",
+            (status, time.time(), self.run_id)
+        )
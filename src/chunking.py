@@ -0,0 +1,210 @@
+# chunking.py
+
+import math
+
+from drivers import DRIVERS, DB_MYSQL, driver_for
+
+DEFAULT_CHUNK_ROWS = 200000
+
+STATUS_PENDING = "pending"
+# Journaled before a chunk's first write, so a resume knows it may have rows.
+STATUS_STARTED = "started"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def normalize_filters(filters) -> dict:
+    """
+    Validates per-table filters given as {table: {'where': sql, 'columns':
+    [name, ...]}} and returns them without empty entries. where is a SQL
+    condition in the source's dialect; columns limits the copied columns
+    (the primary key is always added). Raises ValueError if malformed.
+    """
+    if not filters:
+        return {}
+    if not isinstance(filters, dict):
+        raise ValueError("filters는 {테이블: {where, columns}} 형식이어야 합니다.")
+    result = {}
+    for table, spec in filters.items():
+        if not isinstance(spec, dict) or set(spec) - {"where", "columns"}:
+            raise ValueError(f"{table}: 필터에는 where와 columns만 지정할 수 있습니다.")
+        where = spec.get("where") or ""
+        columns = spec.get("columns") or []
+        if isinstance(columns, str):
+            columns = [columns]
+        if (not isinstance(where, str) or not isinstance(columns, list)
+                or not all(isinstance(name, str) for name in columns)):
+            raise ValueError(f"{table}: where는 문자열, columns는 열 이름 목록이어야 합니다.")
+        where = where.strip()
+        entry = {}
+        if where:
+            entry["where"] = where
+        if columns:
+            entry["columns"] = list(columns)
+        if entry:
+            result[table] = entry
+    return result
+
+
+class Chunk:
+    """
+    A primary-key range (lo, hi] of one table, copied as a unit.
+
+    lo=None / hi=None leave the range open at that end, so the first and last
+    chunk also pick up rows outside the range seen while planning. last_pk is
+    the key of the last committed row; a retry continues after it instead of
+    starting the chunk over. checksum is a running CRC32 of the data written
+    where it is written as LOAD DATA text (LOAD DATA, snapshots), else 0.
+
+    condition is an optional extra (sql, params) filter ANDed to the range.
+    where and columns carry the table's user filter (see normalize_filters):
+    a parameterless SQL condition, also ANDed, and the columns to read.
+    compare asks the engine to skip the chunk if source and target already
+    hold the same rows in its range. upsert makes it write its rows as
+    upserts whatever the import mode (see TransferEngine.resume_table).
+    """
+
+    def __init__(self, table, index, pk=None, lo=None, hi=None):
+        self.table = table
+        self.index = index
+        self.pk = pk
+        self.lo = lo
+        self.hi = hi
+        self.last_pk = lo
+        self.rows = 0
+        self.checksum = 0
+        self.attempts = 0
+        self.status = STATUS_PENDING
+        self.error = None
+        self.condition = None
+        self.where = None
+        self.columns = None
+        self.compare = False
+        self.upsert = False
+
+    @property
+    def resumable(self) -> bool:
+        """Only key-ordered chunks know where they stopped."""
+        return self.pk is not None
+
+    def range_condition(self, from_start=False, driver=None):
+        """
+        Returns (sql, params) selecting the chunk's key range, starting after
+        last_pk unless from_start is set. sql is empty for keyless chunks.
+        driver gives the SQL dialect (MySQL by default).
+        """
+        if self.pk is None:
+            return "", ()
+        driver = driver or DRIVERS[DB_MYSQL]
+        pk = driver.quote(self.pk)
+        low = self.lo if from_start else self.last_pk
+        conditions = []
+        params = []
+        if low is not None:
+            conditions.append(f"{pk} > {driver.placeholder}")
+            params.append(low)
+        if self.hi is not None:
+            conditions.append(f"{pk} <= {driver.placeholder}")
+            params.append(self.hi)
+        return " AND ".join(conditions), tuple(params)
+
+    def select_sql(self, columns_sql=None, driver=None):
+        """Returns (sql, params) reading the rows not yet copied, in key order."""
+        driver = driver or DRIVERS[DB_MYSQL]
+        if columns_sql is None:
+            columns_sql = ", ".join(map(driver.quote, self.columns)) if self.columns else "*"
+        sql = f"SELECT {columns_sql} FROM {driver.quote(self.table)}"
+        conditions = []
+        range_sql, params = self.range_condition(driver=driver)
+        if range_sql:
+            conditions.append(range_sql)
+        if self.condition:
+            conditions.append(f"({self.condition[0]})")
+            params += tuple(self.condition[1])
+        if self.where:
+            # The query always goes out with params, so a literal % in the
+            # user's condition must be doubled for format-style drivers.
+            where = self.where.replace("%", "%%") if driver.placeholder == "%s" else self.where
+            conditions.append(f"({where})")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if self.pk is not None:
+            sql += f" ORDER BY {driver.quote(self.pk)}"
+        return sql, params
+
+    def __repr__(self):
+        return f"<Chunk {self.table}#{self.index} ({self.lo}, {self.hi}] {self.status}>"
+
+
+def find_primary_key(conn, table):
+    """
+    Returns (column, is_integer) for a single-column primary key, or
+    (None, False) when the table has no primary key or a composite one.
+    """
+    return driver_for(conn).primary_key(conn, table)
+
+
+def plan_chunks(conn, table, estimated_rows, chunk_rows=DEFAULT_CHUNK_ROWS) -> list:
+    """
+    Splits a table into primary-key range chunks of about chunk_rows rows.
+
+    Integer keys are split arithmetically between MIN and MAX. Other
+    single-column keys are split by walking the key index chunk_rows entries
+    at a time. Tables without a usable key, or small enough for one chunk,
+    come back as a single chunk.
+    """
+    pk, is_integer = find_primary_key(conn, table)
+    if pk is None or estimated_rows < 2 * chunk_rows:
+        return [Chunk(table, 0, pk)]
+
+    count = math.ceil(estimated_rows / chunk_rows)
+    if is_integer:
+        boundaries = _integer_boundaries(conn, table, pk, count)
+    else:
+        boundaries = _index_boundaries(conn, table, pk, chunk_rows, count)
+
+    chunks = []
+    lo = None
+    for hi in boundaries + [None]:
+        chunks.append(Chunk(table, len(chunks), pk, lo, hi))
+        lo = hi
+    return chunks
+
+
+def _integer_boundaries(conn, table, pk, count) -> list:
+    driver = driver_for(conn)
+    quoted_pk = driver.quote(pk)
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({quoted_pk}), MAX({quoted_pk}) FROM {driver.quote(table)}")
+        low, high = cursor.fetchone()
+    if low is None:
+        return []
+    step = max(1, math.ceil((high - low + 1) / count))
+    return list(range(low - 1 + step, high, step))
+
+
+def _index_boundaries(conn, table, pk, chunk_rows, count) -> list:
+    driver = driver_for(conn)
+    quoted_pk = driver.quote(pk)
+    quoted_table = driver.quote(table)
+    placeholder = driver.placeholder
+    boundaries = []
+    with conn.cursor() as cursor:
+        for _ in range(count - 1):
+            if boundaries:
+                cursor.execute(
+                    f"SELECT {quoted_pk} FROM {quoted_table} WHERE {quoted_pk} > {placeholder} "
+                    f"ORDER BY {quoted_pk} LIMIT 1 OFFSET {placeholder}",
+                    (boundaries[-1], chunk_rows - 1)
+                )
+            else:
+                cursor.execute(
+                    f"SELECT {quoted_pk} FROM {quoted_table} "
+                    f"ORDER BY {quoted_pk} LIMIT 1 OFFSET {placeholder}",
+                    (chunk_rows - 1,)
+                )
+            row = cursor.fetchone()
+            if row is None:
+                break
+            boundaries.append(row[0])
+    return boundaries
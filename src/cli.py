@@ -0,0 +1,177 @@
+# cli.py
+#
+# Headless entry point for scheduled migrations:
+#
+#     python cli.py transfer --config job.yaml
+#     python cli.py export --config job.yaml --output /data/snap
+#     python cli.py import --config job.yaml --input /data/snap
+#
+# Uses the same connection, table selection and transfer code as the GUI but
+# never imports PySide6. See job.load_job for the job file format.
+
+import argparse
+import signal
+import sys
+import time
+
+from database import describe_connect_error
+from drivers import connect_errors
+from job import JobError, load_job, run_job, run_export, run_import
+from metrics import STAGE_LABELS, format_duration
+from task_context import TaskContext, TaskCancelled
+from transfer_engine import TransferError
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_CONFIG = 2
+EXIT_CANCELLED = 130
+
+# Seconds between progress lines.
+PROGRESS_INTERVAL = 10.0
+
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", flush=True)
+
+
+class ProgressPrinter:
+    """Prints a progress line at most every PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, interval=PROGRESS_INTERVAL):
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, info):
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self._last = now
+        parts = [f"[진행] {info['done_rows']:,} / {info['total_rows']:,}행"]
+        if info["total_rows"]:
+            parts[0] += f" ({info['done_rows'] / info['total_rows']:.0%})"
+        parts.append(f"{info['rate']:,.0f}행/초")
+        if info["eta"] is not None:
+            parts.append(f"남은 시간 약 {format_duration(info['eta'])}")
+        if info["bottleneck"]:
+            stage, share = info["bottleneck"]
+            parts.append(f"병목: {STAGE_LABELS[stage]} {share:.0%}")
+        log(" · ".join(parts))
+
+
+def _run(action, ctx) -> int:
+    """Runs action(ctx) and maps its outcome to an exit code."""
+    # The first Ctrl+C asks the workers to stop at the next batch; a
+    # second one kills the process the usual way.
+    def on_interrupt(signum, frame):
+        log("[정보] 취소 요청... (다시 누르면 즉시 종료)")
+        ctx.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, on_interrupt)
+
+    started = time.monotonic()
+    try:
+        result = action(ctx)
+    except JobError as e:
+        log(f"[오류] {e}")
+        return EXIT_CONFIG
+    except TaskCancelled:
+        log("[정보] 작업이 취소되었습니다.")
+        return EXIT_CANCELLED
+    except TransferError as e:
+        log(f"[오류] {e}")
+        return EXIT_FAILED
+    except connect_errors() as e:
+        log(f"[오류] {describe_connect_error(e)}")
+        return EXIT_FAILED
+    except Exception as e:
+        log(f"[오류] {e}")
+        return EXIT_FAILED
+
+    if result["tables"]:
+        rows = sum(result["tables"].values())
+        log(f"[완료] 테이블 {len(result['tables'])}개, {rows:,}행, "
+            f"{format_duration(time.monotonic() - started)}")
+    if result.get("verify") and not all(item["match"] for item in result["verify"]):
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+def _load(args, endpoints):
+    job = load_job(args.config, endpoints)
+    if getattr(args, "report", None):
+        job["report"] = args.report
+    return job
+
+
+def transfer(args) -> int:
+    try:
+        job = _load(args, ("source", "target"))
+    except JobError as e:
+        log(f"[오류] {e}")
+        return EXIT_CONFIG
+    if args.no_resume:
+        job["resume"] = False
+    if args.verify:
+        job["verify"] = True
+    ctx = TaskContext(on_progress=ProgressPrinter(), on_log=log)
+    return _run(lambda ctx: run_job(job, ctx, dry_run=args.dry_run), ctx)
+
+
+def export(args) -> int:
+    try:
+        job = _load(args, ("source",))
+    except JobError as e:
+        log(f"[오류] {e}")
+        return EXIT_CONFIG
+    ctx = TaskContext(on_progress=ProgressPrinter(), on_log=log)
+    return _run(lambda ctx: _with_report(job, run_export(job, args.output, ctx, args.compression), ctx), ctx)
+
+
+def import_(args) -> int:
+    try:
+        job = _load(args, ("target",))
+    except JobError as e:
+        log(f"[오류] {e}")
+        return EXIT_CONFIG
+    ctx = TaskContext(on_progress=ProgressPrinter(), on_log=log)
+    return _run(lambda ctx: _with_report(job, run_import(job, args.input, ctx), ctx), ctx)
+
+
+def _with_report(job, result, ctx):
+    if job["report"]:
+        result["metrics"].write_report(job["report"])
+        ctx.log(f"[정보] 보고서 저장: {job['report']}")
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="cli.py", description="데이터베이스 테이블 전송 (GUI 없이 실행)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    transfer_parser = commands.add_parser("transfer", help="작업 파일에 따라 테이블을 전송합니다")
+    transfer_parser.add_argument("--config", "-c", required=True, help="작업 파일 (YAML 또는 JSON)")
+    transfer_parser.add_argument("--dry-run", action="store_true", help="전송할 테이블만 출력합니다")
+    transfer_parser.add_argument("--no-resume", action="store_true", help="중단된 전송을 버리고 새로 시작합니다")
+    transfer_parser.add_argument("--verify", action="store_true", help="전송 후 원본과 대상을 비교합니다")
+    transfer_parser.add_argument("--report", help="지표 보고서 경로 (.json 또는 .csv)")
+    transfer_parser.set_defaults(handler=transfer)
+
+    export_parser = commands.add_parser("export", help="원본 테이블을 스냅샷 폴더로 내보냅니다")
+    export_parser.add_argument("--config", "-c", required=True, help="작업 파일 (source만 필요)")
+    export_parser.add_argument("--output", "-o", required=True, help="스냅샷 폴더")
+    export_parser.add_argument("--compression", choices=["zstd", "gzip"], help="압축 형식 (기본: zstd, 없으면 gzip)")
+    export_parser.add_argument("--report", help="지표 보고서 경로 (.json 또는 .csv)")
+    export_parser.set_defaults(handler=export)
+
+    import_parser = commands.add_parser("import", help="스냅샷 폴더를 대상 DB로 가져옵니다")
+    import_parser.add_argument("--config", "-c", required=True, help="작업 파일 (target만 필요)")
+    import_parser.add_argument("--input", "-i", required=True, help="스냅샷 폴더")
+    import_parser.add_argument("--report", help="지표 보고서 경로 (.json 또는 .csv)")
+    import_parser.set_defaults(handler=import_)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
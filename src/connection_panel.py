@@ -1,19 +1,43 @@
 # connection_panel.py
 
-import traceback
-import pymysql
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox,
     QPushButton, QGridLayout, QMessageBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal, QTimer
+
+from connection_pool import ConnectionPool
+from database import probe_connection, describe_connect_error
+from drivers import DB_MYSQL, DB_POSTGRESQL, DB_SQLITE
+from workers import run_in_background
+
+
+CONNECT_TIMEOUT = 5
+# Combo box entries with a driver (see drivers.py).
+DB_TYPES = {
+    "MySQL": DB_MYSQL,
+    "MariaDB": DB_MYSQL,
+    "PostgreSQL": DB_POSTGRESQL,
+    "SQLite": DB_SQLITE,
+}
+EVICT_INTERVAL_MS = 60 * 1000
 
 
 class ConnectionPanel(QGroupBox):
     """Database connection panel."""
 
+    # Emitted with the panel's ConnectionPool once a database has been opened.
+    connected = Signal(object)
+
     def __init__(self, title, parent=None):
         super().__init__(title, parent)
+        self._test_worker = None
+        # Every component talking to this endpoint borrows from this pool;
+        # it is replaced on each successful connection test.
+        self.pool = None
+        self._evict_timer = QTimer(self)
+        self._evict_timer.timeout.connect(self._evict_idle_connections)
+        self._evict_timer.start(EVICT_INTERVAL_MS)
         self.setup_ui()
 
     def setup_ui(self):
@@ -85,7 +109,10 @@ class ConnectionPanel(QGroupBox):
             self._enable_standard_fields(True)
         elif db_type == "PostgreSQL":
             self.port.setText("5432")
-            self._enable_standard_fields(False)
+            self.host.setText("localhost")
+            self.username.setText("postgres")
+            self.database.setPlaceholderText("데이터베이스 이름")
+            self._enable_standard_fields(True)
         elif db_type == "Oracle":
             self.port.setText("1521")
             self._enable_standard_fields(False)
@@ -109,107 +136,95 @@ class ConnectionPanel(QGroupBox):
         self.database.setEnabled(True)
 
 
-    
-    def translate_error_code(self, code, detail="") -> str:
-        """Maps MySQL error codes to friendly messages."""
-        if code == 1045:
-            return "접속 실패: 사용자 이름 또는 비밀번호가 잘못되었습니다."
-        elif code == 1049:
-            return "접속 실패: 존재하지 않는 데이터베이스입니다."
-        elif code == 2003:
-            return "접속 실패: 호스트에 연결할 수 없습니다. 서버 주소 또는 포트를 확인하세요."
-        elif code == 2005:
-            return "접속 실패: 잘못된 호스트명입니다."
-        elif code == 2006:
-            return "접속 실패: 서버에 연결이 끊어졌습니다."
-        elif code == 1130:
-            return "접속 실패: 이 호스트는 DB 서버에 접근할 권한이 없습니다."
-        else:
-            # fallback for unknown codes
-            return f"접속 실패: {detail}"
-
-
     def test_connection(self):
         db_type = self.db_type.currentText()
 
-        if db_type not in ["MySQL", "MariaDB"]:
+        if db_type not in DB_TYPES:
             QMessageBox.information(self, "지원 안함", f"{db_type} 연결은 아직 지원하지 않습니다.")
             return
 
-        host = self.host.text().strip()
-        port = self.port.text().strip()
-        user = self.username.text().strip()
-        password = self.password.text().strip()
-        database = self.database.text().strip()
-
         try:
-            # If DB is provided, connect to it directly
-            if database:
-                conn = pymysql.connect(
-                    host=host,
-                    port=int(port),
-                    user=user,
-                    password=password,
-                    database=database,
-                    connect_timeout=3
-                )
-                conn.close()
-                self.status_label.setText("● 연결됨")
-                self.status_label.setStyleSheet("color: green; font-weight: bold;")
-                QMessageBox.information(self, "연결 성공", f"{database} DB에 연결 성공 ✅")
-                self.disconnect_btn.setEnabled(True)
-            else:
-                # Connect to server without database
-                conn = pymysql.connect(
-                    host=host,
-                    port=int(port),
-                    user=user,
-                    password=password,
-                    connect_timeout=3
-                )
-                cursor = conn.cursor()
-                cursor.execute("SHOW DATABASES")
-                databases = [row[0] for row in cursor.fetchall()]
-                conn.close()
-
-                self.status_label.setText("● 연결됨 (DB 없음)")
-                self.status_label.setStyleSheet("color: orange; font-weight: bold;")
-                self.disconnect_btn.setEnabled(True)
-
-                if databases:
-                    db_list = "\n".join(databases)
-                    QMessageBox.warning(
-                        self,
-                        "DB 없음",
-                        f"데이터베이스가 선택되지 않았습니다.\n\n서버에 존재하는 DB 목록:\n{db_list}"
-                    )
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "DB 없음",
-                        "서버에 연결되었지만, 생성된 데이터베이스가 없습니다."
-                    )
-
-        except pymysql.err.OperationalError as e:
-            code = e.args[0]
-            msg = self.translate_error_code(code, e.args[1])
-            self.status_label.setText("● 연결 실패")
-            self.status_label.setStyleSheet("color: red; font-weight: bold;")
-            QMessageBox.critical(self, "연결 실패", msg)
-            self.disconnect_btn.setEnabled(False)
-
-        except Exception as e:
-            print("Unhandled error:", traceback.format_exc())
-            self.status_label.setText("● 연결 실패")
-            self.status_label.setStyleSheet("color: red; font-weight: bold;")
-            QMessageBox.critical(self, "연결 실패", "예상치 못한 오류가 발생했습니다. 입력 정보를 다시 확인해 주세요.")
-            self.disconnect_btn.setEnabled(False)
+            conn_info = self.get_conn_info()
+        except ValueError:
+            self._on_test_error(ValueError("invalid port"))
+            return
+
+        self._close_pool()
+        pool = ConnectionPool(conn_info, connect_timeout=CONNECT_TIMEOUT)
+        self.test_btn.setEnabled(False)
+        self.status_label.setText("● 연결 중...")
+        self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        self._test_worker = run_in_background(
+            probe_connection, pool,
+            on_result=lambda databases: self._on_test_result(pool, databases),
+            on_error=lambda error: self._on_test_error(error, pool),
+            on_finished=lambda: self.test_btn.setEnabled(True)
+        )
+
+    def _on_test_result(self, pool, databases):
+        self.pool = pool
+        database = pool.database
+        if database:
+            self.status_label.setText("● 연결됨")
+            self.status_label.setStyleSheet("color: green; font-weight: bold;")
+            self.disconnect_btn.setEnabled(True)
+            self.connected.emit(pool)
+            QMessageBox.information(self, "연결 성공", f"{database} DB에 연결 성공 ✅")
+            return
+
+        self.status_label.setText("● 연결됨 (DB 없음)")
+        self.status_label.setStyleSheet("color: orange; font-weight: bold;")
+        self.disconnect_btn.setEnabled(True)
+
+        if databases:
+            db_list = "\n".join(databases)
+            QMessageBox.warning(
+                self,
+                "DB 없음",
+                f"데이터베이스가 선택되지 않았습니다.\n\n서버에 존재하는 DB 목록:\n{db_list}"
+            )
+        else:
+            QMessageBox.warning(
+                self,
+                "DB 없음",
+                "서버에 연결되었지만, 생성된 데이터베이스가 없습니다."
+            )
+
+    def _on_test_error(self, error, pool=None):
+        if pool:
+            pool.close()
+        msg = describe_connect_error(error, pool.conn_info if pool else None)
+        self.status_label.setText("● 연결 실패")
+        self.status_label.setStyleSheet("color: red; font-weight: bold;")
+        QMessageBox.critical(self, "연결 실패", msg)
+        self.disconnect_btn.setEnabled(False)
 
+    def get_conn_info(self) -> dict:
+        """Returns the current field values as a conn_info dict."""
+        return {
+            "db_type": DB_TYPES.get(self.db_type.currentText(), DB_MYSQL),
+            "host": self.host.text().strip(),
+            "port": int(self.port.text().strip() or 0),
+            "user": self.username.text().strip(),
+            "password": self.password.text().strip(),
+            "database": self.database.text().strip()
+        }
+
+    def is_connected(self) -> bool:
+        return self.pool is not None and "연결됨" in self.status_label.text()
+
+    def _evict_idle_connections(self):
+        if self.pool:
+            self.pool.evict_idle()
+
+    def _close_pool(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
 
     def disconnect(self):
-        self.host.setText("localhost")
-        self.port.setText("3306")
-        self.username.setText("root")
+        self._close_pool()
+        self.update_form_fields(self.db_type.currentText())
         self.password.clear()
         self.database.clear()
         self.status_label.setText("● 연결 끊김")
@@ -0,0 +1,178 @@
+# connection_pool.py
+
+import threading
+import time
+from contextlib import contextmanager
+
+from database import connect
+from drivers import get_driver
+
+DEFAULT_MAX_SIZE = 16
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+DEFAULT_ACQUIRE_TIMEOUT = 60
+
+
+class PoolExhausted(Exception):
+    """Raised when no connection became free within the acquire timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of connections to one endpoint.
+
+    Connections are opened lazily up to max_size. A connection that sat idle
+    longer than health_check_interval is pinged before it is handed out, and
+    one idle longer than idle_timeout is closed instead of reused.
+    """
+
+    def __init__(self, conn_info: dict, max_size=DEFAULT_MAX_SIZE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 **connect_kwargs):
+        self.conn_info = dict(conn_info)
+        self.driver = get_driver(conn_info)
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+        self._idle = []  # [(connection, returned_at)], most recent last
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._variants = {}
+
+    @property
+    def database(self) -> str:
+        return self.conn_info.get("database", "")
+
+    def variant(self, **connect_kwargs) -> "ConnectionPool":
+        """
+        Returns a pool to the same endpoint whose connections are opened with
+        extra driver arguments (e.g. local_infile=True). Variants are cached
+        and closed together with this pool.
+        """
+        key = tuple(sorted(connect_kwargs.items()))
+        with self._cond:
+            if key not in self._variants:
+                self._variants[key] = ConnectionPool(
+                    self.conn_info, self.max_size, self.idle_timeout,
+                    self.health_check_interval,
+                    **dict(self.connect_kwargs, **connect_kwargs)
+                )
+            return self._variants[key]
+
+    @contextmanager
+    def connection(self, timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        """
+        Borrows a connection for the duration of the with block.
+
+        If the block raises, the connection is closed rather than returned,
+        since it may be mid-result or broken.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def acquire(self, timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolExhausted("connection pool is closed")
+                expired = self._take_expired_locked()
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                else:
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise PoolExhausted(f"no free connection after {timeout}s")
+                    self._cond.wait(remaining)
+                    continue
+
+            # Network work happens outside the lock.
+            for stale in expired:
+                self._close_quietly(stale)
+            if conn is None:
+                try:
+                    return connect(self.conn_info, **self.connect_kwargs)
+                except BaseException:
+                    self._forget()
+                    raise
+            if time.monotonic() - returned_at < self.health_check_interval or self._is_alive(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn, discard=False):
+        if not discard:
+            try:
+                # End any snapshot a plain SELECT opened, so the next borrower
+                # sees current data.
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if not discard and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def evict_idle(self):
+        """Closes connections that have been idle longer than idle_timeout."""
+        with self._cond:
+            expired = self._take_expired_locked()
+            variants = list(self._variants.values())
+        for conn in expired:
+            self._close_quietly(conn)
+        for variant in variants:
+            variant.evict_idle()
+
+    def close(self):
+        """Closes idle connections; borrowed ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            variants = list(self._variants.values())
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+        for variant in variants:
+            variant.close()
+
+    def _take_expired_locked(self) -> list:
+        """Removes idle-timed-out connections from the pool; the caller
+        closes them after releasing the lock."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [conn for conn, returned_at in self._idle if returned_at < cutoff]
+        if expired:
+            self._idle = [(conn, t) for conn, t in self._idle if t >= cutoff]
+            self._size -= len(expired)
+            self._cond.notify_all()
+        return expired
+
+    def _is_alive(self, conn) -> bool:
+        return self.driver.is_alive(conn)
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        self._forget()
+
+    def _forget(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
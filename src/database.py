@@ -0,0 +1,175 @@
+# database.py
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from drivers import DRIVERS, DB_MYSQL, UNEXPECTED_ERROR, driver_for, get_driver
+from task_context import TaskContext
+
+
+def connect(conn_info: dict, **kwargs):
+    """
+    Open a connection using connection info:
+    conn_info = {
+        'db_type': str,   # drivers.DB_MYSQL (default), DB_POSTGRESQL or DB_SQLITE
+        'host': str,
+        'port': int,
+        'user': str,
+        'password': str,
+        'database': str   # the file path for SQLite
+    }
+    Extra keyword arguments are passed to the driver's connect as-is.
+    """
+    return get_driver(conn_info).connect(conn_info, **kwargs)
+
+
+def describe_connect_error(error, conn_info: dict = None) -> str:
+    """Message shown when opening a connection failed with error."""
+    if conn_info is None:
+        for driver in DRIVERS.values():
+            if driver.error_types and isinstance(error, driver.error_types):
+                return driver.describe_error(error)
+        return UNEXPECTED_ERROR
+    return get_driver(conn_info).describe_error(error)
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a table or column name for use in a MySQL statement."""
+    return DRIVERS[DB_MYSQL].quote(name)
+
+
+def fetch_columns(conn, table) -> list:
+    """Returns the table's column names in definition order."""
+    return driver_for(conn).fetch_columns(conn, table)
+
+
+def fetch_column_types(conn, table) -> list:
+    """
+    Returns the table's columns in definition order as dicts
+    {'name': str, 'data_type': str, 'column_type': str}, e.g.
+    data_type 'varchar' with column_type 'varchar(255)'.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "ORDER BY ORDINAL_POSITION",
+            (table,)
+        )
+        return [
+            {"name": name, "data_type": data_type.lower(), "column_type": column_type}
+            for name, data_type, column_type in cursor.fetchall()
+        ]
+
+
+def show_create_table(conn, table) -> str:
+    with conn.cursor() as cursor:
+        cursor.execute(f"SHOW CREATE TABLE {quote_identifier(table)}")
+        return cursor.fetchone()[1]
+
+
+def estimate_rows(conn, table) -> int:
+    """Row estimate from the table statistics; cheap but not exact."""
+    return driver_for(conn).estimate_rows(conn, table)
+
+
+def probe_connection(pool, ctx: TaskContext = None) -> list:
+    """
+    Checks that the server accepts the pool's credentials. The connection
+    opened for the check stays in the pool for later use.
+
+    Returns None when a database was given and could be opened, otherwise
+    the list of databases on the server.
+    """
+    with pool.connection() as conn:
+        if pool.database:
+            return None
+        return pool.driver.list_databases(conn)
+
+
+def fetch_table_metadata(pool, ctx: TaskContext = None) -> list:
+    """
+    Lists the base tables of the database with one catalog query. Each
+    entry is a dict:
+    {
+        'name': str,
+        'rows': int,       # storage engine estimate, not an exact count
+        'data_size': int,  # bytes
+        'index_size': int, # bytes
+        'engine': str
+    }
+    """
+    with pool.connection() as conn:
+        return pool.driver.fetch_table_metadata(conn)
+
+
+def fetch_schema(pool, ctx: TaskContext = None) -> dict:
+    """
+    Table list (see fetch_table_metadata) plus every table's column names
+    and primary key columns:
+    {
+        'tables': [...],
+        'columns': {table: [column, ...]},
+        'primary_keys': {table: [column, ...]}
+    }
+    The table list is reported as progress {'tables': [...]} as soon as
+    it has been read, since the column pass can take a while on large
+    schemas.
+    """
+    ctx = ctx or TaskContext()
+    with pool.connection() as conn:
+        tables = pool.driver.fetch_table_metadata(conn)
+        ctx.progress({"tables": tables})
+        ctx.check_cancelled()
+        columns, primary_keys = pool.driver.fetch_all_columns(conn)
+    return {"tables": tables, "columns": columns, "primary_keys": primary_keys}
+
+
+def estimate_filtered_rows(pool, wheres: dict, ctx: TaskContext = None) -> dict:
+    """
+    Estimated rows matching each table's condition, given as {table: where}.
+    Each estimate is reported as progress {'table': str, 'rows': int}.
+    Returns {table: rows}; a bad condition raises the driver's error.
+    """
+    ctx = ctx or TaskContext()
+    estimates = {}
+    with pool.connection() as conn:
+        for table, where in wheres.items():
+            ctx.check_cancelled()
+            estimates[table] = pool.driver.estimate_where(conn, table, where)
+            ctx.progress({"table": table, "rows": estimates[table]})
+    return estimates
+
+
+def count_rows(pool, tables, ctx: TaskContext = None, max_workers=4, wheres=None) -> dict:
+    """
+    Runs exact SELECT COUNT(*) queries for the given tables in parallel,
+    one pooled connection per worker. wheres ({table: sql condition})
+    restricts the count of filtered tables. Each finished count is reported
+    as progress {'table': str, 'rows': int}. Returns {table: rows}.
+    """
+    ctx = ctx or TaskContext()
+    wheres = wheres or {}
+
+    def count(table):
+        ctx.check_cancelled()
+        sql = f"SELECT COUNT(*) FROM {pool.driver.quote(table)}"
+        if wheres.get(table):
+            sql += f" WHERE ({wheres[table]})"
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql)
+                return cursor.fetchone()[0]
+
+    counts = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(count, table): table for table in tables}
+        try:
+            for future in as_completed(futures):
+                table = futures[future]
+                counts[table] = future.result()
+                ctx.progress({"table": table, "rows": counts[table]})
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return counts
@@ -0,0 +1,791 @@
+# drivers.py
+
+import datetime
+import decimal
+import json
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+
+# pymysql and psycopg are imported by the driver that uses them, on its
+# first connect: psycopg alone takes longer to import than the GUI takes to
+# start, and most sessions never touch one of the two.
+
+DB_MYSQL = "mysql"
+DB_POSTGRESQL = "postgresql"
+DB_SQLITE = "sqlite"
+
+
+UNEXPECTED_ERROR = "예상치 못한 오류가 발생했습니다. 입력 정보를 다시 확인해 주세요."
+
+
+def _loaded(module):
+    """
+    The driver library if it has been imported, else None. Until then it
+    cannot have raised an error or opened a connection, so type checks
+    against it can simply be skipped.
+    """
+    return sys.modules.get(module)
+
+
+def translate_error_code(code, detail="") -> str:
+    """Maps MySQL error codes to friendly messages."""
+    if code == 1045:
+        return "접속 실패: 사용자 이름 또는 비밀번호가 잘못되었습니다."
+    elif code == 1049:
+        return "접속 실패: 존재하지 않는 데이터베이스입니다."
+    elif code == 2003:
+        return "접속 실패: 호스트에 연결할 수 없습니다. 서버 주소 또는 포트를 확인하세요."
+    elif code == 2005:
+        return "접속 실패: 잘못된 호스트명입니다."
+    elif code == 2006:
+        return "접속 실패: 서버에 연결이 끊어졌습니다."
+    elif code == 1130:
+        return "접속 실패: 이 호스트는 DB 서버에 접근할 권한이 없습니다."
+    else:
+        # fallback for unknown codes
+        return f"접속 실패: {detail}"
+
+
+def format_timedelta(value: datetime.timedelta) -> str:
+    """TIME columns come back as timedelta; written out as [-]HHH:MM:SS[.ffffff]."""
+    sign = "-" if value < datetime.timedelta(0) else ""
+    value = abs(value)
+    hours, rest = divmod(value.days * 86400 + value.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if value.microseconds:
+        text += f".{value.microseconds:06d}"
+    return text
+
+
+class Driver(ABC):
+    """
+    What the transfer code needs to know about one kind of database:
+    connecting, listing metadata, SQL dialect details, streaming reads and
+    the fastest way to write a batch. Methods that take conn work on a
+    connection opened by this driver's connect(). A subclass must implement
+    the abstract methods; the others have defaults.
+    """
+
+    name = None
+    label = None
+    default_port = None
+    placeholder = "%s"
+    # Exceptions raised by the driver module when a connection fails.
+    error_types = ()
+    # Server-side checksums (verify.py, incremental.py) and LOAD DATA are
+    # written in MySQL SQL.
+    supports_checksums = False
+    # Whether adapt_row has to run on rows written through this driver.
+    adapts_rows = False
+
+    @abstractmethod
+    def connect(self, conn_info: dict, connect_timeout=None, **kwargs):
+        """Opens a connection; extra keyword arguments go to the driver module."""
+
+    def is_alive(self, conn) -> bool:
+        return True
+
+    def quote(self, name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    def list_databases(self, conn) -> list:
+        return []
+
+    @abstractmethod
+    def fetch_table_metadata(self, conn) -> list:
+        """Same entries as database.fetch_table_metadata."""
+
+    @abstractmethod
+    def fetch_columns(self, conn, table) -> list:
+        """Column names of the table, in table order."""
+
+    @abstractmethod
+    def fetch_all_columns(self, conn):
+        """
+        Column names and primary key columns of every table in one pass:
+        returns ({table: [column, ...]}, {table: [pk column, ...]}).
+        """
+
+    @abstractmethod
+    def primary_key(self, conn, table):
+        """(column, is_integer) of a single-column primary key, else (None, False)."""
+
+    @abstractmethod
+    def estimate_rows(self, conn, table) -> int:
+        """Row count for planning and progress; may be approximate."""
+
+    def estimate_where(self, conn, table, where) -> int:
+        """
+        Rows of the table matching the SQL condition where. Servers answer
+        from the planner; the fallback counts them. A bad condition raises
+        the driver's error.
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {self.quote(table)} WHERE ({where})")
+            return int(cursor.fetchone()[0])
+
+    @abstractmethod
+    def table_exists(self, conn, table) -> bool:
+        """Whether the table exists in the connection's database."""
+
+    def max_packet(self, conn):
+        """Largest statement the server accepts, in bytes, or None if not limited."""
+        return None
+
+    def truncate(self, conn, table):
+        with conn.cursor() as cursor:
+            cursor.execute(f"TRUNCATE TABLE {self.quote(table)}")
+
+    def prepare_session(self, conn, disable_checks=False):
+        """Session settings for a connection about to receive bulk writes."""
+
+    def disable_keys(self, conn, table):
+        """Suspends non-unique index maintenance while a table loads, where the engine can."""
+
+    def enable_keys(self, conn, table):
+        pass
+
+    def open_stream(self, conn, sql, params=()):
+        """
+        Executes a SELECT whose rows are fetched from the server as they
+        are read. Returns a cursor-like object with description,
+        fetchmany() and close(); close it only once drained.
+        """
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def adapt_row(self, row):
+        """Converts values the driver module cannot bind as parameters."""
+        return row
+
+    def describe_error(self, error) -> str:
+        """Message shown when opening a connection failed with error."""
+        detail = str(error).strip()
+        return f"접속 실패: {detail.splitlines()[0]}" if detail else UNEXPECTED_ERROR
+
+
+class MySQLDriver(Driver):
+    name = DB_MYSQL
+    label = "MySQL/MariaDB"
+    default_port = 3306
+    supports_checksums = True
+    adapts_rows = True
+
+    @property
+    def error_types(self):
+        pymysql = _loaded("pymysql")
+        return (pymysql.err.MySQLError,) if pymysql else ()
+
+    def connect(self, conn_info: dict, connect_timeout=None, **kwargs):
+        params = {
+            "host": conn_info["host"],
+            "port": int(conn_info["port"]),
+            "user": conn_info["user"],
+            "password": conn_info["password"],
+            "charset": "utf8mb4",
+        }
+        if conn_info.get("database"):
+            params["database"] = conn_info["database"]
+        if connect_timeout:
+            params["connect_timeout"] = connect_timeout
+        params.update(kwargs)
+        import pymysql
+        return pymysql.connect(**params)
+
+    def is_alive(self, conn) -> bool:
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def quote(self, name: str) -> str:
+        return "`" + name.replace("`", "``") + "`"
+
+    def list_databases(self, conn) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW DATABASES")
+            return [row[0] for row in cursor.fetchall()]
+
+    def fetch_table_metadata(self, conn) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH, ENGINE "
+                "FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE' "
+                "ORDER BY TABLE_NAME"
+            )
+            return [
+                {
+                    "name": name,
+                    "rows": int(rows or 0),
+                    "data_size": int(data_size or 0),
+                    "index_size": int(index_size or 0),
+                    "engine": engine or ""
+                }
+                for name, rows, data_size, index_size, engine in cursor.fetchall()
+            ]
+
+    def fetch_columns(self, conn, table) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+                "ORDER BY ORDINAL_POSITION",
+                (table,)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def fetch_all_columns(self, conn):
+        columns, keys = {}, {}
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_KEY FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, ORDINAL_POSITION"
+            )
+            for table, column, key in cursor.fetchall():
+                columns.setdefault(table, []).append(column)
+                if key == "PRI":
+                    keys.setdefault(table, []).append(column)
+        return columns, keys
+
+    def primary_key(self, conn, table):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT k.COLUMN_NAME, c.DATA_TYPE "
+                "FROM information_schema.KEY_COLUMN_USAGE k "
+                "JOIN information_schema.COLUMNS c "
+                "  ON c.TABLE_SCHEMA = k.TABLE_SCHEMA AND c.TABLE_NAME = k.TABLE_NAME "
+                "  AND c.COLUMN_NAME = k.COLUMN_NAME "
+                "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s "
+                "  AND k.CONSTRAINT_NAME = 'PRIMARY' "
+                "ORDER BY k.ORDINAL_POSITION",
+                (table,)
+            )
+            rows = cursor.fetchall()
+        if len(rows) != 1:
+            return None, False
+        column, data_type = rows[0]
+        return column, data_type.lower() in ("tinyint", "smallint", "mediumint", "int", "bigint")
+
+    def estimate_rows(self, conn, table) -> int:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table,)
+            )
+            row = cursor.fetchone()
+        return int(row[0] or 0) if row else 0
+
+    def estimate_where(self, conn, table, where) -> int:
+        with conn.cursor() as cursor:
+            cursor.execute(f"EXPLAIN SELECT * FROM {self.quote(table)} WHERE ({where})")
+            names = [column[0].lower() for column in cursor.description]
+            row = cursor.fetchone()
+        if not row or row[names.index("rows")] is None:
+            return 0
+        rows = int(row[names.index("rows")])
+        # filtered (MySQL 5.7+) is the share of examined rows the condition keeps.
+        if "filtered" in names and row[names.index("filtered")] is not None:
+            rows = round(rows * float(row[names.index("filtered")]) / 100)
+        return rows
+
+    def table_exists(self, conn, table) -> bool:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table,)
+            )
+            return cursor.fetchone() is not None
+
+    def max_packet(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT @@max_allowed_packet")
+            return int(cursor.fetchone()[0])
+
+    def prepare_session(self, conn, disable_checks=False):
+        # Tables are copied in arbitrary order, so foreign keys pointing
+        # at tables that have not arrived yet must not block the inserts.
+        # Session settings stick to pooled connections, so both are set
+        # explicitly every time.
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SET FOREIGN_KEY_CHECKS = 0, UNIQUE_CHECKS = %s",
+                (0 if disable_checks else 1,)
+            )
+
+    # InnoDB ignores DISABLE KEYS (with a warning) and maintains its
+    # indexes anyway, so the statements are only sent for MyISAM tables.
+    def disable_keys(self, conn, table):
+        if self._is_myisam(conn, table):
+            with conn.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {self.quote(table)} DISABLE KEYS")
+
+    def enable_keys(self, conn, table):
+        if self._is_myisam(conn, table):
+            with conn.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {self.quote(table)} ENABLE KEYS")
+
+    def _is_myisam(self, conn, table) -> bool:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT ENGINE FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table,)
+            )
+            row = cursor.fetchone()
+        return bool(row) and (row[0] or "").upper() == "MYISAM"
+
+    def open_stream(self, conn, sql, params=()):
+        # Closing an SSCursor early drains the rest of the result set; on
+        # error or cancel the pool discards the whole connection instead.
+        import pymysql.cursors
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        cursor.execute(sql, params)
+        return cursor
+
+    def adapt_row(self, row):
+        return tuple(mysql_value(value) for value in row)
+
+    def describe_error(self, error) -> str:
+        pymysql = _loaded("pymysql")
+        if pymysql and isinstance(error, pymysql.err.OperationalError) and len(error.args) >= 2:
+            return translate_error_code(error.args[0], error.args[1])
+        return UNEXPECTED_ERROR
+
+
+def mysql_value(value):
+    """
+    A value as pymysql and LOAD DATA expect it. Values read from PostgreSQL
+    may be bools, json objects and arrays (dicts and lists), timezone-aware
+    timestamps, UUIDs, network addresses and ranges; pymysql cannot bind
+    dicts, writes lists as tuples and drops the offset of timestamps.
+    """
+    if value is None or isinstance(value, (str, bytes, float, decimal.Decimal, datetime.timedelta)):
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        # Aware values are in the source session's time zone; MySQL
+        # DATETIME and TIME columns have none.
+        return value.replace(tzinfo=None) if value.tzinfo is not None else value
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, (set, frozenset)):
+        return ",".join(sorted(value))
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (dict, list)):
+        # Arrays may hold dates or numerics, which json has no encoding for.
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+class _CopyStream:
+    """Cursor-like reader over COPY (query) TO STDOUT with typed rows."""
+
+    def __init__(self, conn, sql, params):
+        self._cursor = conn.cursor()
+        # A zero-row run of the query yields the column names and types.
+        self._cursor.execute(f"SELECT * FROM ({sql}) AS q LIMIT 0", params)
+        self.description = self._cursor.description
+        self._copy = self._cursor.copy(f"COPY ({sql}) TO STDOUT", params)
+        copy = self._copy.__enter__()
+        copy.set_types([column.type_code for column in self.description])
+        self._rows = copy.rows()
+
+    def fetchmany(self, size):
+        rows = []
+        for row in self._rows:
+            rows.append(row)
+            if len(rows) >= size:
+                break
+        return rows
+
+    def close(self):
+        self._copy.__exit__(None, None, None)
+        self._cursor.close()
+
+
+class PostgreSQLDriver(Driver):
+    name = DB_POSTGRESQL
+    label = "PostgreSQL"
+    default_port = 5432
+    adapts_rows = True
+
+    @property
+    def error_types(self):
+        psycopg = _loaded("psycopg")
+        return (psycopg.Error,) if psycopg else ()
+
+    def connect(self, conn_info: dict, connect_timeout=None, **kwargs):
+        try:
+            import psycopg
+        except ImportError:  # PostgreSQL support needs psycopg (version 3)
+            raise RuntimeError("PostgreSQL 연결에는 psycopg 패키지가 필요합니다 (pip install psycopg).") from None
+        params = {
+            "host": conn_info["host"],
+            "port": int(conn_info["port"] or self.default_port),
+            "user": conn_info["user"],
+            "password": conn_info["password"],
+        }
+        if conn_info.get("database"):
+            params["dbname"] = conn_info["database"]
+        if connect_timeout:
+            params["connect_timeout"] = connect_timeout
+        params.update(kwargs)
+        return psycopg.connect(**params)
+
+    def is_alive(self, conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            conn.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def list_databases(self, conn) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname")
+            return [row[0] for row in cursor.fetchall()]
+
+    def fetch_table_metadata(self, conn) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, c.reltuples::bigint, pg_table_size(c.oid), "
+                "       pg_indexes_size(c.oid), COALESCE(am.amname, '') "
+                "FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "LEFT JOIN pg_am am ON am.oid = c.relam "
+                "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p') "
+                "  AND NOT c.relispartition "
+                "ORDER BY c.relname"
+            )
+            return [
+                {
+                    "name": name,
+                    # -1 means the table was never analyzed.
+                    "rows": max(int(rows or 0), 0),
+                    "data_size": int(data_size or 0),
+                    "index_size": int(index_size or 0),
+                    "engine": engine
+                }
+                for name, rows, data_size, index_size, engine in cursor.fetchall()
+            ]
+
+    def fetch_columns(self, conn, table) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = %s "
+                "ORDER BY ordinal_position",
+                (table,)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def fetch_all_columns(self, conn):
+        columns, keys = {}, {}
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() ORDER BY table_name, ordinal_position"
+            )
+            for table, column in cursor.fetchall():
+                columns.setdefault(table, []).append(column)
+            cursor.execute(
+                "SELECT c.relname, a.attname "
+                "FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) "
+                "JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = k.attnum "
+                "WHERE i.indisprimary AND n.nspname = current_schema() "
+                "ORDER BY c.relname, k.ord"
+            )
+            for table, column in cursor.fetchall():
+                keys.setdefault(table, []).append(column)
+        return columns, keys
+
+    def primary_key(self, conn, table):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT a.attname, format_type(a.atttypid, a.atttypmod) "
+                "FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY(i.indkey) "
+                "WHERE i.indisprimary AND n.nspname = current_schema() AND c.relname = %s",
+                (table,)
+            )
+            rows = cursor.fetchall()
+        if len(rows) != 1:
+            return None, False
+        column, data_type = rows[0]
+        return column, data_type in ("smallint", "integer", "bigint")
+
+    def estimate_rows(self, conn, table) -> int:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.reltuples::bigint FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema() AND c.relname = %s",
+                (table,)
+            )
+            row = cursor.fetchone()
+        return max(int(row[0] or 0), 0) if row else 0
+
+    def estimate_where(self, conn, table, where) -> int:
+        with conn.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT * FROM {self.quote(table)} WHERE ({where})")
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def table_exists(self, conn, table) -> bool:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.tables "
+                "WHERE table_schema = current_schema() AND table_name = %s",
+                (table,)
+            )
+            return cursor.fetchone() is not None
+
+    def open_stream(self, conn, sql, params=()):
+        return _CopyStream(conn, sql, params)
+
+    def adapt_row(self, row):
+        # SET columns arrive from MySQL as Python sets; TIME columns as
+        # timedelta, which psycopg would send as an interval; json objects
+        # as dicts, which psycopg has no default dumper for.
+        return tuple(
+            ",".join(sorted(v)) if isinstance(v, (set, frozenset))
+            else format_timedelta(v) if isinstance(v, datetime.timedelta)
+            else json.dumps(v) if isinstance(v, dict)
+            else v
+            for v in row
+        )
+
+
+class SQLiteDriver(Driver):
+    name = DB_SQLITE
+    label = "SQLite"
+    placeholder = "?"
+    error_types = (sqlite3.Error,)
+    adapts_rows = True
+
+    # Applied to every connection: WAL lets readers run beside the writer,
+    # and a big page cache plus NORMAL sync keep large loads fast.
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA foreign_keys = OFF",
+    )
+    # Seconds a writer waits for another connection's transaction.
+    BUSY_TIMEOUT = 60
+
+    def connect(self, conn_info: dict, connect_timeout=None, **kwargs):
+        path = conn_info.get("database")
+        if not path:
+            raise sqlite3.OperationalError("데이터베이스 파일 경로를 입력하세요.")
+        # Pooled connections move between worker threads, one at a time.
+        conn = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT, check_same_thread=False, **kwargs)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return _SQLiteConnection(conn)
+
+    def fetch_table_metadata(self, conn) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+                "ORDER BY name"
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        sizes = self._table_sizes(conn)
+        return [
+            {
+                "name": name,
+                "rows": self.estimate_rows(conn, name),
+                "data_size": sizes.get(name, 0),
+                "index_size": 0,
+                "engine": "SQLite"
+            }
+            for name in names
+        ]
+
+    def _table_sizes(self, conn) -> dict:
+        # dbstat is an optional compile-time feature of SQLite.
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+                return dict(cursor.fetchall())
+        except sqlite3.Error:
+            return {}
+
+    def fetch_columns(self, conn, table) -> list:
+        with conn.cursor() as cursor:
+            cursor.execute(f"PRAGMA table_info({self.quote(table)})")
+            return [row[1] for row in cursor.fetchall()]
+
+    def fetch_all_columns(self, conn):
+        columns, keys = {}, {}
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT m.name, p.name, p.pk FROM sqlite_master m, pragma_table_info(m.name) p "
+                "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+            )
+            for table, column, pk in cursor.fetchall():
+                columns.setdefault(table, []).append(column)
+                if pk:
+                    keys.setdefault(table, []).append((pk, column))
+        return columns, {table: [column for _, column in sorted(pk)] for table, pk in keys.items()}
+
+    def primary_key(self, conn, table):
+        with conn.cursor() as cursor:
+            cursor.execute(f"PRAGMA table_info({self.quote(table)})")
+            keys = [(name, data_type) for _, name, data_type, _, _, pk in cursor.fetchall() if pk]
+        if len(keys) != 1:
+            return None, False
+        column, data_type = keys[0]
+        return column, "INT" in (data_type or "").upper()
+
+    def estimate_rows(self, conn, table) -> int:
+        """
+        Row count from sqlite_stat1 when ANALYZE has run, otherwise
+        MAX(rowid), which is a single index lookup.
+        """
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx IS NULL", (table,))
+                row = cursor.fetchone()
+                if row and row[0]:
+                    return int(row[0].split()[0])
+            except sqlite3.Error:
+                pass
+            try:
+                cursor.execute(f"SELECT MAX(rowid) FROM {self.quote(table)}")
+                row = cursor.fetchone()
+                return int(row[0] or 0)
+            except sqlite3.Error:  # WITHOUT ROWID table
+                return 0
+
+    def table_exists(self, conn, table) -> bool:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            return cursor.fetchone() is not None
+
+    def truncate(self, conn, table):
+        with conn.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.quote(table)}")
+
+    def adapt_row(self, row):
+        return tuple(_sqlite_value(value) for value in row)
+
+
+def _sqlite_value(value):
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return format_timedelta(value)
+    if isinstance(value, (set, frozenset)):
+        return ",".join(sorted(value))
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class _SQLiteConnection:
+    """
+    sqlite3 connection with the small part of the DB-API surface the rest
+    of the code relies on from pymysql/psycopg: cursors usable in a with
+    block, plus commit, rollback and close.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return _SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+class _SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+
+DRIVERS = {driver.name: driver for driver in (MySQLDriver(), PostgreSQLDriver(), SQLiteDriver())}
+
+
+def connect_errors() -> tuple:
+    """
+    Errors raised by any driver when a server cannot be reached or refuses
+    the login. A function, as the driver libraries are imported on first
+    use; call it where the error is caught.
+    """
+    pymysql, psycopg = _loaded("pymysql"), _loaded("psycopg")
+    return tuple(
+        error for error in (
+            pymysql.err.OperationalError if pymysql else None,
+            psycopg.OperationalError if psycopg else None,
+            sqlite3.OperationalError,
+        ) if error is not None
+    )
+
+
+def get_driver(conn_info_or_name) -> Driver:
+    """Driver for a conn_info dict (its 'db_type', MySQL by default) or a name."""
+    name = conn_info_or_name
+    if isinstance(conn_info_or_name, dict):
+        name = conn_info_or_name.get("db_type") or DB_MYSQL
+    try:
+        return DRIVERS[name]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 데이터베이스 종류입니다: {name}") from None
+
+
+def driver_for(conn) -> Driver:
+    """Driver that opened the connection."""
+    if isinstance(conn, _SQLiteConnection):
+        return DRIVERS[DB_SQLITE]
+    psycopg = _loaded("psycopg")
+    if psycopg is not None and isinstance(conn, psycopg.Connection):
+        return DRIVERS[DB_POSTGRESQL]
+    return DRIVERS[DB_MYSQL]
@@ -0,0 +1,327 @@
+# job.py
+
+import fnmatch
+import json
+import os
+
+from checkpoint import CheckpointJournal, endpoint_key, RUN_ABANDONED
+from connection_pool import ConnectionPool
+from chunking import normalize_filters
+from database import fetch_table_metadata, estimate_filtered_rows, probe_connection
+from drivers import DB_MYSQL, DB_POSTGRESQL, get_driver
+from task_context import TaskContext
+from transfer_engine import (
+    TransferEngine, MODE_CREATE, MODE_REPLACE, MODE_APPEND, MODE_UPDATE,
+    LOAD_INSERT, LOAD_DATA_INFILE
+)
+from transfer_scheduler import TransferScheduler, DEFAULT_CONCURRENCY
+from snapshot import SnapshotExporter, SnapshotImporter
+from verify import verify_tables
+
+try:
+    import yaml
+except ImportError:  # YAML job files need PyYAML; JSON ones do not
+    yaml = None
+
+CONNECT_TIMEOUT = 10
+
+MODES = (MODE_CREATE, MODE_REPLACE, MODE_APPEND, MODE_UPDATE)
+LOAD_METHODS = (LOAD_INSERT, LOAD_DATA_INFILE)
+
+# Job file keys and their defaults. source/target are required.
+JOB_DEFAULTS = {
+    "tables": None,       # list of names or fnmatch patterns; None = all
+    "exclude": [],        # names or patterns to leave out
+    "filters": {},        # {name or pattern: {where, columns}}; see resolve_filters
+    "mode": MODE_APPEND,
+    "load_method": LOAD_INSERT,
+    "disable_checks": False,
+    "concurrency": DEFAULT_CONCURRENCY,
+    "batch_size": None,
+    "chunk_rows": None,
+    "resume": True,       # continue an unfinished run between the same DBs
+    "verify": False,      # compare source and target after the copy
+    "report": None,       # path of a JSON/CSV metrics report
+    "checkpoints": None,  # journal path; None = the default location
+}
+
+
+class JobError(Exception):
+    """Raised when a job file is missing, malformed or inconsistent."""
+
+
+def load_job(path, endpoints=("source", "target")) -> dict:
+    """
+    Reads a job file (YAML, or JSON when the name ends in .json) and
+    returns it with defaults filled in. Example:
+
+        source: {host: db1, port: 3306, user: etl, password_env: SRC_PW, database: shop}
+        target: {host: db2, port: 3306, user: etl, password_env: DST_PW, database: shop}
+        tables: ["orders*", customers]
+        mode: append
+        filters:
+          orders*: {where: "created_at >= '2024-01-01'"}
+          customers: {columns: [id, name, email]}
+
+    An endpoint may give password_env, the name of an environment variable
+    holding the password, instead of password. type selects the driver:
+    mysql (default), postgresql or sqlite; for sqlite, database is the
+    file path and the other keys are ignored. Only the endpoints listed
+    in endpoints are required (a snapshot export needs no target).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError as e:
+        raise JobError(f"작업 파일을 읽을 수 없습니다: {e}") from e
+
+    try:
+        if path.lower().endswith(".json"):
+            data = json.loads(text)
+        elif yaml is not None:
+            data = yaml.safe_load(text)
+        else:
+            # JSON is valid YAML flow syntax, so JSON content still loads.
+            data = json.loads(text)
+    except ValueError as e:
+        hint = "" if yaml is not None else " (YAML 작업 파일에는 PyYAML이 필요합니다)"
+        raise JobError(f"작업 파일 형식 오류: {e}{hint}") from e
+    except Exception as e:
+        raise JobError(f"작업 파일 형식 오류: {e}") from e
+
+    return parse_job(data, endpoints)
+
+
+def parse_job(data, endpoints=("source", "target")) -> dict:
+    if not isinstance(data, dict):
+        raise JobError("작업 파일의 최상위는 키/값 형식이어야 합니다.")
+    unknown = set(data) - set(JOB_DEFAULTS) - {"source", "target"}
+    if unknown:
+        raise JobError(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    job = dict(JOB_DEFAULTS)
+    job.update(data)
+    for name in ("source", "target"):
+        job[name] = _parse_endpoint(data.get(name), name) if name in endpoints else None
+    if job["mode"] not in MODES:
+        raise JobError(f"mode는 {', '.join(MODES)} 중 하나여야 합니다.")
+    if job["load_method"] not in LOAD_METHODS:
+        raise JobError(f"load_method는 {', '.join(LOAD_METHODS)} 중 하나여야 합니다.")
+    if isinstance(job["tables"], str):
+        job["tables"] = [job["tables"]]
+    if isinstance(job["exclude"], str):
+        job["exclude"] = [job["exclude"]]
+    try:
+        job["filters"] = normalize_filters(job["filters"])
+    except ValueError as e:
+        raise JobError(str(e)) from None
+    return job
+
+
+def _parse_endpoint(value, name) -> dict:
+    if not isinstance(value, dict):
+        raise JobError(f"{name} 연결 정보가 없습니다.")
+    password = value.get("password", "")
+    if "password_env" in value:
+        password = os.environ.get(value["password_env"])
+        if password is None:
+            raise JobError(f"{name}: 환경 변수 {value['password_env']}가 설정되지 않았습니다.")
+    try:
+        driver = get_driver(value.get("type", DB_MYSQL))
+    except ValueError as e:
+        raise JobError(f"{name}: {e}") from None
+    conn_info = {
+        "db_type": driver.name,
+        "host": value.get("host", "localhost"),
+        "port": value.get("port", driver.default_port or 0),
+        "user": value.get("user", "postgres" if driver.name == DB_POSTGRESQL else "root"),
+        "password": password,
+        "database": value.get("database", "")
+    }
+    try:
+        conn_info["port"] = int(conn_info["port"])
+    except (TypeError, ValueError):
+        raise JobError(f"{name}: 포트 번호가 올바르지 않습니다.") from None
+    if not conn_info["database"]:
+        raise JobError(f"{name}: database를 지정하세요.")
+    return conn_info
+
+
+def select_tables(metadata, tables=None, exclude=()) -> dict:
+    """
+    Picks tables from fetch_table_metadata output by name or fnmatch
+    pattern. Returns {table: estimated_rows} in metadata order; raises
+    JobError for a plain name that does not exist.
+    """
+    names = [table["name"] for table in metadata]
+    if tables is None:
+        wanted = set(names)
+    else:
+        wanted = set()
+        for pattern in tables:
+            matches = fnmatch.filter(names, pattern)
+            if not matches and not any(ch in pattern for ch in "*?["):
+                raise JobError(f"원본 DB에 테이블이 없습니다: {pattern}")
+            wanted.update(matches)
+    for pattern in exclude or ():
+        wanted.difference_update(fnmatch.filter(names, pattern))
+    return {table["name"]: table["rows"] for table in metadata if table["name"] in wanted}
+
+
+def resolve_filters(filters, tables) -> dict:
+    """
+    Matches the job's filters, keyed by name or fnmatch pattern, to the
+    selected tables. An exact name wins over patterns; otherwise the first
+    matching pattern in file order applies.
+    """
+    resolved = {}
+    for table in tables:
+        if table in filters:
+            resolved[table] = filters[table]
+            continue
+        for pattern, spec in filters.items():
+            if fnmatch.fnmatchcase(table, pattern):
+                resolved[table] = spec
+                break
+    return resolved
+
+
+def run_job(job: dict, ctx: TaskContext = None, dry_run=False) -> dict:
+    """
+    Runs a parsed job without any GUI: connects both endpoints, resolves
+    the table list, copies it with TransferScheduler and optionally verifies
+    the result.
+
+    Returns {'tables': {table: rows_copied}, 'verify': [results] or None,
+    'metrics': TransferMetrics or None}. With dry_run only the selected
+    tables are resolved and logged. Raises like TransferScheduler.run.
+    """
+    ctx = ctx or TaskContext()
+    source_pool = ConnectionPool(job["source"], connect_timeout=CONNECT_TIMEOUT)
+    target_pool = ConnectionPool(job["target"], connect_timeout=CONNECT_TIMEOUT)
+    journal = None
+    try:
+        probe_connection(source_pool)
+        probe_connection(target_pool)
+        ctx.log(f"[정보] 연결됨: {endpoint_key(job['source'])} → {endpoint_key(job['target'])}")
+
+        estimates = select_tables(fetch_table_metadata(source_pool), job["tables"], job["exclude"])
+        if not estimates:
+            raise JobError("전송할 테이블이 없습니다.")
+        filters = resolve_filters(job["filters"], estimates)
+        wheres = {table: spec["where"] for table, spec in filters.items() if spec.get("where")}
+        if wheres:
+            try:
+                estimates.update(estimate_filtered_rows(source_pool, wheres, ctx.with_progress(None)))
+            except get_driver(job["source"]).error_types as e:
+                raise JobError(f"필터 조건 오류: {e}") from e
+        ctx.log(f"[정보] 테이블 {len(estimates)}개, 예상 {sum(estimates.values()):,}행")
+        if dry_run:
+            for table, rows in estimates.items():
+                note = f", 필터: {filters[table]}" if table in filters else ""
+                ctx.log(f"  {table} (~{rows:,}행{note})")
+            return {"tables": {}, "verify": None, "metrics": None}
+
+        journal = CheckpointJournal(job["checkpoints"]) if job["checkpoints"] else CheckpointJournal()
+        options = {
+            "mode": job["mode"],
+            "load_method": job["load_method"],
+            "disable_checks": bool(job["disable_checks"])
+        }
+        if filters:
+            options["filters"] = filters
+        checkpoint = journal.find_unfinished(endpoint_key(job["source"]), endpoint_key(job["target"]))
+        if checkpoint and job["resume"]:
+            ctx.log(f"[정보] 중단된 전송을 이어서 진행합니다 (완료된 행 {checkpoint.rows_done():,}개)")
+            estimates = checkpoint.tables
+            options = checkpoint.options
+        else:
+            if checkpoint:
+                checkpoint.finish(RUN_ABANDONED)
+            checkpoint = journal.start_run(
+                endpoint_key(job["source"]), endpoint_key(job["target"]), estimates, options
+            )
+
+        engine_kwargs = {key: job[key] for key in ("batch_size", "chunk_rows") if job[key]}
+        engine = TransferEngine(source_pool, target_pool, **options, **engine_kwargs)
+        scheduler = TransferScheduler(engine, concurrency=job["concurrency"], checkpoint=checkpoint)
+        try:
+            results = scheduler.run(estimates, ctx)
+        finally:
+            if job["report"]:
+                report_options = dict(
+                    options, concurrency=scheduler.concurrency,
+                    batch_size="adaptive" if engine.adaptive else engine.batch_size,
+                    chunk_rows=engine.chunk_rows,
+                    tables=len(estimates)
+                )
+                engine.metrics.write_report(job["report"], report_options)
+                ctx.log(f"[정보] 보고서 저장: {job['report']}")
+
+        verified = None
+        if job["verify"]:
+            # A filtered copy differs from its source table by design.
+            filtered = options.get("filters", {})
+            if filtered:
+                ctx.log(f"[정보] 필터가 있는 테이블은 검증하지 않습니다: {', '.join(filtered)}")
+            tables = [table for table in estimates if table not in filtered]
+            verified = verify_tables(source_pool, target_pool, tables, ctx.with_progress(None))
+        return {"tables": results, "verify": verified, "metrics": engine.metrics}
+    finally:
+        if journal:
+            journal.close()
+        source_pool.close()
+        target_pool.close()
+
+
+def run_export(job: dict, path, ctx: TaskContext = None, compression=None) -> dict:
+    """
+    Writes the job's source tables to the snapshot folder at path.
+    Returns {'tables': {table: rows}, 'metrics': TransferMetrics}.
+    """
+    ctx = ctx or TaskContext()
+    source_pool = ConnectionPool(job["source"], connect_timeout=CONNECT_TIMEOUT)
+    try:
+        probe_connection(source_pool)
+        estimates = select_tables(fetch_table_metadata(source_pool), job["tables"], job["exclude"])
+        if not estimates:
+            raise JobError("내보낼 테이블이 없습니다.")
+        kwargs = {key: job[key] for key in ("batch_size", "chunk_rows") if job[key]}
+        if compression:
+            kwargs["compression"] = compression
+        exporter = SnapshotExporter(source_pool, path, **kwargs)
+        if job["filters"]:
+            ctx.log("[경고] 테이블 필터는 스냅샷 내보내기에 적용되지 않습니다 (전체 행/열).")
+        ctx.log(f"[정보] 테이블 {len(estimates)}개를 {path}로 내보냅니다 ({exporter.compression})")
+        scheduler = TransferScheduler(exporter, concurrency=job["concurrency"])
+        results = scheduler.run(estimates, ctx)
+        return {"tables": results, "metrics": exporter.metrics}
+    finally:
+        source_pool.close()
+
+
+def run_import(job: dict, path, ctx: TaskContext = None) -> dict:
+    """
+    Loads the tables of the snapshot folder at path into the job's target,
+    with the job's mode, load_method and disable_checks. tables/exclude
+    filter the snapshot's tables.
+    Returns {'tables': {table: rows}, 'metrics': TransferMetrics}.
+    """
+    ctx = ctx or TaskContext()
+    target_pool = ConnectionPool(job["target"], connect_timeout=CONNECT_TIMEOUT)
+    try:
+        probe_connection(target_pool)
+        importer = SnapshotImporter(
+            path, target_pool, job["mode"], batch_size=job["batch_size"],
+            load_method=job["load_method"], disable_checks=bool(job["disable_checks"])
+        )
+        available = [{"name": name, "rows": rows} for name, rows in importer.tables().items()]
+        estimates = select_tables(available, job["tables"], job["exclude"])
+        if not estimates:
+            raise JobError("가져올 테이블이 없습니다.")
+        ctx.log(f"[정보] {path}에서 테이블 {len(estimates)}개를 가져옵니다")
+        scheduler = TransferScheduler(importer, concurrency=job["concurrency"])
+        results = scheduler.run(estimates, ctx)
+        return {"tables": results, "metrics": importer.metrics}
+    finally:
+        target_pool.close()
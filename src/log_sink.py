@@ -0,0 +1,89 @@
+# log_sink.py
+
+import collections
+import logging
+import os
+import threading
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".dbtransfer", "logs", "transfer.log")
+
+# Lines kept in memory, which is also all the log view can show.
+DEFAULT_MAX_LINES = 5000
+# The file log rolls over at this size and keeps this many old files.
+DEFAULT_FILE_BYTES = 5 * 1024 * 1024
+DEFAULT_FILE_BACKUPS = 5
+
+# Log lines carry their level as a prefix, e.g. "[경고] ...".
+LEVEL_PREFIXES = {
+    "[오류]": logging.ERROR,
+    "[경고]": logging.WARNING,
+    "[정보]": logging.INFO,
+    "[완료]": logging.INFO,
+}
+
+
+def message_level(message: str) -> int:
+    """Level of a log line from its prefix; INFO for lines without one."""
+    if message.startswith("["):
+        return LEVEL_PREFIXES.get(message[:message.find("]") + 1], logging.INFO)
+    return logging.INFO
+
+
+class LogSink:
+    """
+    Log lines of the GUI, kept in a ring buffer of the last max_lines and,
+    when path is given, written in full to a rotating file. Thread-safe.
+
+    A view does not show each line as it comes: it takes the lines added
+    since its last look with drain(), in batches on a timer. If more than
+    max_lines arrive in between only the newest are kept, and drain()
+    says how many were skipped; the file still has them all.
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, path=None,
+                 max_bytes=DEFAULT_FILE_BYTES, backups=DEFAULT_FILE_BACKUPS):
+        self.max_lines = max_lines
+        self.path = path
+        self._lines = collections.deque(maxlen=max_lines)    # (level, message)
+        self._pending = collections.deque(maxlen=max_lines)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file = RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+            )
+            self._file.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(message)s"))
+
+    def add(self, message):
+        level = message_level(message)
+        with self._lock:
+            self._lines.append((level, message))
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((level, message))
+        file = self._file
+        if file is not None:
+            file.handle(logging.makeLogRecord(
+                {"msg": message, "levelno": level, "levelname": logging.getLevelName(level)}
+            ))
+
+    def drain(self):
+        """Returns (lines added since the last call, how many were skipped)."""
+        with self._lock:
+            lines, dropped = list(self._pending), self._dropped
+            self._pending.clear()
+            self._dropped = 0
+        return lines, dropped
+
+    def lines(self, min_level=logging.NOTSET) -> list:
+        """Buffered messages of at least min_level, oldest first."""
+        with self._lock:
+            return [message for level, message in self._lines if level >= min_level]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
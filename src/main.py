@@ -1,25 +1,116 @@
 # main.py
 
+import time
+
+_STARTED = time.perf_counter()
+
+import os
 import sys
 import traceback
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel,
-    QSplitter, QFrame
+    QSplitter, QFrame, QMessageBox, QFileDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
 from connection_panel import ConnectionPanel
 from table_selector import TableSelector
-from progress_panel import ProgressPanel
+from checkpoint import CheckpointJournal, endpoint_key, RUN_ABANDONED
+from metadata_cache import MetadataCache, DEFAULT_CACHE_PATH
+from workers import run_in_background, cancel_all
+
+# The progress panel, log sink, engines, snapshots and verification are
+# imported where they are first used, after the window is on screen; so are
+# the database driver libraries (see drivers.py).
+
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.qss")
+
+# Set to print how long each phase of the start took, e.g.
+#     DBTRANSFER_STARTUP_TIMING=1 python main.py
+STARTUP_TIMING_ENV = "DBTRANSFER_STARTUP_TIMING"
+
+
+@lru_cache(maxsize=None)
+def load_stylesheet(path=STYLESHEET_PATH) -> str:
+    """
+    The application stylesheet, read once. It is set on the QApplication
+    before any widget exists, so widgets are polished with it as they are
+    created instead of the whole window being polished again afterwards.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        print("style.qss not found — skipping stylesheet.")
+        return ""
+
+
+class StartupTimer:
+    """Phase times of the GUI start; printed to stderr if STARTUP_TIMING_ENV is set."""
+
+    def __init__(self, started=None):
+        self.enabled = bool(os.environ.get(STARTUP_TIMING_ENV))
+        self._started = self._last = started if started is not None else time.perf_counter()
+        self._phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        for phase, seconds in self._phases:
+            print(f"[시작 시간] {phase}: {seconds * 1000:.0f} ms", file=sys.stderr)
+        print(f"[시작 시간] 합계: {(self._last - self._started) * 1000:.0f} ms", file=sys.stderr)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
+        self.startup_timer = startup_timer or StartupTimer()
         self.left_connection_panel = None
         self.table_selector = None
+        self.right_connection_panel = None
+        self.progress_panel = None
+        self.transfer_worker = None
+        self.verify_worker = None
+        self.last_report = None
+        self.checkpoints = self.open_checkpoints()
+        self.metadata_cache = self.open_metadata_cache()
+        self.log_sink = None
+        self.right_layout = None
+        self._deferred_scheduled = False
         self.setup_ui()
+        self.startup_timer.mark("기본 창 구성")
+
+    def open_checkpoints(self):
+        """Opens the local checkpoint journal; transfers still work without it."""
+        try:
+            return CheckpointJournal()
+        except Exception:
+            traceback.print_exc()
+            return None
+
+    def open_metadata_cache(self):
+        """Opens the on-disk table list cache, falling back to memory only."""
+        try:
+            return MetadataCache(DEFAULT_CACHE_PATH)
+        except Exception:
+            traceback.print_exc()
+            return MetadataCache()
+
+    def open_log_sink(self):
+        """Opens the rotating log file, falling back to the in-memory log only."""
+        from log_sink import LogSink, DEFAULT_LOG_PATH
+        try:
+            return LogSink(path=DEFAULT_LOG_PATH)
+        except Exception:
+            traceback.print_exc()
+            return LogSink()
 
     def setup_ui(self):
         self.setWindowTitle("데이터베이스 테이블 내보내기 / 가져오기")
@@ -37,14 +128,6 @@ class MainWindow(QMainWindow):
 
         central_widget.setLayout(main_layout)
 
-        # Optional: Load QSS if exists
-        try:
-            with open("style.qss", "r") as f:
-                qss = f.read()
-                self.setStyleSheet(qss)
-        except FileNotFoundError:
-            print("style.qss not found — skipping stylesheet.")
-
     def create_header(self, layout):
         header_frame = QFrame()
         header_frame.setStyleSheet("""
@@ -85,14 +168,15 @@ class MainWindow(QMainWindow):
 
         # Store references
         self.left_connection_panel = ConnectionPanel("데이터베이스 연결")
-        self.table_selector = TableSelector("내보낼 테이블 선택")
+        self.table_selector = TableSelector("내보낼 테이블 선택", cache=self.metadata_cache)
 
         layout.addWidget(self.left_connection_panel)
         layout.addWidget(self.table_selector)
         panel.setLayout(layout)
 
-        # Connect button click to handler
-        self.left_connection_panel.test_btn.clicked.connect(self.handle_left_connection)
+        # Load tables once the source database is reachable
+        self.left_connection_panel.connected.connect(self.handle_left_connection)
+        self.table_selector.export_btn.clicked.connect(self.handle_snapshot_export)
 
         return panel
 
@@ -107,28 +191,371 @@ class MainWindow(QMainWindow):
         title_label.setFont(title_font)
         title_label.setStyleSheet("color: #28a745; margin: 10px;")
         layout.addWidget(title_label)
-        layout.addWidget(ConnectionPanel("데이터베이스 연결"))
-        layout.addWidget(ProgressPanel("가져오기 옵션 및 진행 상태"))
+        # Filled in by create_deferred_panels once the window is painted.
+        self.right_layout = layout
         panel.setLayout(layout)
         return panel
 
-    def handle_left_connection(self):
-        """Called when test connection button is clicked."""
-        if "연결됨" in self.left_connection_panel.status_label.text():
-            conn_info = {
-                "host": self.left_connection_panel.host.text().strip(),
-                "port": int(self.left_connection_panel.port.text().strip()),
-                "user": self.left_connection_panel.username.text().strip(),
-                "password": self.left_connection_panel.password.text().strip(),
-                "database": self.left_connection_panel.database.text().strip()
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._deferred_scheduled:
+            self._deferred_scheduled = True
+            self.startup_timer.mark("첫 화면 그리기")
+            QTimer.singleShot(0, self.create_deferred_panels)
+
+    def create_deferred_panels(self):
+        """
+        Builds the target side, its connection panel and the progress panel,
+        after the first paint: importing the progress panel loads the
+        transfer engine, and neither is needed to show the window. Does
+        nothing once built, so handlers can call it to be sure.
+        """
+        if self.progress_panel is not None:
+            return
+        from progress_panel import ProgressPanel
+
+        self.log_sink = self.open_log_sink()
+        self.right_connection_panel = ConnectionPanel("데이터베이스 연결")
+        self.progress_panel = ProgressPanel("가져오기 옵션 및 진행 상태", log_sink=self.log_sink)
+        self.right_layout.addWidget(self.right_connection_panel)
+        self.right_layout.addWidget(self.progress_panel)
+
+        self.progress_panel.transfer_btn.clicked.connect(self.handle_transfer)
+        self.progress_panel.verify_btn.clicked.connect(self.handle_verify)
+        self.progress_panel.report_btn.clicked.connect(self.handle_save_report)
+        self.progress_panel.import_btn.clicked.connect(self.handle_snapshot_import)
+
+        if self.checkpoints and self.checkpoints.find_unfinished():
+            self.progress_panel.append_log(
+                "[정보] 중단된 전송 기록이 있습니다. 같은 원본/대상 DB에 연결한 뒤 "
+                "전송 시작을 누르면 이어서 전송할 수 있습니다."
+            )
+        self.startup_timer.mark("대상 패널 구성")
+        self.startup_timer.report()
+
+    def handle_left_connection(self, pool):
+        """Called when the source connection test succeeds."""
+        self.table_selector.load_tables(pool)
+
+    def handle_transfer(self):
+        """Copies the checked tables from the left database to the right one."""
+        if self.transfer_worker:
+            self.transfer_worker.cancel()
+            self.progress_panel.append_log("[정보] 전송 취소 요청...")
+            return
+
+        if not self.left_connection_panel.is_connected() or not self.right_connection_panel.is_connected():
+            QMessageBox.warning(self, "전송 불가", "원본과 대상 데이터베이스에 먼저 연결하세요.")
+            return
+
+        source_pool = self.left_connection_panel.pool
+        target_pool = self.right_connection_panel.pool
+        if not source_pool.database or not target_pool.database:
+            QMessageBox.warning(self, "전송 불가", "원본과 대상 데이터베이스 이름을 입력하세요.")
+            return
+
+        panel = self.progress_panel
+        checkpoint = self.ask_resume(source_pool, target_pool)
+        if checkpoint:
+            estimates = checkpoint.tables
+            options = checkpoint.options
+        else:
+            tables = self.table_selector.get_selected_tables()
+            if not tables:
+                QMessageBox.warning(self, "전송 불가", "전송할 테이블을 선택하세요.")
+                return
+            estimates = {table: self.table_selector.get_row_estimate(table) for table in tables}
+            options = {
+                "mode": panel.get_import_mode(),
+                "load_method": panel.get_load_method(),
+                "disable_checks": panel.get_disable_checks()
             }
-            self.table_selector.load_tables(conn_info)
+            # Kept in the checkpoint options, so a resumed run filters alike.
+            filters = self.table_selector.get_filters(tables)
+            if filters:
+                options["filters"] = filters
+            if self.checkpoints:
+                checkpoint = self.checkpoints.start_run(
+                    endpoint_key(source_pool.conn_info), endpoint_key(target_pool.conn_info),
+                    estimates, options
+                )
+
+        from transfer_engine import TransferEngine
+        engine = TransferEngine(source_pool, target_pool, **options)
+        self.start_run(engine, estimates, options, checkpoint, "전송")
+
+    def start_run(self, engine, estimates, options, checkpoint=None, title="전송"):
+        """
+        Runs an engine (TransferEngine, SnapshotExporter or SnapshotImporter)
+        over {table: estimated_rows} in the background, reporting into the
+        progress panel. title names the operation in status messages.
+        """
+        from transfer_scheduler import TransferScheduler
+        panel = self.progress_panel
+        scheduler = TransferScheduler(
+            engine, concurrency=panel.get_concurrency(), checkpoint=checkpoint
+        )
+        report_options = dict(
+            options, concurrency=scheduler.concurrency,
+            batch_size="adaptive" if engine.adaptive else engine.batch_size,
+            chunk_rows=engine.chunk_rows,
+            tables=len(estimates)
+        )
+        panel.set_running(True)
+        panel.set_progress(0)
+        panel.clear_metrics()
+        self.table_selector.export_btn.setEnabled(False)
+        self.lock_connections(True)
+
+        def on_progress(info):
+            if info["total_rows"]:
+                panel.set_progress(info["done_rows"] / info["total_rows"] * 100)
+            panel.set_status(
+                f"{info['table']}: {info['rows']:,} / {info['total']:,}행 "
+                f"(전체 {info['done_rows']:,} / {info['total_rows']:,}행)"
+            )
+            panel.set_metrics(info["rate"], info["eta"], info["bottleneck"])
+
+        def on_result(results):
+            panel.set_progress(100)
+            panel.set_status(f"{title} 완료")
+
+        def on_error(error):
+            panel.append_log(f"[오류] {error}")
+            panel.set_status(f"{title} 실패")
+
+        def on_cancelled():
+            panel.append_log(f"[정보] {title} 작업이 취소되었습니다.")
+            panel.set_status(f"{title} 취소됨")
+
+        def on_finished():
+            self.transfer_worker = None
+            self.lock_connections(self.verify_worker is not None)
+            self.last_report = (engine.metrics, report_options)
+            panel.set_running(False)
+            panel.report_btn.setEnabled(True)
+            self.table_selector.export_btn.setEnabled(True)
+            report = engine.metrics.report()
+            if report["totals"]["rows"]:
+                panel.append_log(
+                    f"[정보] {report['totals']['rows']:,}행, {report['elapsed']:.1f}초 "
+                    f"(평균 {report['totals']['rows_per_sec']:,.0f}행/초)"
+                )
+
+        self.transfer_worker = run_in_background(
+            scheduler.run, estimates,
+            on_result=on_result,
+            on_error=on_error,
+            on_progress=on_progress,
+            on_log=panel.append_log,
+            on_cancelled=on_cancelled,
+            on_finished=on_finished
+        )
+
+    def handle_snapshot_export(self):
+        """Writes the checked source tables to a snapshot folder."""
+        self.create_deferred_panels()
+        if self.transfer_worker:
+            return
+        if not self.left_connection_panel.is_connected() or not self.left_connection_panel.pool.database:
+            QMessageBox.warning(self, "내보내기 불가", "원본 데이터베이스에 먼저 연결하세요.")
+            return
+        tables = self.table_selector.get_selected_tables()
+        if not tables:
+            QMessageBox.warning(self, "내보내기 불가", "내보낼 테이블을 선택하세요.")
+            return
+        path = QFileDialog.getExistingDirectory(self, "스냅샷을 저장할 폴더 선택")
+        if not path:
+            return
+
+        from snapshot import SnapshotExporter, SnapshotError
+        try:
+            exporter = SnapshotExporter(self.left_connection_panel.pool, path)
+        except SnapshotError as e:
+            QMessageBox.warning(self, "내보내기 불가", str(e))
+            return
+        self.progress_panel.append_log(f"[정보] 스냅샷 내보내기: {path} ({exporter.compression})")
+        if self.table_selector.get_filters(tables):
+            self.progress_panel.append_log("[경고] 테이블 필터는 스냅샷 내보내기에 적용되지 않습니다 (전체 행/열).")
+        estimates = {table: self.table_selector.get_row_estimate(table) for table in tables}
+        self.start_run(exporter, estimates, {"snapshot": path, "compression": exporter.compression}, title="내보내기")
+
+    def handle_snapshot_import(self):
+        """Loads every table of a snapshot folder into the right database."""
+        if self.transfer_worker:
+            return
+        if not self.right_connection_panel.is_connected() or not self.right_connection_panel.pool.database:
+            QMessageBox.warning(self, "가져오기 불가", "대상 데이터베이스에 먼저 연결하세요.")
+            return
+        path = QFileDialog.getExistingDirectory(self, "가져올 스냅샷 폴더 선택")
+        if not path:
+            return
+
+        panel = self.progress_panel
+        options = {
+            "mode": panel.get_import_mode(),
+            "load_method": panel.get_load_method(),
+            "disable_checks": panel.get_disable_checks()
+        }
+        from snapshot import SnapshotImporter, SnapshotError
+        try:
+            importer = SnapshotImporter(path, self.right_connection_panel.pool, **options)
+        except SnapshotError as e:
+            QMessageBox.warning(self, "가져오기 불가", str(e))
+            return
+        estimates = importer.tables()
+        if not estimates:
+            QMessageBox.warning(self, "가져오기 불가", "스냅샷에 가져올 테이블이 없습니다.")
+            return
+        panel.append_log(f"[정보] 스냅샷 가져오기: {path} (테이블 {len(estimates)}개)")
+        self.start_run(importer, estimates, dict(options, snapshot=path), title="가져오기")
+
+    def handle_verify(self):
+        """Compares the checked tables between the left and right databases."""
+        if self.verify_worker:
+            self.verify_worker.cancel()
+            self.progress_panel.append_log("[정보] 검증 취소 요청...")
+            return
+
+        if not self.left_connection_panel.is_connected() or not self.right_connection_panel.is_connected():
+            QMessageBox.warning(self, "검증 불가", "원본과 대상 데이터베이스에 먼저 연결하세요.")
+            return
+
+        source_pool = self.left_connection_panel.pool
+        target_pool = self.right_connection_panel.pool
+        if not source_pool.database or not target_pool.database:
+            QMessageBox.warning(self, "검증 불가", "원본과 대상 데이터베이스 이름을 입력하세요.")
+            return
+        if not (source_pool.driver.supports_checksums and target_pool.driver.supports_checksums):
+            QMessageBox.warning(self, "검증 불가", "검증은 MySQL/MariaDB 사이에서만 지원합니다.")
+            return
+
+        tables = self.table_selector.get_selected_tables()
+        if not tables:
+            QMessageBox.warning(self, "검증 불가", "검증할 테이블을 선택하세요.")
+            return
+
+        panel = self.progress_panel
+        # A filtered copy differs from its source table by design.
+        filtered = self.table_selector.get_filters(tables)
+        if filtered:
+            panel.append_log(f"[정보] 필터가 있는 테이블은 검증하지 않습니다: {', '.join(filtered)}")
+            tables = [table for table in tables if table not in filtered]
+            if not tables:
+                return
+        panel.set_verifying(True)
+        self.lock_connections(True)
+        panel.set_progress(0)
+        panel.append_log(f"[정보] 테이블 {len(tables)}개 검증 시작...")
+
+        def on_progress(info):
+            panel.set_progress(info["done"] / info["total"] * 100)
+            panel.set_status(f"검증 중: {info['table']} ({info['done']} / {info['total']})")
+
+        def on_result(results):
+            mismatched = [result["table"] for result in results if not result["match"]]
+            if mismatched:
+                panel.append_log(f"[경고] 불일치 테이블 {len(mismatched)}개: {', '.join(mismatched)}")
+                panel.set_status(f"검증 완료 - 불일치 {len(mismatched)}개")
+            else:
+                panel.append_log(f"[완료] 테이블 {len(results)}개 모두 일치합니다.")
+                panel.set_status("검증 완료 - 모두 일치")
+
+        def on_error(error):
+            panel.append_log(f"[오류] 검증 실패: {error}")
+            panel.set_status("검증 실패")
+
+        def on_cancelled():
+            panel.append_log("[정보] 검증이 취소되었습니다.")
+            panel.set_status("검증 취소됨")
+
+        def on_finished():
+            self.verify_worker = None
+            self.lock_connections(self.transfer_worker is not None)
+            panel.set_verifying(False)
+
+        from verify import verify_tables
+        self.verify_worker = run_in_background(
+            verify_tables, source_pool, target_pool, tables,
+            on_result=on_result,
+            on_error=on_error,
+            on_progress=on_progress,
+            on_log=panel.append_log,
+            on_cancelled=on_cancelled,
+            on_finished=on_finished
+        )
+
+    def lock_connections(self, locked):
+        """
+        Keeps both connection panels disabled while a transfer or
+        verification runs: testing or disconnecting closes the pool the
+        run is still using.
+        """
+        self.left_connection_panel.setEnabled(not locked)
+        self.right_connection_panel.setEnabled(not locked)
+
+    def handle_save_report(self):
+        """Saves the metrics of the last transfer as a JSON or CSV report."""
+        if not self.last_report:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "보고서 저장", "transfer-report.json", "JSON (*.json);;CSV (*.csv)"
+        )
+        if not path:
+            return
+        metrics, options = self.last_report
+        try:
+            metrics.write_report(path, options)
+        except OSError as e:
+            QMessageBox.warning(self, "저장 실패", f"보고서를 저장하지 못했습니다: {e}")
+            return
+        self.progress_panel.append_log(f"[정보] 보고서 저장: {path}")
+
+    def ask_resume(self, source_pool, target_pool):
+        """
+        Offers to continue an interrupted run between the same two databases.
+        Returns its RunCheckpoint if the user agrees, otherwise None (and the
+        old run is marked abandoned).
+        """
+        if not self.checkpoints:
+            return None
+        unfinished = self.checkpoints.find_unfinished(
+            endpoint_key(source_pool.conn_info), endpoint_key(target_pool.conn_info)
+        )
+        if not unfinished:
+            return None
+
+        answer = QMessageBox.question(
+            self,
+            "이어서 전송",
+            f"이 두 데이터베이스 사이에 중단된 전송이 있습니다.\n\n"
+            f"테이블 {len(unfinished.tables)}개, 완료된 행 {unfinished.rows_done():,}개\n\n"
+            "마지막으로 커밋된 위치부터 이어서 전송할까요?\n"
+            "(아니요를 선택하면 기록을 버리고 새로 전송합니다.)"
+        )
+        if answer == QMessageBox.Yes:
+            return unfinished
+        unfinished.finish(RUN_ABANDONED)
+        return None
+
+    def closeEvent(self, event):
+        # Stop background work before the widgets it reports to go away.
+        cancel_all()
+        self.metadata_cache.close()
+        if self.log_sink:
+            self.log_sink.close()
+        super().closeEvent(event)
 
 
 def main():
+    timer = StartupTimer(_STARTED)
+    timer.mark("모듈 import")
     try:
         app = QApplication(sys.argv)
-        window = MainWindow()
+        timer.mark("QApplication 생성")
+        app.setStyleSheet(load_stylesheet())
+        timer.mark("스타일시트 적용")
+        window = MainWindow(timer)
         window.show()
         sys.exit(app.exec())
     except Exception:
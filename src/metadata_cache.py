@@ -0,0 +1,111 @@
+# metadata_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from drivers import DB_MYSQL, DB_SQLITE
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".dbtransfer", "metadata.sqlite3")
+
+# Entries younger than this are used as-is.
+DEFAULT_TTL = 5 * 60
+# Older entries, up to this age, are shown at once and refreshed in the
+# background; beyond it they are dropped.
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def metadata_key(conn_info: dict) -> str:
+    """Identifies a schema by driver, host, port and database."""
+    db_type = conn_info.get("db_type") or DB_MYSQL
+    if db_type == DB_SQLITE:
+        return f"sqlite:{os.path.abspath(conn_info['database'])}"
+    return f"{db_type}://{conn_info['host']}:{conn_info['port']}/{conn_info.get('database', '')}"
+
+
+class MetadataCache:
+    """
+    Schema metadata (see database.fetch_schema) per endpoint, kept in
+    memory and, when path is given, in a local SQLite file so it survives
+    restarts. Thread-safe.
+
+    get() returns an entry with its age; the caller decides from
+    is_fresh() whether to refresh it, so a stale entry can be shown while
+    the new one loads.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_age=DEFAULT_MAX_AGE):
+        self.ttl = ttl
+        self.max_age = max_age
+        self._entries = {}  # key -> (value, fetched_at)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+            self._db.execute("DELETE FROM metadata WHERE fetched_at < ?", (time.time() - max_age,))
+            self._db.commit()
+
+    def get(self, key):
+        """Returns (value, age in seconds), or None if nothing usable is cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, fetched_at FROM metadata WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = self._entries[key] = (json.loads(row[0]), row[1])
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        age = max(time.time() - fetched_at, 0.0)
+        if age > self.max_age:
+            self.invalidate(key)
+            return None
+        return value, age
+
+    def is_fresh(self, age) -> bool:
+        return age < self.ttl
+
+    def put(self, key, value):
+        fetched_at = time.time()
+        with self._lock:
+            self._entries[key] = (value, fetched_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value, fetched_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), fetched_at)
+                )
+                self._db.commit()
+
+    def invalidate(self, key=None):
+        """Forgets one endpoint, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            if self._db is not None:
+                if key is None:
+                    self._db.execute("DELETE FROM metadata")
+                else:
+                    self._db.execute("DELETE FROM metadata WHERE key = ?", (key,))
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
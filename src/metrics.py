@@ -0,0 +1,151 @@
+# metrics.py
+
+import csv
+import json
+import threading
+import time
+from collections import deque
+
+# Where a batch's time goes: reading it from the source cursor, encoding it,
+# sending it to the target, and committing it there.
+STAGES = ("fetch", "serialize", "write", "commit")
+
+STAGE_LABELS = {
+    "fetch": "원본 읽기 (원본 서버/네트워크)",
+    "serialize": "직렬화 (클라이언트 CPU)",
+    "write": "대상 쓰기 (대상 서버/네트워크)",
+    "commit": "커밋 (대상 디스크 동기화)",
+}
+
+# Seconds of history the rolling rows/sec is computed over.
+DEFAULT_RATE_WINDOW = 10.0
+
+
+def format_duration(seconds) -> str:
+    """Formats seconds as e.g. '1시간 5분', '3분 12초' or '42초'."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}시간 {minutes}분"
+    if minutes:
+        return f"{minutes}분 {seconds}초"
+    return f"{seconds}초"
+
+
+def _new_counters() -> dict:
+    counters = {"rows": 0, "bytes": 0, "batches": 0}
+    counters.update({stage: 0.0 for stage in STAGES})
+    return counters
+
+
+def _busy_rate(counters) -> float:
+    """Rows per second of time actually spent on the counters' batches."""
+    busy = sum(counters[stage] for stage in STAGES)
+    return counters["rows"] / busy if busy else 0.0
+
+
+class TransferMetrics:
+    """
+    Thread-safe counters of one transfer run.
+
+    The engine calls record_batch once per committed batch with the rows,
+    payload bytes (size of the encoded TSV) and the seconds spent in each
+    stage. Counters are kept in total, per table and per worker thread.
+    """
+
+    def __init__(self, rate_window=DEFAULT_RATE_WINDOW):
+        self.rate_window = rate_window
+        self.started_at = time.time()
+        self.finished_at = None
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._totals = _new_counters()
+        self._tables = {}
+        self._workers = {}
+        self._samples = deque()  # (monotonic time, total rows)
+
+    def record_batch(self, table, rows, size, timings: dict):
+        worker = threading.current_thread().name
+        now = time.monotonic()
+        with self._lock:
+            for counters in (
+                self._totals,
+                self._tables.setdefault(table, _new_counters()),
+                self._workers.setdefault(worker, _new_counters())
+            ):
+                counters["rows"] += rows
+                counters["bytes"] += size
+                counters["batches"] += 1
+                for stage, seconds in timings.items():
+                    counters[stage] += seconds
+            self._samples.append((now, self._totals["rows"]))
+            while len(self._samples) > 2 and self._samples[1][0] < now - self.rate_window:
+                self._samples.popleft()
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    def elapsed(self) -> float:
+        end = self.finished_at - self.started_at if self.finished_at else time.monotonic() - self._start
+        return max(end, 0.0)
+
+    def rate(self) -> float:
+        """Rows per second over the last rate_window seconds."""
+        with self._lock:
+            if len(self._samples) < 2:
+                rows = self._totals["rows"]
+                elapsed = time.monotonic() - self._start
+                return rows / elapsed if elapsed > 0 else 0.0
+            (first_time, first_rows), (last_time, last_rows) = self._samples[0], self._samples[-1]
+        window = max(time.monotonic(), last_time) - first_time
+        return (last_rows - first_rows) / window if window > 0 else 0.0
+
+    def bottleneck(self):
+        """Returns (stage, share of stage time) for the slowest stage, or None."""
+        with self._lock:
+            times = {stage: self._totals[stage] for stage in STAGES}
+        total = sum(times.values())
+        if not total:
+            return None
+        stage = max(times, key=times.get)
+        return stage, times[stage] / total
+
+    def report(self, options=None) -> dict:
+        """Everything recorded so far as a JSON-serializable dict."""
+        with self._lock:
+            totals = dict(self._totals)
+            tables = {name: dict(c) for name, c in self._tables.items()}
+            workers = {name: dict(c) for name, c in self._workers.items()}
+        elapsed = self.elapsed()
+        for counters in [totals, *tables.values(), *workers.values()]:
+            counters["rows_per_sec"] = round(_busy_rate(counters), 1)
+            for stage in STAGES:
+                counters[stage] = round(counters[stage], 3)
+        totals["rows_per_sec"] = round(totals["rows"] / elapsed, 1) if elapsed else 0.0
+        return {
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed": round(elapsed, 3),
+            "options": options or {},
+            "totals": totals,
+            "tables": tables,
+            "workers": workers,
+        }
+
+    def write_report(self, path, options=None):
+        """Writes the report as JSON, or as CSV when path ends in .csv."""
+        report = self.report(options)
+        if not path.lower().endswith(".csv"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            return
+
+        fields = ["rows", "bytes", "batches", *STAGES, "rows_per_sec"]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["kind", "name", *fields])
+            writer.writerow(["total", "", *(report["totals"][field] for field in fields)])
+            for kind in ("tables", "workers"):
+                for name, counters in sorted(report[kind].items()):
+                    writer.writerow([kind[:-1], name, *(counters[field] for field in fields)])
@@ -0,0 +1,157 @@
+# pipeline.py
+
+import queue
+import threading
+import time
+
+from bulk_load import encode_rows, estimate_size
+
+# Batches aim at this much encoded data...
+DEFAULT_TARGET_BATCH_BYTES = 4 * 1024 * 1024
+# ...and at most this many seconds of write + commit each.
+DEFAULT_TARGET_LATENCY = 1.0
+
+# The first batch of a table is small, since nothing is known yet about its
+# row width; later ones grow by at most GROWTH_FACTOR per step.
+FIRST_BATCH_ROWS = 100
+MIN_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 200000
+GROWTH_FACTOR = 4
+
+# Batches read ahead of the writer. Together with the batch in each stage
+# this bounds memory to about (depth + 2) batches per chunk being copied.
+DEFAULT_QUEUE_DEPTH = 2
+
+_POLL_SECONDS = 0.1
+
+
+class BatchSizer:
+    """
+    Chooses the row count of the next batch of one table.
+
+    After every committed batch, record() is given its rows, encoded size
+    (or its estimate) and write + commit time. The next size is the smaller
+    of the one that hits target_bytes at the average row width seen so far
+    and the one that hits target_latency at the measured write speed.
+    Shrinking takes effect at once; growth is limited to GROWTH_FACTOR per
+    batch so one cheap batch cannot overshoot. max_bytes (from the target's
+    packet limit) always applies, even to a fixed size (adaptive=False).
+
+    Chunks of the same table share one sizer, so it is thread-safe.
+    """
+
+    def __init__(self, rows=None, adaptive=True, target_bytes=DEFAULT_TARGET_BATCH_BYTES,
+                 target_latency=DEFAULT_TARGET_LATENCY, max_bytes=None):
+        self.adaptive = adaptive
+        self.target_bytes = target_bytes
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self._fixed = rows
+        self._rows = rows if not adaptive and rows else FIRST_BATCH_ROWS
+        self._row_bytes = None
+        self._lock = threading.Lock()
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    def record(self, rows, size, seconds):
+        if not rows:
+            return
+        with self._lock:
+            row_bytes = max(size / rows, 1.0)
+            # Weighted toward recent batches, as rows often widen over a table.
+            self._row_bytes = row_bytes if self._row_bytes is None else (self._row_bytes + row_bytes) / 2
+
+            if self.adaptive:
+                ideal = self.target_bytes / self._row_bytes
+                if seconds > 0:
+                    ideal = min(ideal, rows * self.target_latency / seconds)
+                ideal = min(ideal, self._rows * GROWTH_FACTOR)
+            else:
+                ideal = self._fixed
+            if self.max_bytes:
+                ideal = min(ideal, self.max_bytes / self._row_bytes)
+            self._rows = int(min(max(ideal, MIN_BATCH_ROWS), MAX_BATCH_ROWS))
+
+
+class _Failed:
+    def __init__(self, error):
+        self.error = error
+
+
+class ReaderStage:
+    """
+    Reads batches from a stream cursor on its own thread and hands them to
+    the caller through a bounded queue, so fetching the next batch overlaps
+    writing the current one. When the writer falls behind the queue fills
+    and the reader waits (backpressure).
+
+    With encode, batches are also encoded for a writer that takes the
+    LOAD DATA text; without it encoded is None and size an estimate.
+
+    get() returns (rows, encoded, size, fetch_seconds, serialize_seconds),
+    or None once the cursor is drained, and re-raises errors of the reader.
+    close() must always be called; it stops the reader and waits for it,
+    so the source connection is idle once it returns.
+    """
+
+    def __init__(self, cursor, sizer: BatchSizer, depth=DEFAULT_QUEUE_DEPTH, check=None,
+                 encode=True):
+        self._cursor = cursor
+        self._sizer = sizer
+        self._encode = encode
+        self._check = check
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{threading.current_thread().name}-reader", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        clock = time.perf_counter
+        try:
+            while not self._stop.is_set():
+                started = clock()
+                batch = self._cursor.fetchmany(self._sizer.rows)
+                fetched = clock()
+                if not batch:
+                    break
+                if self._encode:
+                    encoded = encode_rows(batch)
+                    size = len(encoded)
+                else:
+                    encoded, size = None, estimate_size(batch)
+                if not self._put((batch, encoded, size, fetched - started, clock() - fetched)):
+                    return
+        except BaseException as e:
+            self._put(_Failed(e))
+            return
+        self._put(None)
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self):
+        while True:
+            if self._check:
+                self._check()
+            try:
+                item = self._queue.get(timeout=_POLL_SECONDS)
+                break
+            except queue.Empty:
+                continue
+        if isinstance(item, _Failed):
+            raise item.error
+        return item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
@@ -1,17 +1,40 @@
 # progress_panel.py
 
+import logging
+
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QProgressBar, QTextEdit, QPushButton
+    QProgressBar, QPlainTextEdit, QPushButton, QSpinBox, QCheckBox
+)
+from PySide6.QtCore import QTimer
+
+from log_sink import LogSink
+from transfer_engine import (
+    MODE_CREATE, MODE_REPLACE, MODE_APPEND, MODE_UPDATE,
+    LOAD_INSERT, LOAD_DATA_INFILE
 )
+from transfer_scheduler import DEFAULT_CONCURRENCY
+from metrics import STAGE_LABELS, format_duration
 
 
 class ProgressPanel(QGroupBox):
     """Progress and import mode panel."""
 
-    def __init__(self, title="전송 진행 상태", parent=None):
+    # Engine mode for each entry of the import mode combo box, in order.
+    IMPORT_MODES = [MODE_CREATE, MODE_REPLACE, MODE_APPEND, MODE_UPDATE]
+    # Engine load method for each entry of the load method combo box.
+    LOAD_METHODS = [LOAD_INSERT, LOAD_DATA_INFILE]
+    # Lowest level shown for each entry of the log level combo box.
+    LOG_LEVELS = [logging.INFO, logging.WARNING, logging.ERROR]
+
+    # New log lines are shown together at most this often.
+    LOG_FLUSH_MS = 200
+
+    def __init__(self, title="전송 진행 상태", parent=None, log_sink=None):
         super().__init__(title, parent)
+        self.log_sink = log_sink or LogSink()
         self.setup_ui()
+        self.append_log("[정보] 전송을 시작할 준비가 되었습니다...")
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -26,9 +49,32 @@ class ProgressPanel(QGroupBox):
             "기존 데이터 업데이트"
         ])
         mode_layout.addWidget(self.import_mode)
+        mode_layout.addWidget(QLabel("동시 전송:"))
+        self.concurrency = QSpinBox()
+        self.concurrency.setRange(1, 16)
+        self.concurrency.setValue(DEFAULT_CONCURRENCY)
+        self.concurrency.setToolTip("동시에 전송할 테이블 수 (테이블마다 원본/대상 연결을 하나씩 사용)")
+        mode_layout.addWidget(self.concurrency)
         mode_layout.addStretch()
         layout.addLayout(mode_layout)
 
+        method_layout = QHBoxLayout()
+        method_layout.addWidget(QLabel("가져오기 방식:"))
+        self.load_method = QComboBox()
+        self.load_method.addItems(["INSERT 배치", "LOAD DATA LOCAL INFILE"])
+        self.load_method.setToolTip("LOAD DATA는 대상 서버의 local_infile 설정이 켜져 있어야 합니다.")
+        method_layout.addWidget(self.load_method)
+        self.disable_checks = QCheckBox("적재 중 키 검사 끄기 (MyISAM은 인덱스 갱신도)")
+        self.disable_checks.setToolTip(
+            "테이블을 적재하는 동안 UNIQUE_CHECKS를 끕니다. MyISAM 테이블은 "
+            "ALTER TABLE ... DISABLE KEYS로 보조 인덱스 갱신도 미룹니다.\n"
+            "InnoDB에서는 UNIQUE_CHECKS만 적용됩니다. 보조 인덱스를 적재 후에 "
+            "만들려면 '새 테이블 생성' 모드를 사용하세요."
+        )
+        method_layout.addWidget(self.disable_checks)
+        method_layout.addStretch()
+        layout.addLayout(method_layout)
+
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
@@ -38,14 +84,126 @@ class ProgressPanel(QGroupBox):
         self.status_text.setWordWrap(True)
         layout.addWidget(self.status_text)
 
-        self.log_area = QTextEdit()
+        self.metrics_text = QLabel("")
+        self.metrics_text.setWordWrap(True)
+        layout.addWidget(self.metrics_text)
+
+        log_header = QHBoxLayout()
+        log_header.addWidget(QLabel("로그:"))
+        log_header.addStretch()
+        log_header.addWidget(QLabel("표시 수준:"))
+        self.log_level = QComboBox()
+        self.log_level.addItems(["전체", "경고 이상", "오류만"])
+        self.log_level.currentIndexChanged.connect(self._reload_log)
+        log_header.addWidget(self.log_level)
+        layout.addLayout(log_header)
+
+        self.log_area = QPlainTextEdit()
         self.log_area.setMaximumHeight(150)
         self.log_area.setReadOnly(True)
-        self.log_area.setText("[정보] 전송을 시작할 준비가 되었습니다...")
+        self.log_area.setUndoRedoEnabled(False)
+        self.log_area.setMaximumBlockCount(self.log_sink.max_lines)
+        if self.log_sink.path:
+            self.log_area.setToolTip(f"최근 {self.log_sink.max_lines:,}줄만 표시합니다. 전체 로그: {self.log_sink.path}")
         layout.addWidget(self.log_area)
 
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(self.LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self._flush_log)
+
+        button_layout = QHBoxLayout()
         self.transfer_btn = QPushButton("전송 시작")
         self.transfer_btn.setMinimumHeight(40)
-        layout.addWidget(self.transfer_btn)
+        button_layout.addWidget(self.transfer_btn, 3)
+        self.verify_btn = QPushButton("검증")
+        self.verify_btn.setMinimumHeight(40)
+        self.verify_btn.setToolTip(
+            "선택한 테이블의 원본과 대상 데이터를 기본 키 구간별 체크섬으로 비교합니다."
+        )
+        button_layout.addWidget(self.verify_btn, 1)
+        self.report_btn = QPushButton("보고서 저장")
+        self.report_btn.setMinimumHeight(40)
+        self.report_btn.setToolTip("마지막 전송의 처리량과 단계별 소요 시간을 JSON/CSV로 저장합니다.")
+        self.report_btn.setEnabled(False)
+        button_layout.addWidget(self.report_btn, 1)
+        self.import_btn = QPushButton("스냅샷 가져오기")
+        self.import_btn.setMinimumHeight(40)
+        self.import_btn.setToolTip("파일로 내보낸 스냅샷 폴더를 현재 가져오기 옵션으로 대상 DB에 적재합니다.")
+        button_layout.addWidget(self.import_btn, 1)
+        layout.addLayout(button_layout)
 
         self.setLayout(layout)
+
+    def get_import_mode(self) -> str:
+        return self.IMPORT_MODES[self.import_mode.currentIndex()]
+
+    def get_load_method(self) -> str:
+        return self.LOAD_METHODS[self.load_method.currentIndex()]
+
+    def get_disable_checks(self) -> bool:
+        return self.disable_checks.isChecked()
+
+    def get_concurrency(self) -> int:
+        return self.concurrency.value()
+
+    def set_running(self, running):
+        """Switches the transfer button between start and cancel."""
+        self.transfer_btn.setText("전송 취소" if running else "전송 시작")
+        self.import_mode.setEnabled(not running)
+        self.concurrency.setEnabled(not running)
+        self.load_method.setEnabled(not running)
+        self.disable_checks.setEnabled(not running)
+        self.verify_btn.setEnabled(not running)
+        self.import_btn.setEnabled(not running)
+        if running:
+            self.report_btn.setEnabled(False)
+
+    def set_verifying(self, verifying):
+        """Switches the verify button between start and cancel."""
+        self.verify_btn.setText("검증 취소" if verifying else "검증")
+        self.transfer_btn.setEnabled(not verifying)
+        self.import_btn.setEnabled(not verifying)
+
+    def set_progress(self, value):
+        self.progress_bar.setValue(int(value))
+
+    def set_status(self, text):
+        self.status_text.setText(text)
+
+    def set_metrics(self, rate, eta=None, bottleneck=None):
+        """Shows rolling rows/sec, time left and the slowest transfer stage."""
+        parts = [f"속도 {rate:,.0f}행/초"]
+        if eta is not None:
+            parts.append(f"남은 시간 약 {format_duration(eta)}")
+        if bottleneck:
+            stage, share = bottleneck
+            parts.append(f"병목: {STAGE_LABELS[stage]} {share:.0%}")
+        self.metrics_text.setText(" · ".join(parts))
+
+    def clear_metrics(self):
+        self.metrics_text.setText("")
+
+    def append_log(self, message):
+        self.log_sink.add(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """Shows the lines logged since the last flush with one append."""
+        lines, dropped = self.log_sink.drain()
+        min_level = self.LOG_LEVELS[self.log_level.currentIndex()]
+        messages = [message for level, message in lines if level >= min_level]
+        if dropped:
+            messages.insert(0, f"[정보] 로그 {dropped:,}줄 생략")
+        if messages:
+            self.log_area.appendPlainText("\n".join(messages))
+
+    def _reload_log(self):
+        """Redraws the view from the buffer at the chosen level."""
+        self._log_timer.stop()
+        self.log_sink.drain()
+        min_level = self.LOG_LEVELS[self.log_level.currentIndex()]
+        self.log_area.setPlainText("\n".join(self.log_sink.lines(min_level)))
+        scroll_bar = self.log_area.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
@@ -0,0 +1,599 @@
+# schema.py
+
+import re
+
+from database import show_create_table
+from drivers import DB_MYSQL, DB_POSTGRESQL, DB_SQLITE
+
+# Portable column types every driver can read and write; see _MYSQL_TYPES,
+# _postgresql_type and _sqlite_type for how native types map onto them.
+SMALLINT = "smallint"
+INTEGER = "integer"
+BIGINT = "bigint"
+DECIMAL = "decimal"
+REAL = "real"
+DOUBLE = "double"
+BOOLEAN = "boolean"
+CHAR = "char"
+VARCHAR = "varchar"
+TEXT = "text"
+BLOB = "blob"
+DATE = "date"
+TIME = "time"
+TIMESTAMP = "timestamp"
+JSON = "json"
+
+KIND_INDEX = "index"
+KIND_FOREIGN_KEY = "foreign_key"
+
+# Key parts of a SHOW CREATE TABLE body that can be added after the load.
+_DEFERRABLE_MYSQL = re.compile(r"^(?:(?:UNIQUE |FULLTEXT |SPATIAL )?KEY |CONSTRAINT `(?:[^`]|``)+` FOREIGN KEY )")
+_MYSQL_KEY_NAME = re.compile(r"^(?:UNIQUE |FULLTEXT |SPATIAL )?KEY `((?:[^`]|``)+)` \(`((?:[^`]|``)+)`")
+_MYSQL_CONSTRAINT_NAME = re.compile(r"^CONSTRAINT `((?:[^`]|``)+)`")
+
+_MYSQL_TYPES = {
+    "tinyint": SMALLINT, "smallint": SMALLINT, "mediumint": INTEGER, "int": INTEGER,
+    "integer": INTEGER, "bigint": BIGINT, "year": SMALLINT,
+    "decimal": DECIMAL, "numeric": DECIMAL, "float": REAL, "double": DOUBLE,
+    "char": CHAR, "varchar": VARCHAR,
+    "binary": BLOB, "varbinary": BLOB, "bit": BLOB,
+    "tinyblob": BLOB, "blob": BLOB, "mediumblob": BLOB, "longblob": BLOB,
+    "date": DATE, "time": TIME, "datetime": TIMESTAMP, "timestamp": TIMESTAMP,
+    "json": JSON,
+}
+
+_PG_RULES = {"a": "NO ACTION", "r": "RESTRICT", "c": "CASCADE", "n": "SET NULL", "d": "SET DEFAULT"}
+
+# Longest identifier PostgreSQL keeps.
+_PG_MAX_IDENTIFIER = 63
+
+
+def table_ddl(conn, source_driver, target_driver, table, columns=None):
+    """
+    Returns (create_sql, deferred) for recreating a source table on the
+    target. create_sql defines the columns and primary key only; deferred
+    lists the secondary indexes and foreign keys to add once the data is
+    in (see deferred_statements), since maintaining them row by row makes
+    a bulk load several times slower.
+
+    Between two MySQL servers the SHOW CREATE TABLE text is kept verbatim
+    apart from the split, so types, defaults, charsets and table options
+    carry over. Other combinations are translated through a portable
+    column model: names, types, NOT NULL, keys and foreign keys, but no
+    defaults, checks or comments.
+
+    columns limits the table to those columns (see project_schema); it
+    always goes through the column model, with native types when both
+    ends use the same driver.
+    """
+    native = source_driver.name == target_driver.name
+    # MySQL index names are per table; elsewhere they are per schema.
+    prefix = source_driver.name == DB_MYSQL
+    if columns is not None:
+        schema = project_schema(read_schema(conn, source_driver, table), columns)
+        return _render(schema, target_driver, native, prefix)
+    if source_driver.name == DB_MYSQL and target_driver.name == DB_MYSQL:
+        return split_create_table(show_create_table(conn, table))
+    if source_driver.name == DB_SQLITE and target_driver.name == DB_SQLITE:
+        return _sqlite_native_ddl(conn, table)
+    return _render(read_schema(conn, source_driver, table), target_driver, native, prefix)
+
+
+def project_schema(schema, columns) -> dict:
+    """
+    read_schema output reduced to the given columns plus the primary key.
+    Indexes and foreign keys that need a dropped column are dropped too.
+    """
+    keep = set(columns) | set(schema["primary_key"])
+    return dict(
+        schema,
+        columns=[column for column in schema["columns"] if column["name"] in keep],
+        indexes=[index for index in schema["indexes"] if keep.issuperset(index["columns"])],
+        foreign_keys=[fk for fk in schema["foreign_keys"] if keep.issuperset(fk["columns"])]
+    )
+
+
+def split_create_table(create_sql):
+    """
+    Splits MySQL SHOW CREATE TABLE output into a CREATE TABLE with the
+    secondary indexes and foreign keys removed, and the removed parts as
+    deferred entries. An index that the table's AUTO_INCREMENT column
+    depends on stays in place, as MySQL requires one.
+    """
+    lines = create_sql.split("\n")
+    # The definitions end at the first line starting with ")"; table options
+    # and e.g. a /*!50100 PARTITION BY ... */ block may follow on more lines.
+    end = next(i for i in range(1, len(lines)) if lines[i].startswith(")"))
+    head, body, tail = lines[0], lines[1:end], "\n".join(lines[end:])
+    parts = [line.strip().rstrip(",") for line in body]
+
+    auto_column = None
+    for part in parts:
+        if part.startswith("`") and " AUTO_INCREMENT" in part:
+            auto_column = part[1:part.index("` ")].replace("``", "`")
+    primary = next((part for part in parts if part.startswith("PRIMARY KEY")), "")
+    needs_key = auto_column is not None and f"(`{auto_column.replace('`', '``')}`" not in primary
+
+    kept, deferred = [], []
+    for part in parts:
+        if not _DEFERRABLE_MYSQL.match(part):
+            kept.append(part)
+            continue
+        key = _MYSQL_KEY_NAME.match(part)
+        if needs_key and key and key.group(2).replace("``", "`") == auto_column:
+            kept.append(part)
+            needs_key = False
+            continue
+        if key:
+            deferred.append({
+                "name": key.group(1).replace("``", "`"), "kind": KIND_INDEX, "sql": part,
+                # InnoDB builds only one FULLTEXT index per ALTER TABLE.
+                "separate": part.startswith("FULLTEXT")
+            })
+        else:
+            name = _MYSQL_CONSTRAINT_NAME.match(part).group(1).replace("``", "`")
+            deferred.append({"name": name, "kind": KIND_FOREIGN_KEY, "sql": part})
+
+    create_sql = head + "\n" + ",\n".join(f"  {part}" for part in kept) + "\n" + tail
+    return create_sql, deferred
+
+
+def deferred_statements(driver, table, deferred, existing=()) -> list:
+    """
+    SQL adding the deferred indexes and foreign keys of table_ddl to a
+    loaded table, skipping names already in existing. On MySQL everything
+    goes into a single ALTER TABLE, which rebuilds the table once; elsewhere
+    indexes are separate CREATE INDEX statements and the foreign keys share
+    one ALTER TABLE.
+    """
+    statements = []
+    clauses = []
+    for item in deferred:
+        if item["name"] in existing:
+            continue
+        if item["kind"] == KIND_INDEX and driver.name != DB_MYSQL:
+            statements.append(item["sql"])
+        elif item.get("separate"):
+            statements.append(f"ALTER TABLE {driver.quote(table)} ADD {item['sql']}")
+        else:
+            clauses.append(f"ADD {item['sql']}")
+    if clauses:
+        statements.append(f"ALTER TABLE {driver.quote(table)} {', '.join(clauses)}")
+    return statements
+
+
+def existing_names(conn, driver, table) -> set:
+    """Names of the table's indexes and constraints on the target."""
+    if driver.name == DB_MYSQL:
+        sql = (
+            "SELECT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "UNION SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+        params = (table, table)
+    elif driver.name == DB_POSTGRESQL:
+        sql = (
+            "SELECT indexname FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = %s "
+            "UNION SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass(quote_ident(%s))"
+        )
+        params = (table, table)
+    else:
+        sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?"
+        params = (table,)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
+
+
+def missing_references(conn, driver, deferred) -> list:
+    """Foreign keys in deferred whose referenced table is not on the target."""
+    return [
+        item for item in deferred
+        if item["kind"] == KIND_FOREIGN_KEY and item.get("references")
+        and not driver.table_exists(conn, item["references"])
+    ]
+
+
+def read_schema(conn, driver, table) -> dict:
+    """
+    Reads a table definition into the portable model:
+    {
+        'name': str,
+        'columns': [{'name', 'type', 'native', 'nullable', 'length',
+                     'precision', 'scale'}],
+        'primary_key': [column, ...],
+        'indexes': [{'name', 'columns', 'unique'}],
+        'foreign_keys': [{'name', 'columns', 'references', 'ref_columns',
+                          'on_update', 'on_delete'}]
+    }
+    type is one of the portable types above; native is the type as the
+    source declares it.
+    """
+    readers = {DB_MYSQL: _read_mysql, DB_POSTGRESQL: _read_postgresql, DB_SQLITE: _read_sqlite}
+    schema = readers[driver.name](conn, table)
+    schema["name"] = table
+    return schema
+
+
+def _group(rows) -> dict:
+    """Collects (name, position, column, *extra) rows into {name: (columns, extra)}."""
+    grouped = {}
+    for name, _, column, *extra in sorted(rows, key=lambda row: (row[0], row[1])):
+        grouped.setdefault(name, ([], extra))[0].append(column)
+    return grouped
+
+
+def _read_mysql(conn, table) -> dict:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, IS_NULLABLE, CHARACTER_MAXIMUM_LENGTH, "
+            "       NUMERIC_PRECISION, NUMERIC_SCALE "
+            "FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+            (table,)
+        )
+        columns = []
+        for name, data_type, column_type, nullable, length, precision, scale in cursor.fetchall():
+            data_type = data_type.lower()
+            column_type = column_type.lower()
+            portable = _MYSQL_TYPES.get(data_type, TEXT)
+            if "unsigned" in column_type:
+                # One size up keeps the full unsigned range.
+                portable = {SMALLINT: INTEGER, INTEGER: BIGINT}.get(portable, portable)
+                if data_type == "bigint":
+                    portable, precision, scale = DECIMAL, 20, 0
+            columns.append({
+                "name": name, "type": portable, "native": column_type,
+                "nullable": nullable == "YES", "length": length,
+                "precision": precision, "scale": scale
+            })
+
+        cursor.execute(
+            "SELECT INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME, NON_UNIQUE, INDEX_TYPE "
+            "FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        indexes = _group(cursor.fetchall())
+
+        cursor.execute(
+            "SELECT k.CONSTRAINT_NAME, k.ORDINAL_POSITION, k.COLUMN_NAME, "
+            "       k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE "
+            "FROM information_schema.KEY_COLUMN_USAGE k "
+            "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+            "  ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+            "  AND r.TABLE_NAME = k.TABLE_NAME "
+            "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s",
+            (table,)
+        )
+        foreign_keys = _collect_foreign_keys(cursor.fetchall())
+
+    primary = indexes.pop("PRIMARY", ([], None))[0]
+    return {
+        "columns": columns,
+        "primary_key": primary,
+        "indexes": [
+            {"name": name, "columns": cols, "unique": not non_unique}
+            for name, (cols, (non_unique, index_type)) in sorted(indexes.items())
+            # Full-text and spatial indexes have no portable equivalent.
+            if index_type not in ("FULLTEXT", "SPATIAL")
+        ],
+        "foreign_keys": foreign_keys
+    }
+
+
+def _collect_foreign_keys(rows) -> list:
+    """rows: (name, position, column, ref_table, ref_column, on_update, on_delete)."""
+    foreign_keys = {}
+    for name, _, column, ref_table, ref_column, on_update, on_delete in sorted(rows, key=lambda r: (r[0], r[1])):
+        fk = foreign_keys.setdefault(name, {
+            "name": name, "columns": [], "references": ref_table, "ref_columns": [],
+            "on_update": on_update, "on_delete": on_delete
+        })
+        fk["columns"].append(column)
+        fk["ref_columns"].append(ref_column)
+    return list(foreign_keys.values())
+
+
+def _postgresql_type(data_type, length):
+    if data_type in ("smallint", "integer", "bigint", "real", "boolean", "date", "text"):
+        return data_type
+    if data_type == "numeric":
+        return DECIMAL
+    if data_type == "double precision":
+        return DOUBLE
+    if data_type == "character":
+        return CHAR
+    if data_type == "character varying":
+        return VARCHAR if length else TEXT
+    if data_type == "bytea":
+        return BLOB
+    if data_type.startswith("time "):
+        return TIME
+    if data_type.startswith("timestamp"):
+        return TIMESTAMP
+    if data_type in ("json", "jsonb"):
+        return JSON
+    return TEXT
+
+
+def _read_postgresql(conn, table) -> dict:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.column_name, c.data_type, format_type(a.atttypid, a.atttypmod), c.is_nullable, "
+            "       c.character_maximum_length, c.numeric_precision, c.numeric_scale "
+            "FROM information_schema.columns c "
+            "JOIN pg_attribute a ON a.attrelid = to_regclass(quote_ident(c.table_name)) "
+            "  AND a.attname = c.column_name "
+            "WHERE c.table_schema = current_schema() AND c.table_name = %s "
+            "ORDER BY c.ordinal_position",
+            (table,)
+        )
+        columns = []
+        for name, data_type, native, nullable, length, precision, scale in cursor.fetchall():
+            portable = _postgresql_type(data_type, length)
+            if data_type == "numeric" and precision is None:
+                scale = None
+            columns.append({
+                "name": name, "type": portable, "native": native,
+                "nullable": nullable == "YES", "length": length,
+                "precision": precision, "scale": scale
+            })
+
+        # Expression indexes (attnum 0) have no column list and are skipped.
+        cursor.execute(
+            "SELECT ic.relname, k.ord, a.attname, i.indisunique, i.indisprimary "
+            "FROM pg_index i "
+            "JOIN pg_class ic ON ic.oid = i.indexrelid "
+            "CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) "
+            "LEFT JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum "
+            "WHERE i.indrelid = to_regclass(quote_ident(%s)) AND i.indpred IS NULL",
+            (table,)
+        )
+        rows = cursor.fetchall()
+        expressions = {row[0] for row in rows if row[2] is None}
+        indexes = _group(row for row in rows if row[0] not in expressions)
+
+        cursor.execute(
+            "SELECT con.conname, k.ord, a.attname, rc.relname, ra.attname, "
+            "       con.confupdtype, con.confdeltype "
+            "FROM pg_constraint con "
+            "JOIN pg_class rc ON rc.oid = con.confrelid "
+            "CROSS JOIN LATERAL unnest(con.conkey, con.confkey) WITH ORDINALITY AS k(attnum, refnum, ord) "
+            "JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum "
+            "JOIN pg_attribute ra ON ra.attrelid = con.confrelid AND ra.attnum = k.refnum "
+            "WHERE con.contype = 'f' AND con.conrelid = to_regclass(quote_ident(%s))",
+            (table,)
+        )
+        foreign_keys = _collect_foreign_keys(
+            (name, ord, column, ref_table, ref_column, _PG_RULES[on_update], _PG_RULES[on_delete])
+            for name, ord, column, ref_table, ref_column, on_update, on_delete in cursor.fetchall()
+        )
+
+    primary = next((cols for cols, (unique, is_primary) in indexes.values() if is_primary), [])
+    return {
+        "columns": columns,
+        "primary_key": primary,
+        "indexes": [
+            {"name": name, "columns": cols, "unique": unique}
+            for name, (cols, (unique, is_primary)) in sorted(indexes.items()) if not is_primary
+        ],
+        "foreign_keys": foreign_keys
+    }
+
+
+def _sqlite_type(declared):
+    """Portable type for a declared SQLite type, following SQLite's affinity rules."""
+    declared = (declared or "").upper()
+    size = re.findall(r"\d+", declared)
+    if "INT" in declared:
+        return BIGINT, None, None, None
+    if "CHAR" in declared or "CLOB" in declared or "TEXT" in declared:
+        if size and "CHAR" in declared:
+            return (CHAR if declared.startswith("CHAR") else VARCHAR), int(size[0]), None, None
+        return TEXT, None, None, None
+    if "BLOB" in declared or not declared:
+        return BLOB, None, None, None
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return DOUBLE, None, None, None
+    if "BOOL" in declared:
+        return BOOLEAN, None, None, None
+    if "DATETIME" in declared or "TIMESTAMP" in declared:
+        return TIMESTAMP, None, None, None
+    if "DATE" in declared:
+        return DATE, None, None, None
+    if "TIME" in declared:
+        return TIME, None, None, None
+    if "JSON" in declared:
+        return JSON, None, None, None
+    precision = int(size[0]) if size else None
+    scale = int(size[1]) if len(size) > 1 else (0 if size else None)
+    return DECIMAL, None, precision, scale
+
+
+def _read_sqlite(conn, table) -> dict:
+    with conn.cursor() as cursor:
+        cursor.execute(f"PRAGMA table_info({_sqlite_quote(table)})")
+        columns = []
+        keyed = []
+        for _, name, declared, not_null, _, pk in cursor.fetchall():
+            portable, length, precision, scale = _sqlite_type(declared)
+            columns.append({
+                "name": name, "type": portable, "native": declared,
+                "nullable": not not_null, "length": length,
+                "precision": precision, "scale": scale
+            })
+            if pk:
+                keyed.append((pk, name))
+
+        cursor.execute(f"PRAGMA index_list({_sqlite_quote(table)})")
+        index_list = [(name, unique) for _, name, unique, origin, partial in cursor.fetchall()
+                      if origin != "pk" and not partial]
+        indexes = []
+        for name, unique in index_list:
+            cursor.execute(f"PRAGMA index_info({_sqlite_quote(name)})")
+            cols = [column for _, _, column in sorted(cursor.fetchall())]
+            if None in cols:
+                continue
+            if name.startswith("sqlite_autoindex_"):
+                # Inline UNIQUE constraint; the generated name means nothing elsewhere.
+                name = f"{table}_{'_'.join(cols)}_key"
+            indexes.append({"name": name, "columns": cols, "unique": bool(unique)})
+
+        cursor.execute(f"PRAGMA foreign_key_list({_sqlite_quote(table)})")
+        foreign_keys = _collect_foreign_keys(
+            (f"fk_{table}_{fk_id}", seq, column, ref_table, ref_column, on_update, on_delete)
+            for fk_id, seq, ref_table, column, ref_column, on_update, on_delete, _ in cursor.fetchall()
+            # A key naming no parent columns refers to the parent's primary key.
+            if ref_column is not None
+        )
+
+    return {
+        "columns": columns,
+        "primary_key": [name for _, name in sorted(keyed)],
+        "indexes": sorted(indexes, key=lambda index: index["name"]),
+        "foreign_keys": foreign_keys
+    }
+
+
+def _sqlite_quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sqlite_native_ddl(conn, table):
+    """The table's own CREATE TABLE, with its CREATE INDEX statements deferred."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        create_sql = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL ORDER BY name",
+            (table,)
+        )
+        deferred = [{"name": name, "kind": KIND_INDEX, "sql": sql} for name, sql in cursor.fetchall()]
+    return create_sql, deferred
+
+
+def _mysql_column_type(column, keyed):
+    portable = column["type"]
+    length = column["length"]
+    if keyed and portable in (TEXT, JSON):
+        # MySQL cannot index TEXT/BLOB without a prefix length.
+        return f"VARCHAR({min(length or 255, 768)})"
+    if keyed and portable == BLOB:
+        return f"VARBINARY({min(length or 255, 3072)})"
+    if keyed and portable == VARCHAR and length and length > 768:
+        return "VARCHAR(768)"
+    if portable == DECIMAL:
+        if column["precision"] is None:
+            return "DECIMAL(65,30)"
+        return f"DECIMAL({min(column['precision'], 65)},{min(column['scale'] or 0, 30)})"
+    if portable == CHAR and length and length <= 255:
+        return f"CHAR({length})"
+    if portable in (CHAR, VARCHAR):
+        return f"VARCHAR({length})" if length and length <= 16383 else "LONGTEXT"
+    return {
+        SMALLINT: "SMALLINT", INTEGER: "INT", BIGINT: "BIGINT", REAL: "FLOAT",
+        DOUBLE: "DOUBLE", BOOLEAN: "TINYINT(1)", TEXT: "LONGTEXT", BLOB: "LONGBLOB",
+        DATE: "DATE", TIME: "TIME(6)", TIMESTAMP: "DATETIME(6)", JSON: "JSON",
+    }[portable]
+
+
+def _postgresql_column_type(column):
+    portable = column["type"]
+    if portable == DECIMAL:
+        if column["precision"] is None:
+            return "numeric"
+        return f"numeric({column['precision']},{column['scale'] or 0})"
+    if portable in (CHAR, VARCHAR) and column["length"]:
+        return f"{'char' if portable == CHAR else 'varchar'}({column['length']})"
+    return {
+        SMALLINT: "smallint", INTEGER: "integer", BIGINT: "bigint", REAL: "real",
+        DOUBLE: "double precision", BOOLEAN: "boolean", CHAR: "text", VARCHAR: "text",
+        TEXT: "text", BLOB: "bytea", DATE: "date", TIME: "time", TIMESTAMP: "timestamp",
+        JSON: "jsonb",
+    }[portable]
+
+
+def _sqlite_column_type(column):
+    portable = column["type"]
+    if portable in (CHAR, VARCHAR) and column["length"]:
+        return f"{'CHAR' if portable == CHAR else 'VARCHAR'}({column['length']})"
+    if portable == DECIMAL and column["precision"] is not None:
+        return f"NUMERIC({column['precision']},{column['scale'] or 0})"
+    return {
+        SMALLINT: "INTEGER", INTEGER: "INTEGER", BIGINT: "INTEGER", DECIMAL: "NUMERIC",
+        REAL: "REAL", DOUBLE: "REAL", BOOLEAN: "BOOLEAN", CHAR: "TEXT", VARCHAR: "TEXT",
+        TEXT: "TEXT", BLOB: "BLOB", DATE: "DATE", TIME: "TIME", TIMESTAMP: "DATETIME",
+        JSON: "TEXT",
+    }[portable]
+
+
+def _render(schema, driver, native=False, prefix=False):
+    """
+    create_sql and deferred entries for schema on driver's dialect. prefix
+    puts the table name in front of index names, which must be unique per
+    schema outside MySQL.
+    """
+    quote = driver.quote
+    table = schema["name"]
+    keyed = set(schema["primary_key"])
+    for index in schema["indexes"]:
+        keyed.update(index["columns"])
+    for fk in schema["foreign_keys"]:
+        keyed.update(fk["columns"])
+
+    definitions = []
+    for column in schema["columns"]:
+        if native:
+            data_type = column["native"]
+        elif driver.name == DB_MYSQL:
+            data_type = _mysql_column_type(column, column["name"] in keyed)
+        elif driver.name == DB_POSTGRESQL:
+            data_type = _postgresql_column_type(column)
+        else:
+            data_type = _sqlite_column_type(column)
+        not_null = " NOT NULL" if not column["nullable"] else ""
+        definitions.append(f"{quote(column['name'])} {data_type}{not_null}")
+    if schema["primary_key"]:
+        definitions.append(f"PRIMARY KEY ({', '.join(map(quote, schema['primary_key']))})")
+
+    deferred = []
+    for index in schema["indexes"]:
+        name = index["name"]
+        if prefix and driver.name != DB_MYSQL:
+            name = f"{table}_{name}"[:_PG_MAX_IDENTIFIER]
+        unique = "UNIQUE " if index["unique"] else ""
+        columns = ", ".join(map(quote, index["columns"]))
+        if driver.name == DB_MYSQL:
+            sql = f"{unique}KEY {quote(name)} ({columns})"
+        else:
+            sql = f"CREATE {unique}INDEX {quote(name)} ON {quote(table)} ({columns})"
+        deferred.append({"name": name, "kind": KIND_INDEX, "sql": sql})
+
+    for fk in schema["foreign_keys"]:
+        clause = (
+            f"FOREIGN KEY ({', '.join(map(quote, fk['columns']))}) "
+            f"REFERENCES {quote(fk['references'])} ({', '.join(map(quote, fk['ref_columns']))})"
+            f" ON UPDATE {fk['on_update']} ON DELETE {fk['on_delete']}"
+        )
+        if driver.name == DB_SQLITE:
+            # SQLite cannot add a foreign key to an existing table; with
+            # foreign_keys off during the load it costs nothing up front.
+            definitions.append(clause)
+            continue
+        # NOT VALID skips checking rows that are already loaded, as tables
+        # referenced later in the run may still be empty.
+        suffix = " NOT VALID" if driver.name == DB_POSTGRESQL else ""
+        deferred.append({
+            "name": fk["name"], "kind": KIND_FOREIGN_KEY, "references": fk["references"],
+            "sql": f"CONSTRAINT {quote(fk['name'])} {clause}{suffix}"
+        })
+
+    create_sql = f"CREATE TABLE {quote(table)} ({', '.join(definitions)})"
+    if driver.name == DB_MYSQL:
+        create_sql += " DEFAULT CHARSET=utf8mb4"
+    return create_sql, deferred
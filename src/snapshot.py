@@ -0,0 +1,390 @@
+# snapshot.py
+
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+
+from bulk_load import InsertWriter, LoadDataWriter, encode_rows, decode_rows
+from chunking import Chunk, find_primary_key, plan_chunks, DEFAULT_CHUNK_ROWS
+from checkpoint import endpoint_key
+from database import estimate_rows, fetch_column_types, show_create_table
+from drivers import DB_MYSQL
+from metrics import TransferMetrics
+from schema import split_create_table
+from task_context import TaskContext
+from transfer_engine import (
+    TransferEngine, TransferError, MODE_CREATE, MODE_UPDATE,
+    LOAD_INSERT, LOAD_DATA_INFILE, DEFAULT_BATCH_SIZE
+)
+
+try:
+    import zstandard
+except ImportError:  # zstd snapshots need the zstandard package; gzip is built in
+    zstandard = None
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+DEFAULT_COMPRESSION = COMPRESSION_ZSTD if zstandard else COMPRESSION_GZIP
+# Fast levels: snapshots trade a little size for extract/load speed.
+COMPRESSION_LEVEL = 3
+_EXTENSIONS = {COMPRESSION_GZIP: ".tsv.gz", COMPRESSION_ZSTD: ".tsv.zst"}
+
+# Column types whose values are raw bytes and must not be decoded as text.
+BINARY_TYPES = (
+    "binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob",
+    "bit", "geometry", "point", "linestring", "polygon", "multipoint",
+    "multilinestring", "multipolygon", "geometrycollection"
+)
+INTEGER_TYPES = ("tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year")
+
+_READ_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+class SnapshotError(TransferError):
+    """Raised for a missing, unreadable or damaged snapshot."""
+
+
+def open_compressed(path, mode, compression):
+    """Opens a snapshot data file for binary line-wise reading or writing."""
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(path, mode, compresslevel=COMPRESSION_LEVEL)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SnapshotError("zstd 스냅샷을 읽거나 쓰려면 zstandard 패키지가 필요합니다.")
+        if "w" in mode:
+            return zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(level=COMPRESSION_LEVEL))
+        return io.BufferedReader(zstandard.open(path, mode))
+    raise SnapshotError(f"지원하지 않는 압축 형식입니다: {compression}")
+
+
+def read_manifest(path) -> dict:
+    """
+    Reads the manifest of the snapshot directory at path:
+    {
+        'version': int, 'created_at': float, 'source': str, 'compression': str,
+        'tables': {
+            name: {
+                'create_sql': str,
+                'columns': [{'name', 'data_type', 'column_type'}, ...],
+                'pk': str or None,
+                'rows': int,
+                'complete': bool,
+                'files': [{'file': str, 'rows': int, 'checksum': int, 'bytes': int}, ...]
+            }
+        }
+    }
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"스냅샷을 읽을 수 없습니다: {e}") from e
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 버전입니다: {manifest.get('version')}")
+    return manifest
+
+
+def snapshot_tables(manifest) -> dict:
+    """Returns {table: rows} for the completely exported tables."""
+    return {name: entry["rows"] for name, entry in manifest["tables"].items() if entry["complete"]}
+
+
+def _table_dir(table) -> str:
+    # Table names may hold characters a file system does not accept; the
+    # hash keeps names that differ only in those characters apart.
+    safe = re.sub(r"[^\w.-]", "_", table)
+    return f"{safe}.{zlib.crc32(table.encode('utf-8')):08x}"
+
+
+def _column_converter(column):
+    if column["data_type"] in BINARY_TYPES:
+        return bytes
+    if column["data_type"] in INTEGER_TYPES:
+        return int
+    return lambda value: value.decode("utf-8")
+
+
+class SnapshotExporter:
+    """
+    Writes tables from a source database to a snapshot directory.
+
+    Every primary-key range chunk becomes one compressed file of rows in
+    the LOAD DATA text format (see bulk_load.encode_rows); manifest.json
+    records each table's DDL, typed column list and, per file, its row
+    count and CRC32. Exporting into an existing snapshot adds or replaces
+    tables: a table's files are written to a staging directory and only
+    replace the previous export once every chunk is in (finish_table), so
+    a failed or cancelled re-export leaves the old one intact.
+
+    Exposes the same prepare_table / copy_chunk / finish_table interface as
+    TransferEngine, so TransferScheduler runs it with the same concurrency,
+    retries and progress reporting.
+    """
+
+    def __init__(self, source_pool, path, compression=DEFAULT_COMPRESSION,
+                 batch_size=DEFAULT_BATCH_SIZE, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if compression not in _EXTENSIONS:
+            raise SnapshotError(f"지원하지 않는 압축 형식입니다: {compression}")
+        if source_pool.driver.name != DB_MYSQL:
+            raise SnapshotError("스냅샷 내보내기는 MySQL/MariaDB 원본만 지원합니다.")
+        self.source_pool = source_pool
+        self.path = path
+        self.compression = compression
+        self.batch_size = batch_size
+        # Snapshot files are written in fixed-size batches.
+        self.adaptive = False
+        self.chunk_rows = chunk_rows
+        self.metrics = TransferMetrics()
+        self._lock = threading.Lock()
+        # Manifest entries of tables being exported, until finish_table.
+        self._exports = {}
+        os.makedirs(path, exist_ok=True)
+
+        if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+            self.manifest = read_manifest(path)
+            if self.manifest["compression"] != compression:
+                raise SnapshotError(
+                    f"기존 스냅샷은 {self.manifest['compression']} 압축입니다. "
+                    "다른 폴더를 선택하세요."
+                )
+        else:
+            self.manifest = {
+                "version": SNAPSHOT_VERSION,
+                "created_at": time.time(),
+                "source": endpoint_key(source_pool.conn_info),
+                "compression": compression,
+                "tables": {}
+            }
+
+    def prepare_table(self, table, ctx: TaskContext = None):
+        with self.source_pool.connection() as source:
+            create_sql = show_create_table(source, table)
+            columns = fetch_column_types(source, table)
+            pk, _ = find_primary_key(source, table)
+            estimated_rows = estimate_rows(source, table)
+            chunks = plan_chunks(source, table, estimated_rows, self.chunk_rows)
+
+        # Left over by an export that did not finish.
+        staging_dir = self._staging_dir(table)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        with self._lock:
+            self._exports[table] = {
+                "create_sql": create_sql,
+                "columns": columns,
+                "pk": pk,
+                "rows": 0,
+                "complete": False,
+                "files": [None] * len(chunks)
+            }
+        return chunks, estimated_rows
+
+    def resume_table(self, table, chunks):
+        raise SnapshotError("스냅샷 내보내기는 이어서 실행할 수 없습니다.")
+
+    def copy_chunk(self, chunk: Chunk, ctx: TaskContext = None) -> int:
+        """
+        Writes the chunk to its own file. A retry rewrites the file from the
+        start of the chunk.
+        """
+        ctx = ctx or TaskContext()
+        chunk.attempts += 1
+        chunk.rows = chunk.checksum = 0
+        chunk.last_pk = chunk.lo
+
+        # name is where the file ends up; it is written to the staging directory.
+        file_name = f"{chunk.index:05d}{_EXTENSIONS[self.compression]}"
+        name = f"{_table_dir(chunk.table)}/{file_name}"
+        file_path = os.path.join(self._staging_dir(chunk.table), file_name)
+        part_path = file_path + ".part"
+        select_sql, params = chunk.select_sql()
+        clock = time.perf_counter
+
+        with self.source_pool.connection() as source:
+            # As in TransferEngine, the stream cursor is only closed once drained.
+            read_cursor = self.source_pool.driver.open_stream(source, select_sql, params)
+            names = [col[0] for col in read_cursor.description]
+            pk_index = names.index(chunk.pk) if chunk.pk else None
+            with open_compressed(part_path, "wb", self.compression) as out:
+                while True:
+                    ctx.check_cancelled()
+                    started = clock()
+                    batch = read_cursor.fetchmany(self.batch_size)
+                    fetched = clock()
+                    if not batch:
+                        break
+                    encoded = encode_rows(batch)
+                    serialized = clock()
+                    out.write(encoded)
+                    written = clock()
+                    self.metrics.record_batch(chunk.table, len(batch), len(encoded), {
+                        "fetch": fetched - started,
+                        "serialize": serialized - fetched,
+                        "write": written - serialized
+                    })
+                    chunk.rows += len(batch)
+                    chunk.checksum = zlib.crc32(encoded, chunk.checksum)
+                    if pk_index is not None:
+                        chunk.last_pk = batch[-1][pk_index]
+                    ctx.progress({"table": chunk.table, "chunk": chunk.index, "rows": chunk.rows})
+            read_cursor.close()
+
+        os.replace(part_path, file_path)
+        with self._lock:
+            self._exports[chunk.table]["files"][chunk.index] = {
+                "file": name,
+                "rows": chunk.rows,
+                "checksum": chunk.checksum,
+                "bytes": os.path.getsize(file_path)
+            }
+        return chunk.rows
+
+    def finish_table(self, table, ctx: TaskContext = None):
+        with self._lock:
+            entry = self._exports[table]
+            if None in entry["files"]:
+                raise SnapshotError(f"{table}: 일부 구간을 내보내지 못해 스냅샷에 기록하지 않았습니다.")
+            entry["rows"] = sum(info["rows"] for info in entry["files"])
+            entry["complete"] = True
+            previous = self.manifest["tables"].get(table)
+            if previous is not None:
+                # While its files are swapped out the table is listed as
+                # incomplete, so an interrupted swap is never imported.
+                previous["complete"] = False
+                self._write_manifest()
+            table_dir = os.path.join(self.path, _table_dir(table))
+            shutil.rmtree(table_dir, ignore_errors=True)
+            os.replace(self._staging_dir(table), table_dir)
+            self.manifest["tables"][table] = self._exports.pop(table)
+            self._write_manifest()
+
+    def _staging_dir(self, table):
+        return os.path.join(self.path, _table_dir(table) + ".part")
+
+    def _write_manifest(self):
+        # Written to a temp file and renamed, so a crash never leaves a
+        # half-written manifest behind.
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        with open(manifest_path + ".part", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1, default=str)
+        os.replace(manifest_path + ".part", manifest_path)
+
+
+class SnapshotImporter(TransferEngine):
+    """
+    Loads tables from a snapshot directory into a target database through
+    the same writers as a live transfer: the stored rows go to LOAD DATA
+    LOCAL INFILE unchanged, or are decoded by column type for INSERT
+    batches.
+
+    Each snapshot file is one chunk. A failed file continues after its last
+    committed row, and its CRC32 is checked against the manifest once it has
+    been read completely. In update mode every stored row is upserted, by
+    INSERT batches whatever the load method.
+    """
+
+    def __init__(self, path, target_pool, mode, batch_size=None,
+                 load_method=LOAD_INSERT, disable_checks=False):
+        if target_pool.driver.name != DB_MYSQL:
+            raise SnapshotError("스냅샷 가져오기는 MySQL/MariaDB 대상만 지원합니다.")
+        super().__init__(None, target_pool, mode, batch_size=batch_size,
+                         load_method=load_method, disable_checks=disable_checks)
+        # Batches are read from the files with a fixed line count.
+        self.adaptive = False
+        self.path = path
+        self.manifest = read_manifest(path)
+        self.compression = self.manifest["compression"]
+
+    def tables(self) -> dict:
+        return snapshot_tables(self.manifest)
+
+    def _entry(self, table):
+        entry = self.manifest["tables"].get(table)
+        if not entry or not entry["complete"]:
+            raise SnapshotError(f"{table}: 스냅샷에 완전히 내보낸 테이블이 없습니다.")
+        return entry
+
+    def prepare_table(self, table, ctx: TaskContext = None):
+        entry = self._entry(table)
+        create_sql = None
+        if self.mode == MODE_CREATE:
+            create_sql, self._deferred[table] = split_create_table(entry["create_sql"])
+        with self._target_connection() as target:
+            self._prepare_target(target, table, create_sql)
+            self._disable_keys(target, table)
+        chunks = [Chunk(table, index, entry["pk"]) for index in range(len(entry["files"]))]
+        return chunks, entry["rows"]
+
+    def resume_table(self, table, chunks):
+        raise SnapshotError("스냅샷 가져오기는 이어서 실행할 수 없습니다. 다시 가져오세요.")
+
+    def copy_chunk(self, chunk: Chunk, ctx: TaskContext = None) -> int:
+        ctx = ctx or TaskContext()
+        chunk.attempts += 1
+        with self._target_connection() as target:
+            return self._load_file(target, chunk, ctx)
+
+    def _load_file(self, target, chunk, ctx):
+        entry = self._entry(chunk.table)
+        info = entry["files"][chunk.index]
+        names = [column["name"] for column in entry["columns"]]
+        upsert = self.mode == MODE_UPDATE
+        if self.load_method == LOAD_DATA_INFILE and not upsert:
+            writer = LoadDataWriter(target, chunk.table, names)
+            converters = None
+        else:
+            writer = InsertWriter(target, chunk.table, names, upsert=upsert)
+            converters = [_column_converter(column) for column in entry["columns"]]
+
+        rows_done = 0
+        clock = time.perf_counter
+        try:
+            with open_compressed(os.path.join(self.path, info["file"]), "rb", self.compression) as f:
+                # Rows committed by an earlier attempt are skipped, but still
+                # count toward the file checksum.
+                checksum = 0
+                for line in itertools.islice(f, chunk.rows):
+                    checksum = zlib.crc32(line, checksum)
+                while True:
+                    ctx.check_cancelled()
+                    started = clock()
+                    lines = list(itertools.islice(f, self.batch_size))
+                    fetched = clock()
+                    if not lines:
+                        break
+                    encoded = b"".join(lines)
+                    batch = decode_rows(lines, converters) if converters else None
+                    serialized = clock()
+                    self._write(writer, batch, encoded)
+                    written = clock()
+                    target.commit()
+                    committed = clock()
+                    self.metrics.record_batch(chunk.table, len(lines), len(encoded), {
+                        "fetch": fetched - started,
+                        "serialize": serialized - fetched,
+                        "write": written - serialized,
+                        "commit": committed - written
+                    })
+                    rows_done += len(lines)
+                    chunk.rows += len(lines)
+                    checksum = zlib.crc32(encoded, checksum)
+                    chunk.checksum = checksum
+                    ctx.progress({"table": chunk.table, "chunk": chunk.index, "rows": chunk.rows})
+        except _READ_ERRORS as e:
+            raise SnapshotError(f"{info['file']}: 파일을 읽을 수 없습니다: {e}") from e
+        finally:
+            writer.close()
+
+        if chunk.rows != info["rows"] or checksum != info["checksum"]:
+            raise SnapshotError(f"{info['file']}: 파일 내용이 스냅샷 기록과 다릅니다 (손상 의심).")
+        return rows_done
@@ -0,0 +1,28 @@
+# table_checksum.py
+
+from database import quote_identifier
+
+
+def row_hash_sql(columns) -> str:
+    """
+    SQL expression hashing a whole row. CONCAT_WS skips NULLs, so a NULL
+    flag per column is appended to tell NULL apart from an empty string.
+    """
+    quoted = [quote_identifier(name) for name in columns]
+    null_flags = ", ".join(f"ISNULL({name})" for name in quoted)
+    return f"CRC32(CONCAT_WS('#', {', '.join(quoted)}, {null_flags}))"
+
+
+def range_checksum(conn, table, columns, where_sql="", params=()):
+    """
+    Returns (row_count, checksum) of the rows matching where_sql, computed
+    on the server as BIT_XOR over per-row CRC32s, so only two numbers cross
+    the network however many rows the range holds.
+    """
+    sql = f"SELECT COUNT(*), COALESCE(BIT_XOR({row_hash_sql(columns)}), 0) FROM {quote_identifier(table)}"
+    if where_sql:
+        sql += f" WHERE {where_sql}"
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        count, checksum = cursor.fetchone()
+    return int(count), int(checksum)
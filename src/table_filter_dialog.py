@@ -0,0 +1,89 @@
+# table_filter_dialog.py
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QListWidget,
+    QListWidgetItem, QPushButton, QDialogButtonBox
+)
+from PySide6.QtCore import Qt
+
+
+class TableFilterDialog(QDialog):
+    """
+    Edits one table's filter: a WHERE condition in the source's SQL dialect
+    and the columns to copy. Primary key columns are always copied and
+    cannot be unchecked. get_filter() returns the result in the format of
+    chunking.normalize_filters, {} for no filter.
+    """
+
+    def __init__(self, table, columns, primary_key=(), spec=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"필터 - {table}")
+        self.resize(420, 480)
+        self._columns = list(columns or [])
+        self._keys = set(primary_key or ())
+        spec = spec or {}
+        selected = set(spec.get("columns") or self._columns)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("WHERE 조건 (원본 DB 문법, 비우면 모든 행):"))
+        self.where_edit = QLineEdit(spec.get("where", ""))
+        self.where_edit.setPlaceholderText("예: created_at >= '2024-01-01'")
+        layout.addWidget(self.where_edit)
+
+        layout.addWidget(QLabel("복사할 열:"))
+        self.column_list = QListWidget()
+        for name in self._columns:
+            item = QListWidgetItem(name)
+            if name in self._keys:
+                item.setText(f"{name} (기본 키)")
+                item.setFlags(item.flags() & ~Qt.ItemIsUserCheckable & ~Qt.ItemIsEnabled)
+                item.setCheckState(Qt.Checked)
+            else:
+                item.setCheckState(Qt.Checked if name in selected else Qt.Unchecked)
+            self.column_list.addItem(item)
+        layout.addWidget(self.column_list)
+        if not self._columns:
+            self.column_list.hide()
+            layout.addWidget(QLabel("열 목록을 아직 불러오지 못했습니다. 모든 열을 복사합니다."))
+
+        toggle_layout = QHBoxLayout()
+        all_btn = QPushButton("모든 열")
+        all_btn.clicked.connect(lambda: self._set_all(True))
+        none_btn = QPushButton("키만")
+        none_btn.clicked.connect(lambda: self._set_all(False))
+        toggle_layout.addWidget(all_btn)
+        toggle_layout.addWidget(none_btn)
+        toggle_layout.addStretch()
+        layout.addLayout(toggle_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Reset)
+        buttons.button(QDialogButtonBox.Reset).setText("필터 해제")
+        buttons.button(QDialogButtonBox.Reset).clicked.connect(self._clear)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def _set_all(self, checked):
+        for row in range(self.column_list.count()):
+            item = self.column_list.item(row)
+            if item.flags() & Qt.ItemIsUserCheckable:
+                item.setCheckState(Qt.Checked if checked else Qt.Unchecked)
+
+    def _clear(self):
+        self.where_edit.clear()
+        self._set_all(True)
+        self.accept()
+
+    def get_filter(self) -> dict:
+        spec = {}
+        where = self.where_edit.text().strip()
+        if where:
+            spec["where"] = where
+        checked = [
+            name for row, name in enumerate(self._columns)
+            if self.column_list.item(row).checkState() == Qt.Checked
+        ]
+        if self._columns and len(checked) < len(self._columns):
+            spec["columns"] = checked
+        return spec
@@ -0,0 +1,292 @@
+# table_list_model.py
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+def format_size(size: int) -> str:
+    """Formats a byte count as a short human readable string."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+COLUMN_CHECK = 0
+COLUMN_NAME = 1
+COLUMN_ROWS = 2
+COLUMN_SIZE = 3
+COLUMN_ENGINE = 4
+COLUMN_FILTER = 5
+HEADERS = ["선택", "테이블 이름", "행 개수", "크기", "엔진", "필터"]
+
+
+def describe_filter(spec) -> str:
+    """Short label of a table filter (see chunking.normalize_filters)."""
+    parts = []
+    if spec.get("where"):
+        parts.append("조건")
+    if spec.get("columns"):
+        parts.append(f"{len(spec['columns'])}열")
+    return " · ".join(parts)
+
+
+def _is_checked(value) -> bool:
+    # Views pass the check state either as a Qt.CheckState or as its int value.
+    return value == Qt.Checked or value == Qt.Checked.value
+
+
+class TableListModel(QAbstractTableModel):
+    """
+    Table list with one checkable row per table.
+
+    Metadata dicts come from database.fetch_table_metadata. Check state and
+    the "counted exactly" flag are kept in bytearrays, one byte per table,
+    and nothing is created per cell; the view asks for the rows it paints.
+
+    Sorting is done here with one Python sort over the metadata rather than
+    by a QSortFilterProxyModel, which would call data() for every comparison.
+
+    Row filters are kept by table name. The row count of a table with a
+    WHERE condition is that of its matching rows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tables = []
+        self._index = {}
+        self._checked = bytearray()
+        self._exact = bytearray()
+        self._filters = {}        # name -> {'where', 'columns'}
+        self._filtered_rows = {}  # name -> (rows, exact) for tables with a where
+        self._sort_column = None
+        self._sort_order = Qt.AscendingOrder
+
+    def set_tables(self, tables):
+        self.beginResetModel()
+        self._tables = list(tables)
+        self._checked = bytearray(len(self._tables))
+        self._exact = bytearray(len(self._tables))
+        self._filters = {}
+        self._filtered_rows = {}
+        if self._sort_column is not None:
+            self._apply_sort()
+        self._index = {table["name"]: row for row, table in enumerate(self._tables)}
+        self.endResetModel()
+
+    def update_tables(self, tables):
+        """
+        Replaces the metadata with a fresher copy of the same schema. Check
+        marks and exact counts are kept for tables that are still there;
+        when the table set is unchanged the rows are updated in place so
+        the view keeps its scroll position and selection.
+        """
+        exact = {
+            table["name"]: table["rows"]
+            for table, counted in zip(self._tables, self._exact) if counted
+        }
+        filters, filtered_rows = self._filters, self._filtered_rows
+        tables = [dict(table, rows=exact[table["name"]]) if table["name"] in exact else table
+                  for table in tables]
+
+        if len(tables) == len(self._tables) and all(t["name"] in self._index for t in tables):
+            for table in tables:
+                self._tables[self._index[table["name"]]] = table
+            if self._tables:
+                self.dataChanged.emit(
+                    self.index(0, COLUMN_ROWS), self.index(len(self._tables) - 1, COLUMN_ENGINE),
+                    [Qt.DisplayRole]
+                )
+            if self._sort_column in (COLUMN_ROWS, COLUMN_SIZE, COLUMN_ENGINE):
+                self.sort(self._sort_column, self._sort_order)
+            return
+
+        checked = set(self.checked_tables())
+        self.set_tables(tables)
+        self._filters = {name: spec for name, spec in filters.items() if name in self._index}
+        self._filtered_rows = {name: rows for name, rows in filtered_rows.items() if name in self._index}
+        for name in checked:
+            row = self._index.get(name)
+            if row is not None:
+                self._checked[row] = 1
+        for name in exact:
+            row = self._index.get(name)
+            if row is not None:
+                self._exact[row] = 1
+        if self._tables and (checked or exact or self._filters):
+            self.dataChanged.emit(
+                self.index(0, COLUMN_CHECK), self.index(len(self._tables) - 1, COLUMN_FILTER)
+            )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tables)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == COLUMN_CHECK:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        table = self._tables[row]
+
+        if role == Qt.CheckStateRole and column == COLUMN_CHECK:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == Qt.DisplayRole:
+            if column == COLUMN_NAME:
+                return table["name"]
+            if column == COLUMN_ROWS:
+                if self._filters.get(table["name"], {}).get("where"):
+                    rows, exact = self._filtered_rows.get(table["name"], (None, False))
+                    if rows is None:
+                        return "…"
+                    return f"{rows:,}" if exact else f"~{rows:,}"
+                return f"{table['rows']:,}" if self._exact[row] else f"~{table['rows']:,}"
+            if column == COLUMN_SIZE:
+                return format_size(table["data_size"] + table["index_size"])
+            if column == COLUMN_ENGINE:
+                return table["engine"]
+            if column == COLUMN_FILTER:
+                return describe_filter(self._filters.get(table["name"], {}))
+        elif role == Qt.ToolTipRole and column == COLUMN_FILTER:
+            spec = self._filters.get(table["name"])
+            if spec:
+                lines = []
+                if spec.get("where"):
+                    lines.append(f"WHERE {spec['where']}")
+                if spec.get("columns"):
+                    lines.append(f"열: {', '.join(spec['columns'])}")
+                return "\n".join(lines)
+        elif role == Qt.TextAlignmentRole and column in (COLUMN_ROWS, COLUMN_SIZE):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self._apply_sort()
+        self._index = {table["name"]: row for row, table in enumerate(self._tables)}
+        new_rows = {old: new for new, old in enumerate(old_rows)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            self.index(new_rows[index.row()], index.column()) for index in persistent
+        ])
+        self.layoutChanged.emit()
+
+    def _apply_sort(self) -> list:
+        """Reorders the rows; returns the old row number of each new row."""
+        key = self._sort_key(self._sort_column)
+        order = sorted(range(len(self._tables)), key=key,
+                       reverse=self._sort_order == Qt.DescendingOrder)
+        self._tables = [self._tables[row] for row in order]
+        self._checked = bytearray(self._checked[row] for row in order)
+        self._exact = bytearray(self._exact[row] for row in order)
+        return order
+
+    def _sort_key(self, column):
+        tables = self._tables
+        if column == COLUMN_CHECK:
+            checked = self._checked
+            return lambda row: checked[row]
+        if column == COLUMN_ROWS:
+            filtered = self._filtered_rows
+            return lambda row: filtered.get(tables[row]["name"], (tables[row]["rows"],))[0]
+        if column == COLUMN_SIZE:
+            return lambda row: tables[row]["data_size"] + tables[row]["index_size"]
+        if column == COLUMN_ENGINE:
+            return lambda row: tables[row]["engine"] or ""
+        return lambda row: tables[row]["name"].lower()
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != COLUMN_CHECK:
+            return False
+        self._checked[index.row()] = _is_checked(value)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def set_checked_rows(self, rows, checked):
+        """Checks or unchecks the given source rows with one change signal."""
+        rows = list(rows)
+        if not rows:
+            return
+        value = 1 if checked else 0
+        for row in rows:
+            self._checked[row] = value
+        self.dataChanged.emit(
+            self.index(min(rows), COLUMN_CHECK), self.index(max(rows), COLUMN_CHECK),
+            [Qt.CheckStateRole]
+        )
+
+    def set_all_checked(self, checked):
+        if not self._tables:
+            return
+        self._checked = bytearray([1 if checked else 0]) * len(self._tables)
+        self.dataChanged.emit(
+            self.index(0, COLUMN_CHECK), self.index(len(self._tables) - 1, COLUMN_CHECK),
+            [Qt.CheckStateRole]
+        )
+
+    def checked_tables(self) -> list:
+        """Returns the names of all checked tables, in list order."""
+        return [self._tables[row]["name"] for row, checked in enumerate(self._checked) if checked]
+
+    def table_info(self, name):
+        row = self._index.get(name)
+        return self._tables[row] if row is not None else None
+
+    def set_exact_rows(self, name, rows):
+        row = self._index.get(name)
+        if row is None:
+            return
+        if self._filters.get(name, {}).get("where"):
+            self.set_filtered_rows(name, rows, exact=True)
+            return
+        # Copied so the change stays out of metadata shared with the cache.
+        self._tables[row] = dict(self._tables[row], rows=rows)
+        self._exact[row] = 1
+        index = self.index(row, COLUMN_ROWS)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def set_filter(self, name, spec):
+        """Sets or, with an empty spec, clears the table's filter."""
+        row = self._index.get(name)
+        if row is None:
+            return
+        if spec:
+            self._filters[name] = spec
+        else:
+            self._filters.pop(name, None)
+        self._filtered_rows.pop(name, None)
+        self.dataChanged.emit(self.index(row, COLUMN_ROWS), self.index(row, COLUMN_FILTER))
+
+    def set_filtered_rows(self, name, rows, exact=False):
+        row = self._index.get(name)
+        if row is None or not self._filters.get(name, {}).get("where"):
+            return
+        self._filtered_rows[name] = (rows, exact)
+        index = self.index(row, COLUMN_ROWS)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def filter_for(self, name) -> dict:
+        return self._filters.get(name, {})
+
+    def effective_rows(self, name) -> int:
+        """Rows the table will transfer: the filtered estimate if it has one."""
+        if name in self._filtered_rows:
+            return self._filtered_rows[name][0]
+        row = self._index.get(name)
+        return self._tables[row]["rows"] if row is not None else 0
@@ -1,36 +1,78 @@
 # # table_selector.py
 
 from PySide6.QtWidgets import (
-    QGroupBox, QVBoxLayout, QTableWidget, QTableWidgetItem,
-    QHeaderView, QCheckBox, QHBoxLayout, QPushButton
+    QGroupBox, QVBoxLayout, QTableView, QHeaderView, QHBoxLayout,
+    QPushButton, QLineEdit, QLabel, QAbstractItemView
 )
 
-from PySide6.QtCore import Qt
-import pymysql
+from PySide6.QtCore import Qt, QSortFilterProxyModel
+
+from database import fetch_schema, count_rows, estimate_filtered_rows
+from metadata_cache import metadata_key
+from metrics import format_duration
+from table_list_model import (
+    TableListModel, COLUMN_CHECK, COLUMN_NAME, COLUMN_ROWS,
+    COLUMN_SIZE, COLUMN_ENGINE, COLUMN_FILTER
+)
+from table_filter_dialog import TableFilterDialog
+from workers import run_in_background
 
 
 class TableSelector(QGroupBox):
     """Table selection panel."""
 
-    def __init__(self, title="테이블 선택", parent=None):
+    def __init__(self, title="테이블 선택", parent=None, cache=None):
         super().__init__(title, parent)
+        # MetadataCache shared across connections; None disables caching.
+        self.cache = cache
+        self._load_worker = None
+        self._count_worker = None
+        self._pool = None
+        self._schema = None
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout()
-        self.table_widget = QTableWidget()
-        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table_widget.setColumnCount(3)
-        self.table_widget.setHorizontalHeaderLabels(["선택", "테이블 이름", "행 개수"])
-
-        header = self.table_widget.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Fixed)
-        header.setSectionResizeMode(1, QHeaderView.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.Fixed)
-        self.table_widget.setColumnWidth(0, 60)
-        self.table_widget.setColumnWidth(2, 100)
-        layout.addWidget(self.table_widget)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("테이블 이름 필터...")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
+        self.model = TableListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(COLUMN_NAME)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.doubleClicked.connect(self._on_double_clicked)
+
+        # Header clicks sort the source model; the proxy only filters.
+        header = self.table_view.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.sortIndicatorChanged.connect(self.model.sort)
+        header.setSortIndicator(COLUMN_NAME, Qt.AscendingOrder)
+        header.setSectionResizeMode(COLUMN_CHECK, QHeaderView.Fixed)
+        header.setSectionResizeMode(COLUMN_NAME, QHeaderView.Stretch)
+        for column in (COLUMN_ROWS, COLUMN_SIZE, COLUMN_ENGINE, COLUMN_FILTER):
+            header.setSectionResizeMode(column, QHeaderView.Fixed)
+        self.table_view.setColumnWidth(COLUMN_CHECK, 60)
+        self.table_view.setColumnWidth(COLUMN_ROWS, 100)
+        self.table_view.setColumnWidth(COLUMN_SIZE, 80)
+        self.table_view.setColumnWidth(COLUMN_ENGINE, 70)
+        self.table_view.setColumnWidth(COLUMN_FILTER, 80)
+        layout.addWidget(self.table_view)
+
+        self.status_label = QLabel()
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
 
         btn_layout = QHBoxLayout()
         self.select_all_btn = QPushButton("전체 선택")
@@ -39,76 +81,211 @@ class TableSelector(QGroupBox):
         self.deselect_all_btn = QPushButton("선택 해제")
         self.deselect_all_btn.clicked.connect(self.deselect_all)
 
+        # Row counts start as engine estimates ("~"); exact counts are only
+        # computed for the checked tables when asked for.
+        self.count_btn = QPushButton("정확한 행 수")
+        self.count_btn.clicked.connect(self.count_selected_rows)
+
         btn_layout.addWidget(self.select_all_btn)
         btn_layout.addWidget(self.deselect_all_btn)
+        btn_layout.addWidget(self.count_btn)
+
+        # Per-table WHERE condition and column choice, pushed down into
+        # the source query; also opened by double-clicking a table.
+        self.filter_btn = QPushButton("필터...")
+        self.filter_btn.clicked.connect(self.edit_current_filter)
+        btn_layout.addWidget(self.filter_btn)
+
+        self.refresh_btn = QPushButton("새로 고침")
+        self.refresh_btn.clicked.connect(self.refresh)
+        btn_layout.addWidget(self.refresh_btn)
+
+        # Wired up by the main window: writes the checked tables to a
+        # compressed snapshot folder instead of a live target.
+        self.export_btn = QPushButton("파일로 내보내기")
+        btn_layout.addWidget(self.export_btn)
 
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
         self.setLayout(layout)
 
-    def load_tables(self, conn_info: dict):
+    def load_tables(self, pool):
         """
-        Load real tables using connection info:
-        conn_info = {
-            'host': str,
-            'port': int,
-            'user': str,
-            'password': str,
-            'database': str
-        }
+        Shows the source's tables. A cached list is shown at once; when it
+        is older than the cache TTL it is refreshed in the background while
+        it stays usable. Without a cached list the panel is disabled until
+        the table names arrive.
         """
-        try:
-            connection = pymysql.connect(
-                host=conn_info["host"],
-                port=conn_info["port"],
-                user=conn_info["user"],
-                password=conn_info["password"],
-                database=conn_info["database"]
-            )
-            cursor = connection.cursor()
-
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-
-            self.table_widget.setRowCount(len(tables))
-            for i, (table_name,) in enumerate(tables):
-                # Get row count for each table
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-                    row_count = cursor.fetchone()[0]
-                except Exception:
-                    row_count = "?"
-
-                checkbox = QCheckBox()
-                self.table_widget.setCellWidget(i, 0, checkbox)
-                table_item = QTableWidgetItem(table_name)
-                table_item.setFlags(table_item.flags() & ~Qt.ItemIsEditable)
-
-                count_item = QTableWidgetItem(str(row_count))
-                count_item.setFlags(count_item.flags() & ~Qt.ItemIsEditable)
-
-                self.table_widget.setItem(i, 1, table_item)
-                self.table_widget.setItem(i, 2, count_item)
-
-
-            cursor.close()
-            connection.close()
-
-        except Exception as e:
-            self.table_widget.setRowCount(0)
-            self.table_widget.setItem(0, 1, QTableWidgetItem("불러오기 실패"))
-            print("Failed to load tables:", e)
+        for running in (self._load_worker, self._count_worker):
+            if running:
+                running.cancel()
+        self._load_worker = None
+        self._count_worker = None
+        self.refresh_btn.setEnabled(True)
+
+        self._pool = pool
+        self._schema = None
+        self.status_label.hide()
+        cached = self.cache.get(metadata_key(pool.conn_info)) if self.cache else None
+        if cached is None:
+            self.model.set_tables([])
+            self.setEnabled(False)
+            self._start_load(pool, background=False)
+            return
+
+        self._schema, age = cached
+        self.model.set_tables(self._schema["tables"])
+        self.setEnabled(True)
+        if not self.cache.is_fresh(age):
+            self._show_status(f"{format_duration(age)} 전 목록 · 새로 고치는 중...")
+            self._start_load(pool, background=True)
+
+    def refresh(self):
+        """Re-reads the table list in the background, keeping the current one meanwhile."""
+        if not self._pool or self._load_worker:
+            return
+        self._show_status("새로 고치는 중...")
+        self._start_load(self._pool, background=True)
+
+    def _start_load(self, pool, background):
+        # Results of a load that was replaced by a newer one are dropped.
+        # A foreground load fills the list as soon as the table names are
+        # read; the columns follow with the result.
+        worker = run_in_background(
+            fetch_schema, pool,
+            on_progress=lambda info: (self._load_worker is worker and not background
+                                      and self._populate(info["tables"])),
+            on_result=lambda schema: self._load_worker is worker and self._on_schema_loaded(pool, schema),
+            on_error=lambda error: self._load_worker is worker and self._on_load_error(error, background),
+            # Connected before the worker starts, so a fast one cannot finish unseen.
+            on_finished=lambda: self._on_load_finished(worker)
+        )
+        self._load_worker = worker
+        self.refresh_btn.setEnabled(False)
+
+    def _on_load_finished(self, worker):
+        if self._load_worker is worker:
+            self._load_worker = None
+            self.setEnabled(True)
+            self.refresh_btn.setEnabled(True)
+
+    def _populate(self, tables):
+        self.model.set_tables(tables)
+        self.setEnabled(True)
+
+    def _on_schema_loaded(self, pool, schema):
+        self._schema = schema
+        self.model.update_tables(schema["tables"])
+        self.status_label.hide()
+        if self.cache:
+            try:
+                self.cache.put(metadata_key(pool.conn_info), schema)
+            except Exception as e:
+                print("Failed to cache table metadata:", e)
+
+    def _show_status(self, text):
+        self.status_label.setText(text)
+        self.status_label.show()
+
+    def count_selected_rows(self):
+        """Replaces the estimates of the checked tables with exact counts."""
+        tables = self.get_selected_tables()
+        if not tables or not self._pool or self._count_worker:
+            return
+
+        self.count_btn.setEnabled(False)
+        wheres = {table: self.model.filter_for(table)["where"]
+                  for table in tables if self.model.filter_for(table).get("where")}
+        worker = run_in_background(
+            count_rows, self._pool, tables, wheres=wheres,
+            on_progress=lambda info: self._count_worker is worker and self._set_exact_count(info),
+            on_error=lambda error: print("Failed to count rows:", error),
+            on_finished=lambda: self._on_count_finished(worker)
+        )
+        self._count_worker = worker
+
+    def _set_exact_count(self, info):
+        self.model.set_exact_rows(info["table"], info["rows"])
+
+    def _on_count_finished(self, worker):
+        if self._count_worker is worker:
+            self._count_worker = None
+        self.count_btn.setEnabled(True)
+
+    def _on_load_error(self, error, background=False):
+        self._show_status("새로 고침 실패 · 캐시된 목록을 표시합니다" if background else "불러오기 실패")
+        print("Failed to load tables:", error)
+
+    def get_columns(self, table: str):
+        """Column names of the table from the loaded schema, or None if not loaded yet."""
+        return self._schema["columns"].get(table) if self._schema else None
+
+    def get_primary_key(self, table: str):
+        """Primary key column names of the table from the loaded schema, or None."""
+        return self._schema["primary_keys"].get(table) if self._schema else None
+
+    def get_selected_tables(self) -> list:
+        """Returns the names of all checked tables, in list order."""
+        return self.model.checked_tables()
+
+    def get_row_estimate(self, table: str) -> int:
+        """Row count shown for the table: exact if counted, else the estimate,
+        of the matching rows for a filtered table."""
+        return self.model.effective_rows(table)
+
+    def get_filters(self, tables) -> dict:
+        """{table: filter} for the given tables that have one."""
+        return {table: self.model.filter_for(table) for table in tables if self.model.filter_for(table)}
+
+    def _on_double_clicked(self, index):
+        if index.column() != COLUMN_CHECK:
+            self.edit_filter(self.model.index(self.proxy.mapToSource(index).row(), COLUMN_NAME).data())
+
+    def edit_current_filter(self):
+        index = self.table_view.currentIndex()
+        if index.isValid():
+            self._on_double_clicked(index.siblingAtColumn(COLUMN_NAME))
+
+    def edit_filter(self, table):
+        dialog = TableFilterDialog(
+            table, self.get_columns(table), self.get_primary_key(table),
+            self.model.filter_for(table), self
+        )
+        if not dialog.exec():
+            return
+        spec = dialog.get_filter()
+        self.model.set_filter(table, spec)
+        if spec.get("where") and self._pool:
+            self._estimate_filter(table, spec["where"])
+
+    def _estimate_filter(self, table, where):
+        # A result for a condition that has since been edited is dropped.
+        def on_progress(info):
+            if self.model.filter_for(table).get("where") == where:
+                self.model.set_filtered_rows(table, info["rows"])
+
+        def on_error(error):
+            if self.model.filter_for(table).get("where") == where:
+                self._show_status(f"필터 조건 오류 ({table}): {error}")
+
+        run_in_background(estimate_filtered_rows, self._pool, {table: where},
+                          on_progress=on_progress, on_error=on_error)
 
     def select_all(self):
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if isinstance(checkbox, QCheckBox):
-                checkbox.setChecked(True)
+        """Checks every table that passes the filter."""
+        self._set_visible_checked(True)
 
     def deselect_all(self):
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if isinstance(checkbox, QCheckBox):
-                checkbox.setChecked(False)
+        """Unchecks every table that passes the filter."""
+        self._set_visible_checked(False)
 
+    def _set_visible_checked(self, checked):
+        if not self.proxy.filterRegularExpression().pattern():
+            self.model.set_all_checked(checked)
+            return
+        rows = [
+            self.proxy.mapToSource(self.proxy.index(row, 0)).row()
+            for row in range(self.proxy.rowCount())
+        ]
+        self.model.set_checked_rows(rows, checked)
@@ -0,0 +1,45 @@
+# task_context.py
+
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task when the user cancelled it."""
+
+
+class TaskContext:
+    """
+    Progress, log and cancellation hooks handed to a long-running task.
+
+    Tasks only talk to this object, never to widgets, so the same code runs
+    on a Qt worker thread or without a GUI at all.
+    """
+
+    def __init__(self, on_progress=None, on_log=None, cancel_event=None):
+        self._on_progress = on_progress
+        self._on_log = on_log
+        self._cancel_event = cancel_event or threading.Event()
+
+    def with_progress(self, on_progress):
+        """Returns a context that shares logging and cancellation with this
+        one but sends progress to on_progress instead."""
+        return TaskContext(on_progress, self._on_log, self._cancel_event)
+
+    def progress(self, payload):
+        if self._on_progress:
+            self._on_progress(payload)
+
+    def log(self, message):
+        if self._on_log:
+            self._on_log(message)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises TaskCancelled if cancel() has been called."""
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
@@ -0,0 +1,7 @@
+# conftest.py
+
+import os
+import sys
+
+# The modules live flat in src/ and import each other by name.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,99 @@
+# test_bulk_load.py
+
+import datetime
+import decimal
+import io
+import ipaddress
+import uuid
+
+import pytest
+
+from bulk_load import NULL, decode_field, decode_rows, encode_field, encode_rows, estimate_size
+
+TEXT = lambda value: value.decode("utf-8")
+
+
+def round_trip(rows, converters):
+    # Snapshot files are read back line by line, like this.
+    return decode_rows(list(io.BytesIO(encode_rows(rows))), converters)
+
+
+@pytest.mark.parametrize("value", [
+    "", "plain", "tab\there", "new\nline", "carriage\rreturn", "nul\x00byte",
+    "back\\slash", "trailing\\", "\\N", "\\t literally", "한글 \t 탭", "%s ' \" ,",
+])
+def test_text_round_trip(value):
+    assert round_trip([(value,)], [TEXT]) == [(value,)]
+
+
+@pytest.mark.parametrize("value", [
+    b"", b"\x00\x01\x02", b"\t\n\r\\", b"\\N", bytes(range(256)),
+])
+def test_bytes_round_trip(value):
+    assert round_trip([(value,)], [bytes]) == [(value,)]
+
+
+def test_null_is_distinct_from_empty_and_literal_backslash_n():
+    assert encode_field(None) == NULL
+    assert decode_field(encode_field(None)) is None
+    assert decode_field(encode_field("")) == b""
+    assert decode_field(encode_field("\\N")) == b"\\N"
+
+
+def test_row_with_mixed_types():
+    rows = [
+        (1, None, "a\tb\nc", b"\x00\\", -5),
+        (2, "", None, None, 0),
+    ]
+    converters = [int, TEXT, TEXT, bytes, int]
+    assert round_trip(rows, converters) == rows
+
+
+@pytest.mark.parametrize("value, text", [
+    (datetime.timedelta(hours=1, minutes=2, seconds=3), "01:02:03"),
+    (datetime.timedelta(hours=-838, minutes=-59, seconds=-59), "-838:59:59"),
+    (datetime.timedelta(seconds=1, microseconds=500), "00:00:01.000500"),
+])
+def test_timedelta_is_written_as_mysql_time(value, text):
+    assert round_trip([(value,)], [TEXT]) == [(text,)]
+
+
+def test_sets_are_written_sorted_and_comma_separated():
+    assert encode_field({"b", "a", "c"}) == b"a,b,c"
+    assert round_trip([(frozenset({"y", "x"}),)], [TEXT]) == [("x,y",)]
+    assert round_trip([(set(),)], [TEXT]) == [("",)]
+
+
+def test_estimate_size_is_exact_for_uniform_rows():
+    rows = [(i % 10, "x" * 50, None) for i in range(1000)]
+    assert estimate_size(rows) == len(encode_rows(rows))
+    assert estimate_size(rows[:5]) == len(encode_rows(rows[:5]))
+    assert estimate_size([]) == 0
+
+
+def test_postgresql_values_are_written_for_mysql():
+    pymysql_converters = pytest.importorskip("pymysql.converters")
+    from drivers import MySQLDriver
+
+    tz = datetime.timezone(datetime.timedelta(hours=9))
+    uid = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    row = (
+        True, False, {"a": 1, "b": [1, 2]}, [1, 2], [datetime.date(2024, 1, 2)],
+        datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=tz), uid,
+        ipaddress.ip_address("10.0.0.1"), decimal.Decimal("1.50"), memoryview(b"\x00\x01"),
+    )
+    adapted = MySQLDriver().adapt_row(row)
+    assert adapted == (
+        1, 0, '{"a": 1, "b": [1, 2]}', "[1, 2]", '["2024-01-02"]',
+        datetime.datetime(2024, 1, 2, 3, 4, 5), str(uid),
+        "10.0.0.1", decimal.Decimal("1.50"), b"\x00\x01",
+    )
+    # Every value can be bound by pymysql as a single SQL literal.
+    literals = [pymysql_converters.escape_item(value, "utf8mb4") for value in adapted]
+    assert literals[:4] == ["1", "0", "'{\\\"a\\\": 1, \\\"b\\\": [1, 2]}'", "'[1, 2]'"]
+
+    assert encode_rows([row[:5]]) == (
+        b'1\t0\t{"a": 1, "b": [1, 2]}\t[1, 2]\t["2024-01-02"]\n'
+    )
+    assert encode_field(row[5]) == b"2024-01-02 03:04:05"
+    assert encode_field(row[7]) == b"10.0.0.1"
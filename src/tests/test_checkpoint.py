@@ -0,0 +1,49 @@
+# test_checkpoint.py
+
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from checkpoint import CheckpointJournal, _dump, _load
+from chunking import Chunk
+
+
+@pytest.mark.parametrize("value", [
+    None, 42, "abc", 1.5,
+    b"\x00\xffb'x'",
+    datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+    datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+    datetime.date(2024, 1, 2),
+    datetime.time(23, 59, 58, 1),
+    datetime.timedelta(days=-1, seconds=5, microseconds=7),
+    decimal.Decimal("12345678901234567890.0001"),
+    uuid.UUID("12345678-1234-5678-1234-567812345678"),
+])
+def test_key_values_round_trip(value):
+    loaded = _load(_dump(value))
+    assert loaded == value
+    assert type(loaded) is type(value)
+
+
+def test_condition_params_round_trip():
+    condition = ("`k` > %s", [b"\x01\x02", datetime.date(2024, 5, 6)])
+    assert _load(_dump(condition)) == ["`k` > %s", [b"\x01\x02", datetime.date(2024, 5, 6)]]
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        _dump(object())
+
+
+def test_journal_restores_binary_last_pk(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "journal.sqlite3"))
+    run = journal.start_run("src", "dst", {"t": 10}, {"mode": "append"})
+    chunk = Chunk("t", 0, "id", b"\x00", b"\xff")
+    run.save_chunks("t", [chunk])
+    chunk.last_pk, chunk.rows = b"\x7f'\n", 3
+    run.save_chunk(chunk)
+
+    (loaded,) = journal.find_unfinished().load_chunks("t")
+    assert (loaded.lo, loaded.hi, loaded.last_pk, loaded.rows) == (b"\x00", b"\xff", b"\x7f'\n", 3)
@@ -0,0 +1,103 @@
+# test_chunking.py
+
+import pytest
+
+from chunking import Chunk, plan_chunks
+from drivers import DRIVERS
+
+SQLITE = DRIVERS["sqlite"]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = SQLITE.connect({"database": str(tmp_path / "chunks.db")})
+    with conn.cursor() as cursor:
+        cursor.execute("CREATE TABLE nums (id INTEGER PRIMARY KEY, v TEXT)")
+        cursor.executemany("INSERT INTO nums VALUES (?, ?)", [(i, f"v{i}") for i in range(1, 1001)])
+        cursor.execute("CREATE TABLE words (code TEXT PRIMARY KEY, v TEXT)")
+        cursor.executemany("INSERT INTO words VALUES (?, ?)", [(f"w{i:04d}", "x") for i in range(1000)])
+        cursor.execute("CREATE TABLE empty (id INTEGER PRIMARY KEY)")
+        cursor.execute("CREATE TABLE keyless (a INTEGER, b TEXT)")
+        cursor.executemany("INSERT INTO keyless VALUES (?, ?)", [(i, "50%") for i in range(10)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def read(conn, chunk):
+    sql, params = chunk.select_sql(driver=SQLITE)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def read_all(conn, chunks):
+    return [row for chunk in chunks for row in read(conn, chunk)]
+
+
+def test_integer_key_is_split_into_contiguous_ranges(conn):
+    chunks = plan_chunks(conn, "nums", 1000, chunk_rows=100)
+    assert len(chunks) == 10
+    assert [c.index for c in chunks] == list(range(10))
+    assert chunks[0].lo is None and chunks[-1].hi is None
+    assert all(a.hi == b.lo for a, b in zip(chunks, chunks[1:]))
+    assert [row[0] for row in read_all(conn, chunks)] == list(range(1, 1001))
+
+
+def test_text_key_is_split_by_walking_the_index(conn):
+    chunks = plan_chunks(conn, "words", 1000, chunk_rows=100)
+    assert len(chunks) == 10
+    assert [c.hi for c in chunks[:3]] == ["w0099", "w0199", "w0299"]
+    assert all(len(read(conn, chunk)) == 100 for chunk in chunks)
+    assert [row[0] for row in read_all(conn, chunks)] == [f"w{i:04d}" for i in range(1000)]
+
+
+def test_first_and_last_ranges_are_open(conn):
+    chunks = plan_chunks(conn, "nums", 1000, chunk_rows=100)
+    with conn.cursor() as cursor:
+        cursor.executemany("INSERT INTO nums VALUES (?, ?)", [(-5, "low"), (5000, "high")])
+    assert read(conn, chunks[0])[0] == (-5, "low")
+    assert read(conn, chunks[-1])[-1] == (5000, "high")
+    assert len(read_all(conn, chunks)) == 1002
+
+
+def test_small_empty_and_keyless_tables_are_one_chunk(conn):
+    assert len(plan_chunks(conn, "nums", 150, chunk_rows=100)) == 1
+    # A stale estimate does not split a table that has no rows.
+    empty = plan_chunks(conn, "empty", 1000, chunk_rows=100)
+    assert len(empty) == 1 and (empty[0].lo, empty[0].hi) == (None, None)
+    assert read(conn, empty[0]) == []
+    keyless = plan_chunks(conn, "keyless", 1000, chunk_rows=1)
+    assert len(keyless) == 1 and keyless[0].pk is None and not keyless[0].resumable
+    assert len(read(conn, keyless[0])) == 10
+
+
+def test_resume_continues_after_last_pk(conn):
+    chunk = plan_chunks(conn, "nums", 1000, chunk_rows=100)[2]
+    chunk.last_pk = chunk.lo + 40
+    rows = read(conn, chunk)
+    assert [row[0] for row in rows] == list(range(chunk.lo + 41, chunk.hi + 1))
+    _, params = chunk.range_condition(from_start=True, driver=SQLITE)
+    assert params == (chunk.lo, chunk.hi)
+
+
+def test_percent_in_user_where_is_doubled_for_format_drivers(conn):
+    chunk = Chunk("keyless", 0)
+    chunk.where = "b LIKE '50%'"
+    sql, params = chunk.select_sql(driver=DRIVERS["mysql"])
+    assert sql.endswith("WHERE (b LIKE '50%%')") and params == ()
+    sql, params = chunk.select_sql(driver=SQLITE)
+    assert sql.endswith("WHERE (b LIKE '50%')")
+    assert len(read(conn, chunk)) == 10
+
+
+def test_where_and_columns_combine_with_the_range(conn):
+    chunk = Chunk("nums", 0, "id", 10, 20)
+    chunk.where = "id % 2 = 0"
+    chunk.columns = ["id"]
+    sql, params = chunk.select_sql(driver=DRIVERS["mysql"])
+    assert sql == (
+        "SELECT `id` FROM `nums` WHERE `id` > %s AND `id` <= %s AND (id %% 2 = 0) ORDER BY `id`"
+    )
+    assert params == (10, 20)
+    assert read(conn, chunk) == [(i,) for i in range(12, 21, 2)]
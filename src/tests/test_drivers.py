@@ -0,0 +1,21 @@
+# test_drivers.py
+
+import pytest
+
+from drivers import DRIVERS, Driver, SQLiteDriver
+
+
+def test_incomplete_driver_fails_on_instantiation():
+    class PartialDriver(Driver):
+        name = "partial"
+
+        def connect(self, conn_info, connect_timeout=None, **kwargs):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        PartialDriver()
+
+
+def test_builtin_drivers_are_complete():
+    assert set(DRIVERS) == {"mysql", "postgresql", "sqlite"}
+    assert isinstance(DRIVERS["sqlite"], SQLiteDriver)
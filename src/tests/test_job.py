@@ -0,0 +1,131 @@
+# test_job.py
+
+import json
+import sqlite3
+
+import pytest
+
+from job import JOB_DEFAULTS, JobError, load_job, parse_job, resolve_filters, run_job, select_tables
+from task_context import TaskContext
+
+METADATA = [
+    {"name": name, "rows": rows}
+    for name, rows in [("customers", 10), ("orders", 100), ("orders_2023", 50), ("orders_archive", 500)]
+]
+
+
+def write_job(tmp_path, data, name="job.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_json_job_gets_defaults_and_env_password(tmp_path, monkeypatch):
+    monkeypatch.setenv("DST_PW", "secret")
+    path = write_job(tmp_path, {
+        "source": {"type": "sqlite", "database": "/data/shop.db"},
+        "target": {"host": "db2", "user": "etl", "password_env": "DST_PW", "database": "shop"},
+        "tables": "orders*",
+        "filters": {"orders*": {"where": "  id > 5 ", "columns": "id"}, "customers": {}},
+    })
+    job = load_job(path)
+
+    assert job["source"]["db_type"] == "sqlite" and job["source"]["database"] == "/data/shop.db"
+    assert job["target"] == {
+        "db_type": "mysql", "host": "db2", "port": 3306, "user": "etl",
+        "password": "secret", "database": "shop",
+    }
+    assert job["tables"] == ["orders*"]
+    assert job["filters"] == {"orders*": {"where": "id > 5", "columns": ["id"]}}
+    for key in ("mode", "load_method", "concurrency", "resume", "verify", "exclude"):
+        assert job[key] == JOB_DEFAULTS[key]
+
+
+def test_missing_password_env_is_reported(tmp_path, monkeypatch):
+    monkeypatch.delenv("NO_SUCH_PW", raising=False)
+    path = write_job(tmp_path, {
+        "source": {"database": "shop", "password_env": "NO_SUCH_PW"},
+        "target": {"type": "sqlite", "database": "copy.db"},
+    })
+    with pytest.raises(JobError, match="NO_SUCH_PW"):
+        load_job(path)
+
+
+def test_only_the_listed_endpoints_are_required():
+    job = parse_job({"source": {"type": "sqlite", "database": "a.db"}}, endpoints=("source",))
+    assert job["target"] is None
+    with pytest.raises(JobError, match="target"):
+        parse_job({"source": {"type": "sqlite", "database": "a.db"}})
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    {"source": {}, "target": {}, "bogus": 1},
+    {"mode": "merge"},
+    {"load_method": "bcp"},
+    {"filters": ["orders"]},
+    {"filters": {"orders": {"where": "id > 5", "order_by": "id"}}},
+    {"filters": {"orders": {"where": 5}}},
+    {"filters": {"orders": {"columns": {"id": True}}}},
+])
+def test_malformed_jobs_raise_job_error(data):
+    if isinstance(data, dict):
+        data = {
+            "source": {"type": "sqlite", "database": "a.db"},
+            "target": {"type": "sqlite", "database": "b.db"},
+            **data,
+        }
+    with pytest.raises(JobError):
+        parse_job(data)
+
+
+def test_unreadable_and_invalid_files_raise_job_error(tmp_path):
+    with pytest.raises(JobError):
+        load_job(str(tmp_path / "missing.json"))
+    path = tmp_path / "broken.json"
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(JobError):
+        load_job(str(path))
+
+
+def test_table_patterns_expand_in_metadata_order():
+    assert select_tables(METADATA) == {"customers": 10, "orders": 100, "orders_2023": 50, "orders_archive": 500}
+    assert select_tables(METADATA, ["orders*", "customers"], exclude=["*_archive"]) == {
+        "customers": 10, "orders": 100, "orders_2023": 50,
+    }
+    # A pattern may match nothing; a plain name must exist.
+    assert select_tables(METADATA, ["invoices*"]) == {}
+    with pytest.raises(JobError, match="invoices"):
+        select_tables(METADATA, ["invoices"])
+
+
+def test_exact_filter_name_wins_over_patterns():
+    filters = {"orders*": {"where": "a"}, "orders_2*": {"where": "b"}, "orders_2023": {"where": "c"}}
+    assert resolve_filters(filters, ["orders", "orders_2023", "orders_archive", "customers"]) == {
+        "orders": {"where": "a"},
+        "orders_2023": {"where": "c"},
+        "orders_archive": {"where": "a"},
+    }
+
+
+def test_dry_run_resolves_tables_and_filters(tmp_path):
+    source = tmp_path / "source.db"
+    conn = sqlite3.connect(str(source))
+    for name in ("customers", "orders", "orders_archive"):
+        conn.execute(f"CREATE TABLE {name} (id INTEGER PRIMARY KEY)")
+        conn.executemany(f"INSERT INTO {name} VALUES (?)", [(i,) for i in range(1, 11)])
+    conn.commit()
+    conn.close()
+    job = parse_job({
+        "source": {"type": "sqlite", "database": str(source)},
+        "target": {"type": "sqlite", "database": str(tmp_path / "target.db")},
+        "tables": ["orders*"],
+        "exclude": ["*_archive"],
+        "filters": {"orders": {"where": "id > 7"}},
+    })
+    lines = []
+    result = run_job(job, TaskContext(on_log=lines.append), dry_run=True)
+
+    assert result["tables"] == {}
+    assert lines[-1].strip().startswith("orders (~3행")
+    assert not any("customers" in line or "orders_archive" in line for line in lines)
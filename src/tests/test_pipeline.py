@@ -0,0 +1,141 @@
+# test_pipeline.py
+
+import threading
+
+import pytest
+
+from bulk_load import encode_rows, estimate_size
+from pipeline import FIRST_BATCH_ROWS, GROWTH_FACTOR, MAX_BATCH_ROWS, BatchSizer, ReaderStage
+
+
+class FakeCursor:
+    """Serves rows in fetchmany slices; fails with error after fail_after rows."""
+
+    def __init__(self, rows, fail_after=None, error=None):
+        self.rows = list(rows)
+        self.read = 0
+        self.fail_after = fail_after
+        self.error = error
+        self.sizes = []
+
+    def fetchmany(self, size):
+        if self.fail_after is not None and self.read >= self.fail_after:
+            raise self.error
+        self.sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        self.read += len(batch)
+        return batch
+
+
+def drain(reader):
+    items = []
+    try:
+        while True:
+            item = reader.get()
+            if item is None:
+                return items
+            items.append(item)
+    finally:
+        reader.close()
+
+
+def test_sizer_growth_is_capped_per_batch():
+    sizer = BatchSizer(target_bytes=10 * 1024 * 1024)
+    assert sizer.rows == FIRST_BATCH_ROWS
+    sizer.record(FIRST_BATCH_ROWS, FIRST_BATCH_ROWS * 10, 0.001)
+    assert sizer.rows == FIRST_BATCH_ROWS * GROWTH_FACTOR
+
+
+def test_sizer_converges_on_target_bytes():
+    sizer = BatchSizer(target_bytes=100_000)
+    for _ in range(10):
+        sizer.record(sizer.rows, sizer.rows * 100, 0.001)
+    assert sizer.rows == 1000
+
+
+def test_sizer_shrinks_at_once_to_meet_latency():
+    sizer = BatchSizer(target_bytes=10 * 1024 * 1024, target_latency=1.0)
+    for _ in range(5):
+        sizer.record(sizer.rows, sizer.rows * 10, 0.001)
+    big = sizer.rows
+    sizer.record(big, big * 10, 4.0)
+    assert sizer.rows == big // 4
+
+
+def test_sizer_clamps_to_max_bytes_even_when_fixed():
+    adaptive = BatchSizer(target_bytes=10 * 1024 * 1024, max_bytes=5000)
+    fixed = BatchSizer(1000, adaptive=False, max_bytes=10_000)
+    assert fixed.rows == 1000
+    for sizer in (adaptive, fixed):
+        for _ in range(5):
+            sizer.record(sizer.rows, sizer.rows * 100, 0.001)
+    assert adaptive.rows == 50
+    assert fixed.rows == 100
+
+
+def test_sizer_stays_within_row_limits():
+    wide = BatchSizer(target_bytes=1000)
+    wide.record(10, 10 * 1_000_000, 0.01)
+    assert wide.rows == 1
+    narrow = BatchSizer(target_bytes=1 << 40)
+    for _ in range(20):
+        narrow.record(narrow.rows, narrow.rows, 0.0)
+    assert narrow.rows == MAX_BATCH_ROWS
+    narrow.record(0, 0, 1.0)
+    assert narrow.rows == MAX_BATCH_ROWS
+
+
+def test_reader_delivers_every_row_in_order():
+    rows = [(i, f"v{i}") for i in range(1000)]
+    cursor = FakeCursor(rows)
+    items = drain(ReaderStage(cursor, BatchSizer(250, adaptive=False)))
+    assert [row for batch, *_ in items for row in batch] == rows
+    assert cursor.sizes[0] == 250
+    for batch, encoded, size, fetch_seconds, serialize_seconds in items:
+        assert encoded == encode_rows(batch) and size == len(encoded)
+        assert fetch_seconds >= 0 and serialize_seconds >= 0
+
+
+def test_reader_without_encode_only_estimates_size():
+    rows = [(i, "x" * 20) for i in range(100)]
+    items = drain(ReaderStage(FakeCursor(rows), BatchSizer(100, adaptive=False), encode=False))
+    (batch, encoded, size, _, _), = items
+    assert encoded is None and size == estimate_size(batch)
+
+
+def test_reader_error_reaches_the_writer_side():
+    error = ConnectionError("lost connection")
+    cursor = FakeCursor([(i,) for i in range(100)], fail_after=50, error=error)
+    reader = ReaderStage(cursor, BatchSizer(25, adaptive=False))
+    batches = []
+    with pytest.raises(ConnectionError) as raised:
+        while True:
+            batches.append(reader.get())
+    reader.close()
+    assert raised.value is error
+    assert sum(len(batch) for batch, *_ in batches) == 50
+
+
+def test_check_cancels_a_waiting_get_and_close_stops_a_blocked_reader():
+    class Cancelled(Exception):
+        pass
+
+    cancel = threading.Event()
+
+    def check():
+        if cancel.is_set():
+            raise Cancelled
+
+    # An endless source: the reader fills the queue and then waits on it.
+    class Endless:
+        def fetchmany(self, size):
+            return [(0,)] * size
+
+    reader = ReaderStage(Endless(), BatchSizer(10, adaptive=False), depth=1, check=check)
+    assert reader.get() is not None
+    cancel.set()
+    with pytest.raises(Cancelled):
+        while True:
+            reader.get()
+    reader.close()
+    assert not reader._thread.is_alive()
@@ -0,0 +1,86 @@
+# test_schema.py
+
+from schema import KIND_FOREIGN_KEY, KIND_INDEX, split_create_table
+
+PARTITIONED = """CREATE TABLE `events` (
+  `id` bigint NOT NULL,
+  `created` date NOT NULL,
+  `kind` varchar(20) DEFAULT NULL,
+  PRIMARY KEY (`id`,`created`),
+  KEY `idx_kind` (`kind`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+/*!50100 PARTITION BY RANGE (year(`created`))
+(PARTITION p2023 VALUES LESS THAN (2024) ENGINE = InnoDB,
+ PARTITION p2024 VALUES LESS THAN (2025) ENGINE = InnoDB,
+ PARTITION pmax VALUES LESS THAN MAXVALUE ENGINE = InnoDB) */"""
+
+AUTO_INCREMENT_SECONDARY = """CREATE TABLE `log` (
+  `site` int NOT NULL,
+  `seq` int NOT NULL AUTO_INCREMENT,
+  `message` text,
+  PRIMARY KEY (`site`,`seq`),
+  KEY `idx_seq` (`seq`),
+  KEY `idx_site` (`site`)
+) ENGINE=InnoDB AUTO_INCREMENT=42 DEFAULT CHARSET=utf8mb4"""
+
+FULLTEXT = """CREATE TABLE `articles` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `title` varchar(200) DEFAULT NULL,
+  `body` text,
+  PRIMARY KEY (`id`),
+  FULLTEXT KEY `ft_title` (`title`),
+  FULLTEXT KEY `ft_body` (`body`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"""
+
+FOREIGN_KEY = """CREATE TABLE `orders` (
+  `id` bigint NOT NULL,
+  `customer_id` bigint NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_customer` (`customer_id`,`id`),
+  CONSTRAINT `fk_orders_customer` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"""
+
+
+def test_partitioned_table_keeps_partition_clause():
+    create_sql, deferred = split_create_table(PARTITIONED)
+    assert create_sql == """CREATE TABLE `events` (
+  `id` bigint NOT NULL,
+  `created` date NOT NULL,
+  `kind` varchar(20) DEFAULT NULL,
+  PRIMARY KEY (`id`,`created`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+/*!50100 PARTITION BY RANGE (year(`created`))
+(PARTITION p2023 VALUES LESS THAN (2024) ENGINE = InnoDB,
+ PARTITION p2024 VALUES LESS THAN (2025) ENGINE = InnoDB,
+ PARTITION pmax VALUES LESS THAN MAXVALUE ENGINE = InnoDB) */"""
+    assert deferred == [
+        {"name": "idx_kind", "kind": KIND_INDEX, "sql": "KEY `idx_kind` (`kind`)", "separate": False}
+    ]
+
+
+def test_auto_increment_key_stays_in_place():
+    create_sql, deferred = split_create_table(AUTO_INCREMENT_SECONDARY)
+    assert "  KEY `idx_seq` (`seq`)\n) ENGINE=InnoDB AUTO_INCREMENT=42" in create_sql
+    assert [item["name"] for item in deferred] == ["idx_site"]
+
+
+def test_fulltext_indexes_are_deferred_separately():
+    create_sql, deferred = split_create_table(FULLTEXT)
+    assert "FULLTEXT" not in create_sql
+    assert create_sql.endswith("  PRIMARY KEY (`id`)\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4")
+    assert [(item["name"], item["separate"]) for item in deferred] == [
+        ("ft_title", True), ("ft_body", True)
+    ]
+
+
+def test_foreign_key_is_deferred():
+    create_sql, deferred = split_create_table(FOREIGN_KEY)
+    assert create_sql == """CREATE TABLE `orders` (
+  `id` bigint NOT NULL,
+  `customer_id` bigint NOT NULL,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"""
+    assert [(item["name"], item["kind"]) for item in deferred] == [
+        ("uq_customer", KIND_INDEX), ("fk_orders_customer", KIND_FOREIGN_KEY)
+    ]
+    assert deferred[1]["sql"].startswith("CONSTRAINT `fk_orders_customer` FOREIGN KEY")
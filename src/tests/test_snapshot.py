@@ -0,0 +1,116 @@
+# test_snapshot.py
+
+import os
+from contextlib import contextmanager
+
+import pytest
+
+import snapshot
+from bulk_load import decode_rows
+from chunking import Chunk
+from drivers import DRIVERS
+from snapshot import COMPRESSION_GZIP, SnapshotError, SnapshotExporter, open_compressed, read_manifest
+
+pytest.importorskip("pymysql")
+
+COLUMNS = [
+    {"name": "id", "data_type": "int", "column_type": "int"},
+    {"name": "name", "data_type": "varchar", "column_type": "varchar(20)"},
+]
+
+
+class FakeCursor:
+    """Serves rows like a MySQL SSCursor; fail_after raises mid-stream."""
+
+    description = [("id",), ("name",)]
+
+    def __init__(self, rows, fail_after=None):
+        self.rows = list(rows)
+        self.fail_after = fail_after
+        self.read = 0
+
+    def execute(self, sql, params=()):
+        pass
+
+    def fetchmany(self, size):
+        if self.fail_after is not None and self.read >= self.fail_after:
+            raise RuntimeError("connection lost")
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        self.read += len(batch)
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    driver = DRIVERS["mysql"]
+    conn_info = {"host": "h", "port": 3306, "user": "u", "database": "d"}
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @contextmanager
+    def connection(self, timeout=None):
+        pool = self
+
+        class Conn:
+            def cursor(self, cls=None):
+                return pool.cursor
+        yield Conn()
+
+
+@pytest.fixture(autouse=True)
+def source_metadata(monkeypatch):
+    monkeypatch.setattr(snapshot, "show_create_table", lambda conn, table: "CREATE TABLE t (...)")
+    monkeypatch.setattr(snapshot, "fetch_column_types", lambda conn, table: COLUMNS)
+    monkeypatch.setattr(snapshot, "find_primary_key", lambda conn, table: ("id", True))
+    monkeypatch.setattr(snapshot, "estimate_rows", lambda conn, table: 0)
+    monkeypatch.setattr(snapshot, "plan_chunks", lambda conn, table, rows, chunk_rows: [Chunk(table, 0, "id")])
+
+
+def export(path, cursor):
+    exporter = SnapshotExporter(FakePool(cursor), path, compression=COMPRESSION_GZIP, batch_size=2)
+    chunks, _ = exporter.prepare_table("t")
+    for chunk in chunks:
+        exporter.copy_chunk(chunk)
+    exporter.finish_table("t")
+
+
+def stored_rows(path):
+    info = read_manifest(path)["tables"]["t"]["files"][0]
+    with open_compressed(os.path.join(path, info["file"]), "rb", COMPRESSION_GZIP) as f:
+        return decode_rows(list(f), [int, lambda value: value.decode("utf-8")])
+
+
+def test_failed_reexport_keeps_the_previous_export(tmp_path):
+    path = str(tmp_path)
+    old = [(1, "a"), (2, "b"), (3, "c")]
+    export(path, FakeCursor(old))
+
+    with pytest.raises(RuntimeError):
+        export(path, FakeCursor([(1, "x"), (2, "y"), (3, "z")], fail_after=2))
+
+    entry = read_manifest(path)["tables"]["t"]
+    assert entry["complete"] and entry["rows"] == 3
+    assert stored_rows(path) == old
+
+
+def test_reexport_replaces_files_once_finished(tmp_path):
+    path = str(tmp_path)
+    export(path, FakeCursor([(1, "a"), (2, "b"), (3, "c")]))
+    export(path, FakeCursor([(5, "e")]))
+
+    entry = read_manifest(path)["tables"]["t"]
+    assert entry["complete"] and entry["rows"] == 1
+    assert stored_rows(path) == [(5, "e")]
+    assert not any(name.endswith(".part") for name in os.listdir(path))
+
+
+def test_unfinished_chunks_are_not_recorded(tmp_path):
+    path = str(tmp_path)
+    exporter = SnapshotExporter(FakePool(FakeCursor([])), path, compression=COMPRESSION_GZIP)
+    exporter.prepare_table("t")
+    with pytest.raises(SnapshotError):
+        exporter.finish_table("t")
+    assert not os.path.exists(os.path.join(path, snapshot.MANIFEST_NAME))
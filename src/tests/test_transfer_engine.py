@@ -0,0 +1,71 @@
+# test_transfer_engine.py
+
+import sqlite3
+
+import pytest
+
+from chunking import STATUS_PENDING, STATUS_STARTED
+from connection_pool import ConnectionPool
+from transfer_engine import MODE_APPEND, MODE_CREATE, TransferEngine, TransferError
+
+
+@pytest.fixture
+def pools(tmp_path):
+    source_path, target_path = str(tmp_path / "source.db"), str(tmp_path / "target.db")
+    conn = sqlite3.connect(source_path)
+    conn.execute("CREATE TABLE k (a INTEGER, b TEXT)")
+    conn.executemany("INSERT INTO k VALUES (?, ?)", [(i, "x") for i in range(100)])
+    conn.commit()
+    conn.close()
+    source = ConnectionPool({"db_type": "sqlite", "database": source_path})
+    target = ConnectionPool({"db_type": "sqlite", "database": target_path})
+    TransferEngine(source, target, mode=MODE_CREATE).prepare_table("k")
+    yield source, target
+    source.close()
+    target.close()
+
+
+def target_rows(pool):
+    with pool.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM k")
+        return cursor.fetchone()[0]
+
+
+def test_started_keyless_chunk_cannot_resume_in_append_mode(pools):
+    source, target = pools
+    engine = TransferEngine(source, target, mode=MODE_APPEND)
+    chunks, _ = engine.prepare_table("k")
+    engine.copy_chunk(chunks[0])
+    # Crashed after the commit, before the journal recorded any rows.
+    chunks[0].rows, chunks[0].status = 0, STATUS_STARTED
+
+    with pytest.raises(TransferError):
+        TransferEngine(source, target, mode=MODE_APPEND).resume_table("k", chunks)
+    assert target_rows(target) == 100
+
+
+def test_pending_keyless_chunk_resumes_in_append_mode(pools):
+    source, target = pools
+    engine = TransferEngine(source, target, mode=MODE_APPEND)
+    chunks, _ = engine.prepare_table("k")
+    assert chunks[0].status == STATUS_PENDING
+
+    resumed = TransferEngine(source, target, mode=MODE_APPEND)
+    chunks, _ = resumed.resume_table("k", chunks)
+    resumed.copy_chunk(chunks[0])
+    assert target_rows(target) == 100
+
+
+def test_started_keyless_chunk_restarts_in_create_mode(pools):
+    source, target = pools
+    with target.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("DROP TABLE k")
+    engine = TransferEngine(source, target, mode=MODE_CREATE)
+    chunks, _ = engine.prepare_table("k")
+    engine.copy_chunk(chunks[0])
+    chunks[0].rows, chunks[0].status = 0, STATUS_STARTED
+
+    resumed = TransferEngine(source, target, mode=MODE_CREATE)
+    chunks, _ = resumed.resume_table("k", chunks)
+    resumed.copy_chunk(chunks[0])
+    assert target_rows(target) == 100
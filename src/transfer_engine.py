@@ -0,0 +1,434 @@
+# transfer_engine.py
+
+import time
+import zlib
+from contextlib import contextmanager
+
+from bulk_load import LoadDataWriter, open_writer
+from chunking import Chunk, plan_chunks, normalize_filters, DEFAULT_CHUNK_ROWS, STATUS_DONE, STATUS_PENDING
+from connection_pool import ConnectionPool
+from database import estimate_rows
+from drivers import DB_MYSQL, DB_SQLITE
+from incremental import plan_incremental, chunk_unchanged
+from metrics import TransferMetrics
+from pipeline import BatchSizer, ReaderStage, DEFAULT_TARGET_BATCH_BYTES
+from schema import table_ddl, deferred_statements, existing_names, missing_references, read_schema
+from task_context import TaskContext
+
+MODE_CREATE = "create"
+MODE_REPLACE = "replace"
+MODE_APPEND = "append"
+MODE_UPDATE = "update"
+
+LOAD_INSERT = "insert"
+LOAD_DATA_INFILE = "load_data"
+
+DEFAULT_BATCH_SIZE = 5000
+# LOAD DATA has a higher fixed cost per statement, so it gets bigger batches.
+DEFAULT_LOAD_DATA_BATCH_SIZE = 50000
+# SQLite commits are local fsyncs; fewer, larger transactions load fastest.
+DEFAULT_SQLITE_BATCH_SIZE = 50000
+# Byte targets of adaptive batches for the same two cases.
+LARGE_TARGET_BATCH_BYTES = 16 * 1024 * 1024
+
+# Multi-row INSERT statements are kept below this, and below the target's
+# max_allowed_packet minus some room for the statement text.
+MAX_STATEMENT_BYTES = 16 * 1024 * 1024
+PACKET_HEADROOM = 64 * 1024
+
+# Server refused LOAD DATA LOCAL (local_infile disabled).
+LOCAL_INFILE_ERRORS = (1148, 3948)
+
+
+class TransferError(Exception):
+    """Raised when a table cannot be transferred."""
+
+
+class TransferEngine:
+    """
+    Copies tables from a source database to a target one. Either end may
+    be MySQL/MariaDB, PostgreSQL or SQLite (see drivers.py).
+
+    Rows are streamed from the source (SSCursor on MySQL, COPY TO STDOUT on
+    PostgreSQL) in batches and written with multi-row executemany INSERTs,
+    COPY FROM STDIN on PostgreSQL or, with load_method=LOAD_DATA_INFILE and
+    a MySQL target, with LOAD DATA LOCAL INFILE from a temp TSV file. A
+    reader thread fetches ahead of the writer through a bounded queue (see
+    pipeline.py), so memory use stays flat regardless of table size. Large
+    tables are split into primary-key range chunks that can be copied
+    concurrently.
+
+    Without batch_size, batch sizes adapt per table toward a byte size and
+    commit latency target, capped by the target's max_allowed_packet;
+    with it, every batch has that many rows.
+
+    disable_checks turns off unique checks on a MySQL target while a table
+    loads, and for MyISAM tables also non-unique index maintenance (ALTER
+    TABLE ... DISABLE KEYS, which InnoDB ignores). MODE_CREATE is the way
+    to defer InnoDB's secondary indexes.
+
+    MODE_CREATE creates each table with its primary key only; secondary
+    indexes and foreign keys are added by finish_table once the rows are in
+    (see schema.py).
+
+    MODE_UPDATE writes rows as upserts. Between two MySQL servers it only
+    ships rows that may have changed (see incremental.py); otherwise every
+    row is upserted. Upserts are always INSERT ... ON DUPLICATE KEY UPDATE
+    (ON CONFLICT elsewhere), even with LOAD_DATA_INFILE (see LoadDataWriter).
+
+    filters ({table: {'where', 'columns'}}, see chunking.normalize_filters)
+    are pushed into the source query, so only matching rows and the chosen
+    columns are read; create mode then creates only those columns.
+
+    Every committed batch is recorded in self.metrics (rows, bytes and the
+    time spent fetching, serializing, writing and committing it). Batches
+    are only serialized to LOAD DATA text for LoadDataWriter; for writers
+    that take rows, bytes is estimated from a sample and the driver's own
+    serialization counts as writing.
+    """
+
+    def __init__(self, source_pool: ConnectionPool, target_pool: ConnectionPool,
+                 mode=MODE_APPEND, batch_size=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 load_method=LOAD_INSERT, disable_checks=False, filters=None):
+        self.source_pool = source_pool
+        # A snapshot import has no source pool.
+        self.source_driver = source_pool.driver if source_pool is not None else None
+        self.target_driver = target_pool.driver
+        self.mode = mode
+        # LOAD DATA is MySQL's; other targets use their own bulk path.
+        if self.target_driver.name != DB_MYSQL:
+            load_method = LOAD_INSERT
+        self.load_method = load_method
+        self.disable_checks = disable_checks
+        self.filters = normalize_filters(filters)
+        self.adaptive = not batch_size
+        if load_method == LOAD_DATA_INFILE:
+            self.target_pool = target_pool.variant(local_infile=True)
+            self.batch_size = batch_size or DEFAULT_LOAD_DATA_BATCH_SIZE
+            self.target_batch_bytes = LARGE_TARGET_BATCH_BYTES
+        elif self.target_driver.name == DB_SQLITE:
+            self.target_pool = target_pool
+            self.batch_size = batch_size or DEFAULT_SQLITE_BATCH_SIZE
+            self.target_batch_bytes = LARGE_TARGET_BATCH_BYTES
+        else:
+            self.target_pool = target_pool
+            self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+            self.target_batch_bytes = DEFAULT_TARGET_BATCH_BYTES
+        self.chunk_rows = chunk_rows
+        self.metrics = TransferMetrics()
+        # {table: deferred index/foreign key entries} for MODE_CREATE.
+        self._deferred = {}
+        # {table: BatchSizer}, shared by the table's chunks.
+        self._sizers = {}
+        self._max_packet = None
+
+    @contextmanager
+    def _connections(self):
+        """Borrows a (source, target) connection pair for one unit of work."""
+        with self.source_pool.connection() as source, self._target_connection() as target:
+            yield source, target
+
+    @contextmanager
+    def _target_connection(self):
+        with self.target_pool.connection() as target:
+            self.target_driver.prepare_session(target, self.disable_checks)
+            yield target
+
+    @property
+    def incremental(self) -> bool:
+        """MODE_UPDATE can diff chunks with server-side checksums."""
+        return self.source_driver.supports_checksums and self.target_driver.supports_checksums
+
+    def prepare_table(self, table: str, ctx: TaskContext = None):
+        """
+        Prepares the target table for the import mode and splits the source
+        table into primary-key range chunks.
+
+        Returns (chunks, estimated_rows).
+        """
+        ctx = ctx or TaskContext()
+        with self._connections() as (source, target):
+            columns = self._filter_columns(source, table)
+            create_sql = None
+            if self.mode == MODE_CREATE:
+                create_sql, self._deferred[table] = table_ddl(
+                    source, self.source_driver, self.target_driver, table, columns
+                )
+            self._prepare_target(target, table, create_sql)
+            self._disable_keys(target, table)
+            # Chunks split the whole key range; the filter only thins them.
+            chunks = plan_chunks(source, table, estimate_rows(source, table), self.chunk_rows)
+            estimated_rows = self._apply_filter(source, table, chunks, columns)
+            if self.mode == MODE_UPDATE and self.incremental and table not in self.filters:
+                try:
+                    chunks, strategy = plan_incremental(source, target, table, chunks)
+                except ValueError as e:
+                    raise TransferError(str(e)) from e
+                ctx.log(f"[정보] {table}: 변경분 전송 ({strategy})")
+            elif self.mode == MODE_UPDATE:
+                if chunks[0].pk is None:
+                    raise TransferError(f"{table}: 기본 키가 없는 테이블은 갱신 모드로 전송할 수 없습니다.")
+                ctx.log(f"[정보] {table}: 전체 행을 upsert로 전송")
+            if self.mode == MODE_UPDATE and self.load_method == LOAD_DATA_INFILE:
+                ctx.log(f"[정보] {table}: 갱신 모드는 LOAD DATA 대신 INSERT ... ON DUPLICATE KEY UPDATE로 씁니다")
+            # DDL is transactional on PostgreSQL and SQLite.
+            target.commit()
+        return chunks, estimated_rows
+
+    def resume_table(self, table: str, chunks: list):
+        """
+        Prepares a table whose chunk plan comes from a checkpoint of an
+        interrupted run. Key-ordered chunks continue after their last
+        committed key (see _catch_up). A keyless chunk cannot, so in
+        create/replace mode the table is truncated and copied again; in other
+        modes it fails if the chunk had started.
+
+        Returns (chunks, estimated_rows).
+        """
+        # A batch is committed before the journal records it, so a started
+        # keyless chunk may hold rows even if none are recorded.
+        can_restart = self.mode in (MODE_CREATE, MODE_REPLACE)
+        restart = [
+            c for c in chunks
+            if not c.resumable and c.status != STATUS_DONE
+            and (can_restart or c.rows or c.status != STATUS_PENDING)
+        ]
+        with self._connections() as (source, target):
+            if restart:
+                if not can_restart:
+                    raise TransferError(f"{table}: 기본 키가 없는 테이블은 이어서 전송할 수 없습니다.")
+                self.target_driver.truncate(target, table)
+                for chunk in chunks:
+                    chunk.rows = chunk.checksum = 0
+                    chunk.last_pk = chunk.lo
+            else:
+                for chunk in chunks:
+                    if chunk.resumable and chunk.status != STATUS_DONE:
+                        self._catch_up(target, chunk)
+            columns = self._filter_columns(source, table)
+            if self.mode == MODE_CREATE:
+                _, self._deferred[table] = table_ddl(
+                    source, self.source_driver, self.target_driver, table, columns
+                )
+            self._disable_keys(target, table)
+            estimated_rows = self._apply_filter(source, table, chunks, columns)
+            target.commit()
+        return chunks, estimated_rows
+
+    def _catch_up(self, target, chunk):
+        """
+        A batch is committed on the target before the checkpoint records it,
+        so after a crash the target may already hold rows past last_pk. In
+        create/replace mode every row in the chunk's range was copied by this
+        run, so it continues after the highest one. In append mode some may
+        have been there before; the rest of the chunk is upserted instead.
+        Update mode upserts anyway.
+        """
+        if self.mode == MODE_UPDATE:
+            return
+        driver = self.target_driver
+        range_sql, params = chunk.range_condition(driver=driver)
+        sql = f"SELECT COUNT(*), MAX({driver.quote(chunk.pk)}) FROM {driver.quote(chunk.table)}"
+        if range_sql:
+            sql += f" WHERE {range_sql}"
+        with target.cursor() as cursor:
+            cursor.execute(sql, params)
+            count, max_pk = cursor.fetchone()
+        if not count:
+            return
+        if self.mode in (MODE_CREATE, MODE_REPLACE):
+            chunk.rows += count
+            chunk.last_pk = max_pk
+        else:
+            chunk.upsert = True
+
+    def _filter_columns(self, source, table):
+        """The filter's columns in source order plus the primary key, or None for all."""
+        wanted = self.filters.get(table, {}).get("columns")
+        if not wanted:
+            return None
+        schema = read_schema(source, self.source_driver, table)
+        names = [column["name"] for column in schema["columns"]]
+        missing = [name for name in wanted if name not in names]
+        if missing:
+            raise TransferError(f"{table}: 원본에 없는 열입니다: {', '.join(missing)}")
+        keep = set(wanted) | set(schema["primary_key"])
+        return [name for name in names if name in keep]
+
+    def _apply_filter(self, source, table, chunks, columns) -> int:
+        """Sets the table's filter on its chunks; returns the rows expected to match."""
+        where = self.filters.get(table, {}).get("where")
+        for chunk in chunks:
+            chunk.where = where
+            chunk.columns = columns
+        if not where:
+            return estimate_rows(source, table)
+        try:
+            return self.source_driver.estimate_where(source, table, where)
+        except self.source_driver.error_types as e:
+            raise TransferError(f"{table}: 필터 조건 오류: {e}") from e
+
+    def finish_table(self, table: str, ctx: TaskContext = None):
+        """
+        Runs after every chunk of the table has been copied: builds the
+        indexes and foreign keys deferred by create mode and re-enables key
+        maintenance.
+        """
+        ctx = ctx or TaskContext()
+        self._sizers.pop(table, None)
+        deferred = self._deferred.pop(table, None)
+        if not deferred and not self.disable_checks:
+            return
+        with self._target_connection() as target:
+            if deferred:
+                self._add_deferred(target, table, deferred, ctx)
+            if self.disable_checks:
+                self.target_driver.enable_keys(target, table)
+            target.commit()
+
+    def _add_deferred(self, target, table, deferred, ctx):
+        driver = self.target_driver
+        if driver.name != DB_MYSQL:
+            # MySQL accepts a foreign key to a table that does not exist yet
+            # while FOREIGN_KEY_CHECKS is off; others need the table.
+            skipped = missing_references(target, driver, deferred)
+            for item in skipped:
+                ctx.log(f"[경고] {table}: 참조 테이블 {item['references']}이(가) 대상에 없어 "
+                        f"외래 키 {item['name']}을(를) 만들지 않았습니다.")
+            deferred = [item for item in deferred if item not in skipped]
+        # A resumed run may already have built some of them.
+        existing = existing_names(target, driver, table)
+        deferred = [item for item in deferred if item["name"] not in existing]
+        if not deferred:
+            return
+        ctx.log(f"[정보] {table}: 인덱스/외래 키 {len(deferred)}개 생성")
+        with target.cursor() as cursor:
+            for sql in deferred_statements(driver, table, deferred):
+                cursor.execute(sql)
+
+    def _disable_keys(self, target, table):
+        if self.disable_checks:
+            self.target_driver.disable_keys(target, table)
+
+    def copy_chunk(self, chunk: Chunk, ctx: TaskContext = None) -> int:
+        """
+        Copy one chunk on its own pair of pooled connections, committing per
+        batch.
+
+        chunk.rows, chunk.last_pk and chunk.checksum are advanced after every
+        commit, so calling this again after a failure continues where it
+        stopped.
+        Progress is reported as {'table': str, 'chunk': int, 'rows': int}.
+        Returns the rows copied by this call.
+        """
+        ctx = ctx or TaskContext()
+        chunk.attempts += 1
+        with self._connections() as (source, target):
+            return self._copy_chunk(source, target, chunk, ctx)
+
+    def _copy_chunk(self, source, target, chunk, ctx):
+        if chunk.compare and chunk.rows == 0 and chunk_unchanged(source, target, chunk):
+            return 0
+
+        select_sql, params = chunk.select_sql(driver=self.source_driver)
+
+        # The stream is closed only once fully read; on error or cancel the
+        # pool discards the whole connection instead.
+        read_cursor = self.source_driver.open_stream(source, select_sql, params)
+        names = [col[0] for col in read_cursor.description]
+        pk_index = names.index(chunk.pk) if chunk.pk else None
+
+        sizer = self._batch_sizer(target, chunk.table)
+        upsert = self.mode == MODE_UPDATE or chunk.upsert
+        if self.load_method == LOAD_DATA_INFILE and not upsert:
+            writer = LoadDataWriter(target, chunk.table, names)
+        else:
+            writer = open_writer(self.target_driver, target, chunk.table, names, upsert=upsert,
+                                 key=chunk.pk, max_statement=self._max_statement())
+
+        rows_done = 0
+        clock = time.perf_counter
+        reader = ReaderStage(read_cursor, sizer, check=ctx.check_cancelled,
+                             encode=writer.uses_encoded)
+        try:
+            while True:
+                item = reader.get()
+                if item is None:
+                    break
+                batch, encoded, size, fetch_time, serialize_time = item
+                started = clock()
+                self._write(writer, batch, encoded)
+                written = clock()
+                target.commit()
+                committed = clock()
+                sizer.record(len(batch), size, committed - started)
+                self.metrics.record_batch(chunk.table, len(batch), size, {
+                    "fetch": fetch_time,
+                    "serialize": serialize_time,
+                    "write": written - started,
+                    "commit": committed - written
+                })
+                rows_done += len(batch)
+                chunk.rows += len(batch)
+                if encoded is not None:
+                    chunk.checksum = zlib.crc32(encoded, chunk.checksum)
+                if pk_index is not None:
+                    chunk.last_pk = batch[-1][pk_index]
+                ctx.progress({
+                    "table": chunk.table,
+                    "chunk": chunk.index,
+                    "rows": chunk.rows
+                })
+        finally:
+            # Stops the reader before the source connection goes back.
+            reader.close()
+            writer.close()
+        read_cursor.close()
+
+        return rows_done
+
+    def _batch_sizer(self, target, table) -> BatchSizer:
+        sizer = self._sizers.get(table)
+        if sizer is None:
+            if self._max_packet is None:
+                self._max_packet = self.target_driver.max_packet(target) or 0
+            # Encoded rows grow when written as SQL literals (quotes,
+            # escapes), so an INSERT batch stays within half a packet.
+            max_bytes = self._max_packet // 2 if self.load_method == LOAD_INSERT else None
+            sizer = self._sizers.setdefault(table, BatchSizer(
+                self.batch_size, adaptive=self.adaptive,
+                target_bytes=self.target_batch_bytes, max_bytes=max_bytes or None
+            ))
+        return sizer
+
+    def _max_statement(self):
+        if not self._max_packet:
+            return None
+        return max(min(MAX_STATEMENT_BYTES, self._max_packet - PACKET_HEADROOM), self._max_packet // 2)
+
+    def _write(self, writer, batch, encoded):
+        try:
+            writer.write(batch, encoded)
+        except self.target_driver.error_types as e:
+            if e.args and e.args[0] in LOCAL_INFILE_ERRORS:
+                raise TransferError(
+                    "대상 서버에서 LOAD DATA LOCAL INFILE이 비활성화되어 있습니다 "
+                    "(local_infile 설정 확인)."
+                ) from e
+            raise
+
+    def _prepare_target(self, target, table, create_sql=None):
+        """Readies the target table for the mode; create mode runs create_sql."""
+        driver = self.target_driver
+        if self.mode == MODE_CREATE:
+            if driver.table_exists(target, table):
+                raise TransferError(f"{table}: 대상 DB에 이미 같은 이름의 테이블이 있습니다.")
+            with target.cursor() as cursor:
+                cursor.execute(create_sql)
+        elif self.mode == MODE_REPLACE:
+            driver.truncate(target, table)
+        elif self.mode in (MODE_APPEND, MODE_UPDATE):
+            if not driver.table_exists(target, table):
+                raise TransferError(f"{table}: 대상 DB에 테이블이 없습니다.")
+        else:
+            raise TransferError(f"지원하지 않는 가져오기 모드입니다: {self.mode}")
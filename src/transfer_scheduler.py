@@ -0,0 +1,245 @@
+# transfer_scheduler.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from checkpoint import RUN_DONE, RUN_FAILED, RUN_CANCELLED
+from chunking import STATUS_DONE, STATUS_FAILED, STATUS_STARTED
+from task_context import TaskContext, TaskCancelled
+from transfer_engine import TransferEngine, TransferError
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class TransferScheduler:
+    """
+    Runs table copies concurrently on top of a TransferEngine.
+
+    Each table is first prepared and split into primary-key range chunks;
+    the chunks of all tables then share one pool of N workers, each with its
+    own source and target connection. Tables are prepared largest first by
+    estimated row count so that a huge table does not start last and stretch
+    the total run time. A failed chunk is retried on its own, continuing
+    after its last committed key. Once all chunks of a table are done the
+    engine's finish_table step runs for it.
+
+    With a RunCheckpoint, the start of every chunk and each of its commits
+    are journaled; if the checkpoint belongs to an interrupted run,
+    finished tables and chunks are skipped and the rest continue from their
+    last committed key.
+    """
+
+    def __init__(self, engine: TransferEngine, concurrency=DEFAULT_CONCURRENCY,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, checkpoint=None):
+        self.engine = engine
+        self.concurrency = max(1, int(concurrency))
+        self.max_attempts = max_attempts
+        self.checkpoint = checkpoint
+
+    def run(self, tables: dict, ctx: TaskContext = None) -> dict:
+        """
+        Copy tables given as {table: estimated_rows}.
+
+        Progress is reported after each batch of any chunk as
+        {'table': str, 'rows': int, 'total': int,
+         'done_rows': int, 'total_rows': int,
+         'rate': float, 'eta': float or None, 'bottleneck': (stage, share) or None},
+        done_rows/total_rows summed over all tables, rate in rows/sec over
+        the last few seconds and eta in seconds (see metrics.py).
+
+        Returns {table: rows_copied}; raises TransferError at the end if any
+        table failed.
+        """
+        run = _TransferRun(self, tables, ctx or TaskContext())
+        try:
+            if not self.checkpoint:
+                return run.execute()
+
+            try:
+                results = run.execute()
+            except TaskCancelled:
+                self.checkpoint.finish(RUN_CANCELLED)
+                raise
+            except BaseException:
+                self.checkpoint.finish(RUN_FAILED)
+                raise
+            self.checkpoint.finish(RUN_DONE)
+            return results
+        finally:
+            self.engine.metrics.finish()
+
+
+class _TransferRun:
+    """State of one TransferScheduler.run call."""
+
+    def __init__(self, scheduler, tables, ctx):
+        self.engine = scheduler.engine
+        self.concurrency = scheduler.concurrency
+        self.max_attempts = scheduler.max_attempts
+        self.checkpoint = scheduler.checkpoint
+        self.ctx = ctx
+        self.chunk_ctx = ctx.with_progress(self._on_chunk_progress)
+        self.order = sorted(tables, key=lambda name: tables[name], reverse=True)
+        self.totals = {name: tables[name] for name in self.order}
+        self.chunks = {}
+        self.remaining = {}
+        self.results = {}
+        self.failed = []
+        self.pending = {}
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def execute(self) -> dict:
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="transfer") as executor:
+            self.executor = executor
+            for table in self.order:
+                self._submit(self._prepare, self._on_prepared, table)
+            try:
+                while self.pending:
+                    finished, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        handler, item = self.pending.pop(future)
+                        handler(future, item)
+            except TaskCancelled:
+                for future in self.pending:
+                    future.cancel()
+                raise
+
+        if self.failed:
+            raise TransferError(f"{len(self.failed)}개 테이블 전송 실패: {', '.join(self.failed)}")
+        return self.results
+
+    def _submit(self, fn, handler, item):
+        self.pending[self.executor.submit(fn, item)] = (handler, item)
+
+    # Worker side
+
+    def _prepare(self, table):
+        """Returns (chunks, estimated_rows), or None if the checkpoint says
+        the table is already done."""
+        self.ctx.check_cancelled()
+        if self.checkpoint:
+            if self.checkpoint.is_table_done(table):
+                return None
+            saved = self.checkpoint.load_chunks(table)
+            if saved is not None:
+                self.ctx.log(f"[정보] {table} 이어서 전송")
+                return self.engine.resume_table(table, saved)
+
+        self.ctx.log(f"[정보] {table} 전송 시작")
+        chunks, estimated_rows = self.engine.prepare_table(table, self.ctx)
+        if self.checkpoint:
+            self.checkpoint.save_chunks(table, chunks)
+        return chunks, estimated_rows
+
+    def _copy(self, chunk):
+        self.ctx.check_cancelled()
+        if self.checkpoint and chunk.status != STATUS_STARTED:
+            chunk.status = STATUS_STARTED
+            self.checkpoint.save_chunk(chunk)
+        return self.engine.copy_chunk(chunk, self.chunk_ctx)
+
+    def _finish(self, table):
+        return self.engine.finish_table(table, self.ctx)
+
+    def _table_rows(self, table):
+        return sum(chunk.rows for chunk in self.chunks.get(table, []))
+
+    def _on_chunk_progress(self, info):
+        table = info["table"]
+        if self.checkpoint:
+            self.checkpoint.save_chunk(self.chunks[table][info["chunk"]])
+        with self.lock:
+            rows = self._table_rows(table)
+            self.totals[table] = max(self.totals[table], rows)
+            payload = {
+                "table": table,
+                "rows": rows,
+                "total": self.totals[table],
+                "done_rows": sum(self._table_rows(name) for name in self.order),
+                "total_rows": sum(self.totals.values())
+            }
+        metrics = self.engine.metrics
+        rate = metrics.rate()
+        remaining = payload["total_rows"] - payload["done_rows"]
+        payload["rate"] = rate
+        payload["eta"] = remaining / rate if rate > 0 else None
+        payload["bottleneck"] = metrics.bottleneck()
+        self.ctx.progress(payload)
+
+    # Coordinator side
+
+    def _on_prepared(self, future, table):
+        try:
+            prepared = future.result()
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            self.failed.append(table)
+            self.ctx.log(f"[오류] {table}: {e}")
+            return
+
+        if prepared is None:
+            rows = self.checkpoint.table_rows(table)
+            with self.lock:
+                self.totals[table] = rows
+            self.results[table] = rows
+            self.ctx.log(f"[정보] {table}: 이전 실행에서 완료됨, 건너뜀")
+            return
+
+        chunks, estimated_rows = prepared
+        todo = [chunk for chunk in chunks if chunk.status != STATUS_DONE]
+        with self.lock:
+            self.chunks[table] = chunks
+            self.totals[table] = max(self.totals[table], estimated_rows)
+        self.remaining[table] = len(todo)
+        if len(chunks) > 1:
+            self.ctx.log(f"[정보] {table}: {len(chunks)}개 구간으로 분할")
+        for chunk in todo:
+            self._submit(self._copy, self._on_chunk_done, chunk)
+        if not todo:
+            self._submit(self._finish, self._on_table_finished, table)
+
+    def _on_chunk_done(self, future, chunk):
+        table = chunk.table
+        try:
+            future.result()
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            chunk.error = e
+            if chunk.resumable and chunk.attempts < self.max_attempts:
+                self.ctx.log(f"[경고] {table} 구간 {chunk.index + 1} 실패, 재시도 "
+                             f"({chunk.attempts}/{self.max_attempts}): {e}")
+                self._submit(self._copy, self._on_chunk_done, chunk)
+                return
+            chunk.status = STATUS_FAILED
+            if table not in self.failed:
+                self.failed.append(table)
+            self.ctx.log(f"[오류] {table} 구간 {chunk.index + 1}: {e}")
+        else:
+            chunk.status = STATUS_DONE
+        if self.checkpoint:
+            self.checkpoint.save_chunk(chunk)
+
+        self.remaining[table] -= 1
+        if self.remaining[table] == 0:
+            self._submit(self._finish, self._on_table_finished, table)
+
+    def _on_table_finished(self, future, table):
+        try:
+            future.result()
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            if table not in self.failed:
+                self.failed.append(table)
+            self.ctx.log(f"[오류] {table} 마무리 실패: {e}")
+            return
+        if table not in self.failed:
+            rows = self._table_rows(table)
+            self.results[table] = rows
+            if self.checkpoint:
+                self.checkpoint.table_done(table)
+            self.ctx.log(f"[완료] {table}: {rows:,}행 전송")
@@ -0,0 +1,205 @@
+# verify.py
+
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from chunking import Chunk, find_primary_key, plan_chunks, DEFAULT_CHUNK_ROWS
+from database import estimate_rows, fetch_columns, quote_identifier
+from table_checksum import range_checksum, row_hash_sql
+from task_context import TaskContext, TaskCancelled
+
+# A mismatching range with at most this many rows is compared row by row;
+# larger ones are split into DEFAULT_FANOUT sub-ranges and checked again.
+DEFAULT_MIN_RANGE_ROWS = 2000
+DEFAULT_FANOUT = 8
+# How many differing keys of each kind are kept in a result.
+MAX_SAMPLE_KEYS = 20
+
+
+def verify_tables(source_pool, target_pool, tables, ctx: TaskContext = None, max_workers=4) -> list:
+    """
+    Verifies each table with verify_table. Progress is reported per table as
+    {'table': str, 'done': int, 'total': int}. Returns the list of results.
+    Both ends must be MySQL/MariaDB, since the checksums are computed
+    server-side.
+    """
+    if not (source_pool.driver.supports_checksums and target_pool.driver.supports_checksums):
+        raise ValueError("검증은 MySQL/MariaDB 사이의 전송에서만 지원합니다.")
+    ctx = ctx or TaskContext()
+    results = []
+    for table in tables:
+        ctx.check_cancelled()
+        result = verify_table(source_pool, target_pool, table, ctx, max_workers=max_workers)
+        results.append(result)
+        ctx.log(describe_result(result))
+        ctx.progress({"table": table, "done": len(results), "total": len(tables)})
+    return results
+
+
+def verify_table(source_pool, target_pool, table, ctx: TaskContext = None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, min_rows=DEFAULT_MIN_RANGE_ROWS,
+                 fanout=DEFAULT_FANOUT, max_workers=4) -> dict:
+    """
+    Compares a table between source and target without pulling its rows.
+
+    Both servers compute a BIT_XOR(CRC32(...)) checksum per primary-key
+    range; only ranges whose checksums differ are split and checked again,
+    down to small ranges that are compared key by key. Returns
+    {
+        'table': str,
+        'match': bool,
+        'source_rows': int, 'target_rows': int,
+        'ranges_checked': int,
+        'missing': int, 'extra': int, 'different': int,  # rows
+        'samples': {'missing': [...], 'extra': [...], 'different': [...]}
+    }
+    Keyless tables are compared as a whole; their differing rows are not
+    located.
+    """
+    ctx = ctx or TaskContext()
+    with source_pool.connection() as conn:
+        columns = fetch_columns(conn, table)
+        pk, _ = find_primary_key(conn, table)
+        estimated_rows = estimate_rows(conn, table)
+        chunks = plan_chunks(conn, table, estimated_rows, chunk_rows) if pk else [Chunk(table, 0)]
+
+    result = {
+        "table": table,
+        "match": True,
+        "source_rows": 0,
+        "target_rows": 0,
+        "ranges_checked": 0,
+        "missing": 0,
+        "extra": 0,
+        "different": 0,
+        "samples": {"missing": [], "extra": [], "different": []}
+    }
+    checker = _RangeChecker(source_pool, target_pool, table, columns, pk, min_rows, fanout)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(checker.examine, chunk.lo, chunk.hi): True for chunk in chunks}
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    top_level = pending.pop(future)
+                    ctx.check_cancelled()
+                    counts, equal, subranges, diff = future.result()
+                    result["ranges_checked"] += 1
+                    if top_level:
+                        result["source_rows"] += counts[0]
+                        result["target_rows"] += counts[1]
+                    if not equal:
+                        result["match"] = False
+                    if diff:
+                        _merge_diff(result, diff)
+                    for lo, hi in subranges:
+                        pending[executor.submit(checker.examine, lo, hi)] = False
+        except TaskCancelled:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return result
+
+
+def describe_result(result) -> str:
+    table = result["table"]
+    if result["match"]:
+        return f"[검증] {table}: 일치 ({result['source_rows']:,}행, {result['ranges_checked']}개 구간 비교)"
+    parts = [f"원본 {result['source_rows']:,}행 / 대상 {result['target_rows']:,}행"]
+    if result["missing"] or result["extra"] or result["different"]:
+        parts.append(f"누락 {result['missing']:,}, 초과 {result['extra']:,}, 불일치 {result['different']:,}")
+    for kind, label in (("missing", "누락 키"), ("extra", "초과 키"), ("different", "불일치 키")):
+        if result["samples"][kind]:
+            parts.append(f"{label} 예: {', '.join(map(str, result['samples'][kind]))}")
+    return f"[검증] {table}: 불일치 - " + "; ".join(parts)
+
+
+def _merge_diff(result, diff):
+    for kind in ("missing", "extra", "different"):
+        result[kind] += len(diff[kind])
+        samples = result["samples"][kind]
+        samples.extend(diff[kind][:MAX_SAMPLE_KEYS - len(samples)])
+
+
+class _RangeChecker:
+    """Checks one key range on both servers; runs on executor threads."""
+
+    def __init__(self, source_pool, target_pool, table, columns, pk, min_rows, fanout):
+        self.source_pool = source_pool
+        self.target_pool = target_pool
+        self.table = table
+        self.columns = columns
+        self.pk = pk
+        self.min_rows = min_rows
+        self.fanout = fanout
+
+    def examine(self, lo, hi):
+        """
+        Returns ((source_rows, target_rows), equal, subranges, diff).
+        subranges lists (lo, hi) ranges to check next; diff holds the
+        differing keys once a range is small enough to compare key by key.
+        """
+        where_sql, params = Chunk(self.table, 0, self.pk, lo, hi).range_condition(from_start=True)
+        with self.source_pool.connection() as conn:
+            source = range_checksum(conn, self.table, self.columns, where_sql, params)
+        with self.target_pool.connection() as conn:
+            target = range_checksum(conn, self.table, self.columns, where_sql, params)
+
+        counts = (source[0], target[0])
+        if source == target or self.pk is None:
+            return counts, source == target, [], None
+        if max(counts) <= self.min_rows:
+            return counts, False, [], self._diff_rows(where_sql, params)
+
+        # Split on whichever side holds more rows in the range.
+        pool = self.source_pool if source[0] >= target[0] else self.target_pool
+        boundaries = self._boundaries(pool, lo, hi, max(counts))
+        if not boundaries:
+            return counts, False, [], self._diff_rows(where_sql, params)
+        edges = [lo] + boundaries + [hi]
+        return counts, False, list(zip(edges, edges[1:])), None
+
+    def _boundaries(self, pool, lo, hi, rows) -> list:
+        """Walks the key index of the range, every rows/fanout entries."""
+        step = max(1, math.ceil(rows / self.fanout))
+        pk = quote_identifier(self.pk)
+        boundaries = []
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                for _ in range(self.fanout - 1):
+                    start = boundaries[-1] if boundaries else lo
+                    where_sql, params = Chunk(self.table, 0, self.pk, start, hi).range_condition(from_start=True)
+                    cursor.execute(
+                        f"SELECT {pk} FROM {quote_identifier(self.table)} "
+                        f"{'WHERE ' + where_sql if where_sql else ''} "
+                        f"ORDER BY {pk} LIMIT 1 OFFSET %s",
+                        params + (step - 1,)
+                    )
+                    row = cursor.fetchone()
+                    if row is None or (hi is not None and row[0] >= hi):
+                        break
+                    boundaries.append(row[0])
+        return boundaries
+
+    def _diff_rows(self, where_sql, params) -> dict:
+        source = self._row_hashes(self.source_pool, where_sql, params)
+        target = self._row_hashes(self.target_pool, where_sql, params)
+        return {
+            "missing": sorted(key for key in source if key not in target),
+            "extra": sorted(key for key in target if key not in source),
+            "different": sorted(key for key in source if key in target and source[key] != target[key])
+        }
+
+    def _row_hashes(self, pool, where_sql, params) -> dict:
+        sql = (
+            f"SELECT {quote_identifier(self.pk)}, {row_hash_sql(self.columns)} "
+            f"FROM {quote_identifier(self.table)}"
+        )
+        if where_sql:
+            sql += f" WHERE {where_sql}"
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return dict(cursor.fetchall())
@@ -0,0 +1,86 @@
+# workers.py
+
+import traceback
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from task_context import TaskContext, TaskCancelled
+
+# Workers that have been started but not finished yet. Holding them here
+# keeps their signal objects alive until the last queued signal is delivered.
+_active_workers = set()
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker; delivered on the GUI thread."""
+    result = Signal(object)
+    error = Signal(object)
+    progress = Signal(object)
+    log = Signal(str)
+    cancelled = Signal()
+    finished = Signal()
+
+
+class Worker(QRunnable):
+    """
+    Runs fn(*args, ctx=TaskContext, **kwargs) on a QThreadPool thread.
+
+    The task reports through the context; its return value, exception or
+    cancellation is sent back through self.signals.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.ctx = TaskContext(
+            on_progress=self.signals.progress.emit,
+            on_log=self.signals.log.emit
+        )
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, ctx=self.ctx, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print("Background task failed:", traceback.format_exc())
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def cancel(self):
+        self.ctx.cancel()
+
+
+def run_in_background(fn, *args, on_result=None, on_error=None, on_progress=None,
+                      on_log=None, on_cancelled=None, on_finished=None, **kwargs) -> Worker:
+    """Starts fn on the global thread pool and returns its Worker."""
+    worker = Worker(fn, *args, **kwargs)
+    signals = worker.signals
+    for signal, slot in (
+        (signals.result, on_result),
+        (signals.error, on_error),
+        (signals.progress, on_progress),
+        (signals.log, on_log),
+        (signals.cancelled, on_cancelled),
+        (signals.finished, on_finished),
+    ):
+        if slot:
+            signal.connect(slot)
+    signals.finished.connect(lambda: _active_workers.discard(worker))
+
+    _active_workers.add(worker)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+def cancel_all(wait_ms=5000):
+    """Cancels every running worker and waits for the pool to drain."""
+    for worker in list(_active_workers):
+        worker.cancel()
+    QThreadPool.globalInstance().waitForDone(wait_ms)